@@ -6,6 +6,8 @@ import os
 from bs4 import BeautifulSoup
 from typing import List, Dict, Any, Iterator
 from mappers import process_and_send_tenders
+from lxml import etree
+from lib.html_parser import parse_html, element_text, only_string, class_xpath, register_extractor, run_extractor
 # --- Constants ---
 BASE_URL = "https://bid.crd.ca"
 BIDS_URL = f"{BASE_URL}/contracts-rfps/current"
@@ -108,17 +110,9 @@ def scrape_bid_details(bids_df: pd.DataFrame) -> Iterator[Dict[str, Any]]:
         try:
             response = requests.get(bid_url)
             response.raise_for_status()
-            soup = BeautifulSoup(response.text, "html.parser")
-            
-            # The main content area on the detail pages
-            container = soup.find("div", class_="main-content")
-            if not container:
-                container = soup.find("div", id="contentWrapper")
-            if not container:
-                container = soup.find("div", class_="sf_cols")
-            if container:
+            details = run_extractor('crd_bid_details', response.text)
+            if details is not None:
                 # Combine original summary data with newly scraped details
-                details = _parse_detail_container(container)
                 combined_data = {**row.to_dict(), "Details": details}
                 print("combined_data", combined_data)
                 yield combined_data
@@ -134,23 +128,39 @@ def scrape_bid_details(bids_df: pd.DataFrame) -> Iterator[Dict[str, Any]]:
 
 # --- Helper Parsing Functions for Detail Pages ---
 
+def _parse_bid_detail_page_soup(html: str):
+    """Finds the content container of a bid detail page and parses it, None if there is none."""
+    soup = BeautifulSoup(html, "html.parser")
+
+    # The main content area on the detail pages
+    container = soup.find("div", class_="main-content")
+    if not container:
+        container = soup.find("div", id="contentWrapper")
+    if not container:
+        container = soup.find("div", class_="sf_cols")
+    if container:
+        return _parse_detail_container(container)
+    return None
+
+def _add_info_cell(result, cell_text):
+    # Split by first semicolon
+    if ":" in cell_text:
+        key, value = cell_text.split(":", 1)
+        key = key.strip()
+        value = value.strip()
+    else:
+        key = cell_text.strip()
+        value = ""
+    if key:  # Only add non-empty keys
+        result[key] = value
+
 def _parse_table_info(table):
     result = {}
 
     for row in table.find_all("tr"):
         cells = row.find_all("td")
         for idx, cell in enumerate(cells):
-            cell_text = cell.get_text(strip=True)
-            # Split by first semicolon
-            if ":" in cell_text:
-                key, value = cell_text.split(":", 1)
-                key = key.strip()
-                value = value.strip()
-            else:
-                key = cell_text.strip()
-                value = ""
-            if key:  # Only add non-empty keys
-                result[key] = value
+            _add_info_cell(result, cell.get_text(strip=True))
 
     return result
 
@@ -252,6 +262,86 @@ def _get_project_description_follow_up(html_content):
     return "" # Return empty string if label not found
 
 
+# --- lxml versions of the detail page parsing above ---
+
+_MAIN_CONTENT_XPATH = class_xpath('main-content', tag='div')
+_CONTENT_WRAPPER_XPATH = etree.XPath("descendant::div[@id='contentWrapper']")
+_SF_COLS_XPATH = class_xpath('sf_cols', tag='div')
+_FIELD_LABEL_XPATH = class_xpath('sfitemFieldLbl', tag='div')
+
+def _parse_bid_detail_page_lxml(html: str):
+    """lxml version of _parse_bid_detail_page_soup"""
+    root = parse_html(html)
+    for xpath in (_MAIN_CONTENT_XPATH, _CONTENT_WRAPPER_XPATH, _SF_COLS_XPATH):
+        found = xpath(root)
+        if found:
+            return _parse_detail_container_lxml(found[0])
+    return None
+
+def _parse_detail_container_lxml(container) -> Dict[str, Any]:
+    tables = list(container.iterdescendants("table"))
+    tables_data = {}
+    for idx, table in enumerate(tables):
+        if idx == 0:
+            result = {}
+            for row in table.iter("tr"):
+                for cell in row.iterdescendants("td"):
+                    _add_info_cell(result, element_text(cell, strip=True))
+            tables_data["info_table"] = result
+        else:
+            rows = _parse_table_by_headers_lxml(table)
+            if rows:
+                tables_data[f"table_{idx}"] = rows
+
+    # drop_tree keeps the text that follows each table, like extract() does
+    for table in tables:
+        table.drop_tree()
+
+    return {
+        "description": _get_project_description_follow_up_lxml(container),
+        **tables_data
+    }
+
+def _parse_table_by_headers_lxml(table):
+    result = []
+    thead = next(table.iterdescendants("thead"), None)
+    headers = [element_text(th, strip=True) for th in thead.iterdescendants("th")] if thead is not None else []
+    tbody = next(table.iterdescendants("tbody"), None)
+    if tbody is not None and headers:
+        for row in tbody.iterdescendants("tr"):
+            row_dict = {}
+            for i, cell in enumerate(row.iterdescendants("td", "th")):
+                key = headers[i] if i < len(headers) else f"col_{i}"
+                row_dict[key] = element_text(cell, strip=True)
+            result.append(row_dict)
+    return result
+
+def _get_project_description_follow_up_lxml(container):
+    project_description_label = next(
+        (div for div in _FIELD_LABEL_XPATH(container)
+         if (only_string(div) or "").strip().lower() == "project description:"),
+        None
+    )
+    if project_description_label is None:
+        return ""
+
+    combined_text_parts = []
+    for element in project_description_label.itersiblings():
+        if len(combined_text_parts) >= 3:
+            break
+        # comments and processing instructions are not tags
+        if not isinstance(element.tag, str) or element.tag == 'br':
+            continue
+        combined_text_parts.append(element_text(element, strip=True) + " ")
+
+    words = " ".join(combined_text_parts).split()
+    if len(words) > 30:
+        return " ".join(words[:30]) + "..."
+    return " ".join(words)
+
+register_extractor('crd_bid_details', _parse_bid_detail_page_lxml, _parse_bid_detail_page_soup)
+
+
 # --- Main Execution ---
 
 def main():
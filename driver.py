@@ -1,19 +1,66 @@
-from web_requests import get_filtered_permits_with_contacts, NewProjectSiteTypes, get_site_params
+from web_requests import get_filtered_permits_with_contacts, NewProjectSiteTypes, get_site_params, \
+save_site_watermark
 from process_project_data import map_data
-import os 
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import os
 import json
+import time
+import threading
 
-def main():
-    api_url = os.getenv('YS_APIURL', 'http://localhost')
+# Parallel mode runs each site in its own worker thread. Every call to
+# get_filtered_permits_with_contacts builds its own requests.Session, so the
+# workers never share connection or cookie state. The driver workflow turns
+# it on with DRIVER_PARALLEL=True.
+DRIVER_PARALLEL = os.getenv('DRIVER_PARALLEL', 'False') == 'True'
+DRIVER_MAX_WORKERS = int(os.getenv('DRIVER_MAX_WORKERS', 4))
+# Wall-clock budget for one attempt at one site, in seconds
+DRIVER_SITE_TIMEOUT = float(os.getenv('DRIVER_SITE_TIMEOUT', 300))
+# Per-request timeout handed down to the Prospero requests
+DRIVER_REQUEST_TIMEOUT = float(os.getenv('DRIVER_REQUEST_TIMEOUT', 60))
 
-    if not os.path.exists("data"):
-        os.makedirs("data")
+def fetch_site(site_type, cancel_event=None):
+    """
+    Fetches and filters the permit entries for a single site.
+    Runs inside a worker thread in parallel mode.
+
+    Returns:
+        tuple: (filtered entries, watermark to save once they are uploaded)
+    """
+    params = get_site_params(site_type)
+    params['request_timeout'] = DRIVER_REQUEST_TIMEOUT
+    params['cancel_event'] = cancel_event
+    return get_filtered_permits_with_contacts(params, return_watermark=True)
 
-    all_regions = list(NewProjectSiteTypes)
+def upload_site(site_type, filtered_entries, watermark=None):
+    """
+    Saves the filtered entries for a site and uploads them through map_data.
+    The site's watermark is only saved once the upload went through, so a
+    failed or retried site pages through everything again.
+    """
+    region_name = site_type.value.replace("_", " ").title()
+    file_name_prefix = site_type.value.replace(" ", "_")
+
+    output_filename = f"data/{file_name_prefix}_filtered.json"
+    with open(output_filename, "w") as f:
+        json.dump(filtered_entries, f, indent=4)
+
+    print(f"UPLOAD {region_name.upper()} ENTRIES {len(filtered_entries)} items")
+    stats = map_data({
+        "data": filtered_entries,
+        "region_name": region_name,
+        'hide_tiny_url': os.getenv('HIDE_TINY_URL', False)
+    })
+    if stats.get('status') not in ('success', 'empty'):
+        raise Exception(f"upload of {region_name} ended with status {stats.get('status')}")
+    save_site_watermark(site_type.value, watermark)
+
+def run_sequential(max_retries):
+    """
+    Processes every site one at a time, re-running failed sites in later passes.
+    Returns the list of sites that still failed after max_retries passes.
+    """
     regions_to_process = list(NewProjectSiteTypes) # Start with all regions
-    
     retry_attempts = 0
-    max_retries = 3
 
     while regions_to_process and retry_attempts < max_retries:
         print(f"--- Starting pass {retry_attempts + 1}/{max_retries} ---")
@@ -21,33 +68,121 @@ def main():
 
         for site_type in regions_to_process:
             region_name = site_type.value.replace("_", " ").title()
-            file_name_prefix = site_type.value.replace(" ", "_")
-
-            params = get_site_params(site_type)
 
             print(f"DOING {region_name.upper()}")
             try:
-                filtered_entries = get_filtered_permits_with_contacts(params)
-                output_filename = f"data/{file_name_prefix}_filtered.json"
-                with open(output_filename, "w") as f:
-                    json.dump(filtered_entries, f, indent=4)
-                
-                print(f"UPLOAD {region_name.upper()} ENTRIES {len(filtered_entries)} items")
-                map_data({
-                    "data": filtered_entries,
-                    "region_name": region_name,
-                    'hide_tiny_url': os.getenv('HIDE_TINY_URL', False)
-                })
+                filtered_entries, watermark = fetch_site(site_type)
+                upload_site(site_type, filtered_entries, watermark)
             except Exception as e:
                 print(f"ERROR processing {region_name.upper()}: {e}")
                 failed_regions_current_pass.append(site_type)
             print("-" * 30) # Separator for better readability between iterations
-        
+
         regions_to_process = failed_regions_current_pass
         if regions_to_process:
             print(f"Retrying failed regions: {[region.value for region in regions_to_process]}")
         retry_attempts += 1
 
+    return regions_to_process
+
+def run_parallel(max_retries, max_workers=DRIVER_MAX_WORKERS, site_timeout=DRIVER_SITE_TIMEOUT):
+    """
+    Processes every site concurrently on a thread pool.
+
+    A site that raises is put straight back on the queue while the other
+    sites keep running, until it has been tried max_retries times. A site
+    that runs past site_timeout is told to stop (its cancel event is checked
+    between pages, postbacks and details requests) and is only retried once
+    that attempt has returned, so two attempts at one site never write its
+    watermark or contact cache at the same time. Uploads happen on the main
+    thread.
+
+    Returns the list of sites that still failed after max_retries attempts.
+    """
+    run_start = time.perf_counter()
+    attempts = {site_type: 0 for site_type in NewProjectSiteTypes}
+    failed_regions = []
+    # future -> (site_type, deadline, attempt start, cancel event)
+    running = {}
+    # timed-out attempts that were told to stop: future -> site_type
+    stopping = {}
+
+    # a stopping attempt still holds its thread, so it counts against max_workers
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+
+    def schedule(site_type):
+        attempts[site_type] += 1
+        region_name = site_type.value.replace("_", " ").title()
+        print(f"DOING {region_name.upper()} (attempt {attempts[site_type]}/{max_retries})")
+        start = time.perf_counter()
+        cancel_event = threading.Event()
+        future = executor.submit(fetch_site, site_type, cancel_event)
+        running[future] = (site_type, start + site_timeout, start, cancel_event)
+
+    def retry_or_fail(site_type):
+        if attempts[site_type] < max_retries:
+            print(f"Retrying failed region: {site_type.value}")
+            queue.append(site_type)
+        else:
+            failed_regions.append(site_type)
+
+    queue = list(NewProjectSiteTypes)
+    try:
+        while queue or running or stopping:
+            while queue and len(running) + len(stopping) < max_workers:
+                schedule(queue.pop(0))
+
+            timeout = None
+            if running:
+                next_deadline = min(deadline for _, deadline, _, _ in running.values())
+                timeout = max(next_deadline - time.perf_counter(), 0)
+            done, _ = wait(list(running) + list(stopping), timeout=timeout, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                if future in stopping:
+                    site_type = stopping.pop(future)
+                    start = None
+                else:
+                    site_type, _, start, _ = running.pop(future)
+                region_name = site_type.value.replace("_", " ").title()
+                try:
+                    filtered_entries, watermark = future.result()
+                    upload_site(site_type, filtered_entries, watermark)
+                    elapsed = f" in {time.perf_counter() - start:.1f}s" if start is not None else " after its timeout"
+                    print(f"FINISHED {region_name.upper()}{elapsed}")
+                except Exception as e:
+                    print(f"ERROR processing {region_name.upper()}: {e}")
+                    retry_or_fail(site_type)
+
+            now = time.perf_counter()
+            for future, (site_type, deadline, _, cancel_event) in list(running.items()):
+                if now >= deadline:
+                    running.pop(future)
+                    cancel_event.set()
+                    stopping[future] = site_type
+                    print(f"ERROR processing {site_type.value.upper()}: timed out after {site_timeout:.0f}s, "
+                          f"stopping it before retrying")
+    finally:
+        for _, _, _, cancel_event in running.values():
+            cancel_event.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    print(f"Parallel run finished in {time.perf_counter() - run_start:.1f}s")
+    return failed_regions
+
+def main():
+    api_url = os.getenv('YS_APIURL', 'http://localhost')
+
+    if not os.path.exists("data"):
+        os.makedirs("data")
+
+    max_retries = 3
+
+    if DRIVER_PARALLEL:
+        regions_to_process = run_parallel(max_retries)
+    else:
+        regions_to_process = run_sequential(max_retries)
+
     if regions_to_process:
         print(f"\n--- ATTENTION: The following regions failed after {max_retries} attempts: ---")
         for site_type in regions_to_process:
@@ -4,6 +4,11 @@ import pandas as pd
 from dotenv import load_dotenv
 from io import StringIO
 from bs4 import BeautifulSoup, NavigableString
+from lxml import etree
+from lib.html_parser import parse_html, element_text, class_xpath, register_extractor, run_extractor
+from lib.resource_blocker import block_resources
+from lib.readiness import wait_for_selector
+from lib.artifacts import get_artifact_writer
 import time
 import random
 import traceback
@@ -191,7 +196,7 @@ async def perform_human_loop(tab: Tab, selector: str, max_attempts=2):
         except Exception as e:
             base_dir = os.getenv('BASE_DIR', "screenshots")
             print(f"Action {i} failed: {e}")
-            await tab.take_screenshot(f'{base_dir}/action_error_{i}.png')
+            await get_artifact_writer().save_screenshot(tab, f'{base_dir}/action_error_{i}.png', source='bonfire', failure=True)
             
     return False
 
@@ -244,6 +249,213 @@ def get_tag_on_details_page(soup, labelText="Project Description:"):
         # print(f"Could not find the '{labelText}' tag.") # Optional for debugging
         return "" # Return empty if the label itself is not found
 
+# Present once a detail page has rendered, in either layout
+DETAIL_PAGE_READY_XPATH = "//div[contains(@class, 'projectDetailContainer')] | //b[starts-with(normalize-space(), 'Open Date')]"
+# Labels read from every Bonfire project detail page
+DETAIL_PAGE_LABELS = ("Type:", "Project Description:", "Open Date:", "Close Date:", "Days Left:", "Contact Information:")
+# Fields a detail page fills in, "Fallback Date" is the raw date-looking match
+# used when no Open Date could be found, the caller decides whether to keep it
+DETAIL_PAGE_FIELDS = ("Type", "Project Description", "Open Date", "Close Date", "Days Left", "Contact Information",
+                      "Status", "Ref. #", "Project", "Fallback Date")
+# Last resort for the open date: the first date-looking text anywhere in the page source
+DETAIL_PAGE_DATE_RE = re.compile(
+    r"(\b\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}\b|\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2}(?:st|nd|rd|th)?,? \d{4}(?:,?\s+\d{1,2}:\d{2}(?::\d{2})?\s*[AP]M\s*[A-Z]{1,5})?\b)",
+    re.IGNORECASE
+)
+_PROJECT_DETAIL_CONTAINER = class_xpath('projectDetailContainer', tag='div')
+# BeautifulSoup's class_='modalSection projectDetailSection' matches the whole class string
+_PROJECT_DETAIL_SECTIONS = etree.XPath(".//div[normalize-space(@class)='modalSection projectDetailSection']")
+
+def _label_value_lxml(found_b_tag, stripped_labelText):
+    """lxml version of the value lookup in get_tag_on_details_page, same three cases in the same order."""
+    description_div = next(found_b_tag.itersiblings('div'), None)
+    if description_div is not None:
+        return element_text(description_div, strip=True)
+
+    project_text = ""
+    parent_element = found_b_tag.getparent()
+    if parent_element is not None:
+        parent_full_text = element_text(parent_element, strip=True)
+        b_tag_actual_text = element_text(found_b_tag, strip=True)
+        if parent_full_text.startswith(b_tag_actual_text):
+            project_text = parent_full_text[len(b_tag_actual_text):].strip()
+        elif parent_full_text.startswith(stripped_labelText):
+            project_text = parent_full_text[len(stripped_labelText):].strip()
+
+    if not project_text:
+        # the tail is the text node BeautifulSoup would see as next_sibling
+        if found_b_tag.tail:
+            project_text = found_b_tag.tail.strip()
+        else:
+            next_sibling = found_b_tag.getnext()
+            if next_sibling is not None:
+                if isinstance(next_sibling.tag, str):
+                    project_text = element_text(next_sibling, strip=True)
+                elif next_sibling.text:
+                    project_text = next_sibling.text.strip()
+    return project_text
+
+def _iter_strings_with_parent(element):
+    """
+    Yields (string, parent) for every string under element in document order,
+    comments, scripts and styles included, the way BeautifulSoup's
+    find(string=...) walks them.
+    """
+    if element.text:
+        yield element.text, element if isinstance(element.tag, str) else element.getparent()
+    if isinstance(element.tag, str):
+        for child in element:
+            yield from _iter_strings_with_parent(child)
+            if child.tail:
+                yield child.tail, element
+
+def _fill_detail_fields(fields, div_data, open_date_text, page_source):
+    """
+    Applies the fallbacks shared by both extractor versions: the
+    projectDetailSection pairs, then the text around "Open Date", then the
+    date regex over the raw source.
+    """
+    if div_data is not None:
+        for key in DETAIL_PAGE_FIELDS[:9]:
+            if not fields.get(key):
+                fields[key] = div_data.get(key)
+    if not fields["Open Date"] and open_date_text is not None:
+        text = open_date_text()
+        if text is not None:
+            fields["Open Date"] = text
+    fields["Fallback Date"] = None
+    if not fields["Open Date"]:
+        match = DETAIL_PAGE_DATE_RE.search(page_source)
+        if match:
+            fields["Fallback Date"] = match.group(1)
+    return fields
+
+def _extract_detail_page_lxml(html):
+    """
+    Single-pass lxml version of the detail page extraction: the document is
+    parsed once and the <b> labels and projectDetailSection pairs are each
+    collected in one walk.
+    """
+    root = parse_html(html)
+    fields = {key: None for key in DETAIL_PAGE_FIELDS}
+    if root is None:
+        fields.update({label.rstrip(':'): "" for label in DETAIL_PAGE_LABELS})
+        return _fill_detail_fields(fields, None, None, html or "")
+
+    # Mechanism 1: first <b> starting with each label
+    pending = {label: label.strip() for label in DETAIL_PAGE_LABELS}
+    found = {}
+    for b_tag in root.iter('b'):
+        b_text = element_text(b_tag, strip=True)
+        for label, stripped_label in list(pending.items()):
+            if b_text.startswith(stripped_label):
+                found[label] = b_tag
+                del pending[label]
+        if not pending:
+            break
+    for label in DETAIL_PAGE_LABELS:
+        fields[label.rstrip(':')] = _label_value_lxml(found[label], label.strip()) if label in found else ""
+
+    # Mechanism 2: every label/value pair of the div-based layout
+    div_data = None
+    container = next(iter(_PROJECT_DETAIL_CONTAINER(root)), None)
+    if container is not None:
+        div_data = {}
+        for section in _PROJECT_DETAIL_SECTIONS(container):
+            b_tag = next(section.iter('b'), None)
+            if b_tag is not None:
+                full_text = element_text(section, separator=' ', strip=True)
+                b_text = element_text(b_tag, separator=' ', strip=True)
+                div_data[element_text(b_tag, strip=True).rstrip(':')] = full_text.replace(b_text, '', 1).strip()
+
+    # Mechanism 3: the text around the first string mentioning "Open Date"
+    def open_date_text():
+        for text, parent in _iter_strings_with_parent(root):
+            if "Open Date" in text:
+                return element_text(parent, strip=True).replace("Open Date:", "").strip()
+        return None
+
+    return _fill_detail_fields(fields, div_data, open_date_text, html)
+
+def _extract_detail_page_soup(html):
+    """BeautifulSoup version of _extract_detail_page_lxml, one soup for every mechanism."""
+    soup = BeautifulSoup(html, 'html.parser')
+    fields = {key: None for key in DETAIL_PAGE_FIELDS}
+    for label in DETAIL_PAGE_LABELS:
+        fields[label.rstrip(':')] = get_tag_on_details_page(soup, labelText=label)
+
+    div_data = None
+    project_container = soup.find('div', class_='projectDetailContainer')
+    if project_container:
+        div_data = {}
+        for section in project_container.find_all('div', class_='modalSection projectDetailSection'):
+            b_tag = section.find('b')
+            if b_tag:
+                # Extract Value by stripping the <b> tag's text out of the full section text
+                full_text = section.get_text(separator=' ', strip=True)
+                b_text = b_tag.get_text(separator=' ', strip=True)
+                div_data[b_tag.get_text(strip=True).rstrip(':')] = full_text.replace(b_text, '', 1).strip()
+
+    def open_date_text():
+        open_date_element = soup.find(string=lambda text: text and "Open Date" in text)
+        if open_date_element:
+            return open_date_element.parent.get_text(strip=True).replace("Open Date:", "").strip()
+        return None
+
+    return _fill_detail_fields(fields, div_data, open_date_text, html)
+
+# Benchmark and parity check on the pages saved by fetch_single_tender:
+#   python -m lib.html_parser fetch_tenders_all bonfire_detail_page screenshots/*_tender_scrap_*.html*
+register_extractor('bonfire_detail_page', _extract_detail_page_lxml, _extract_detail_page_soup)
+
+def parse_opportunities_table(page_source, city_name):
+    """
+    Rebuilds the rendered DataTables opportunities grid from a portal page.
+
+    Returns:
+        tuple: (header_list, rows), the rows being lists that line up with the headers.
+    """
+    dataTables_scroll_soup = BeautifulSoup(page_source, 'html.parser')
+    table_wrapper = dataTables_scroll_soup.find('div', class_='dataTables_scroll')
+    if not table_wrapper:
+        # Fallback: Sometimes if scrolling isn't triggered, DataTables just uses a wrapper ID
+        table_wrapper = dataTables_scroll_soup.find('div', id=lambda x: x and x.endswith('_wrapper'))
+
+    if not table_wrapper:
+        print("this doesnt matter if it fails it fails")
+    # Extract Headers
+    header_list = []
+    header_table_soup = dataTables_scroll_soup.find('div', class_='dataTables_scrollHead')
+    if header_table_soup:
+        headers_th = header_table_soup.find_all('th')
+        header_list = [th.get_text(strip=True) for th in headers_th]
+        if header_list and header_list[-1].lower() == "action":
+            header_list[-1] = "Action Link"
+    else:
+        print(f"Warning: Could not find headers for {city_name}. Using default headers.")
+        header_list = ['Status', 'Ref. #', 'Project', 'Close Date', 'Days Left', 'Action Link', 'Contact Information']
+
+    # Extract Data Rows
+    all_rows_data = []
+    body_table_soup = dataTables_scroll_soup.find('div', class_='dataTables_scrollBody')
+    if body_table_soup:
+        tbody = body_table_soup.find('tbody')
+        if tbody:
+            for row_tr in tbody.find_all('tr'):
+                cells_td = row_tr.find_all('td')
+                row_data = [cell.get_text(separator=' ', strip=True) for cell in cells_td]
+
+                # Special handling for the last cell to get the href
+                if cells_td:
+                    link_tag = cells_td[-1].find('a')
+                    row_data[-1] = link_tag['href'] if link_tag and link_tag.has_attr('href') else None
+
+                if len(row_data) == len(header_list):
+                    all_rows_data.append(row_data)
+    return header_list, all_rows_data
+
+
+
 
 async def fetch_single_tender(tab: Tab, config: dict):
     """
@@ -310,7 +522,7 @@ async def fetch_single_tender(tab: Tab, config: dict):
                         submit_btn = await tab.find(tag_name="button", type="submit", timeout=5)
                         await submit_btn.click()
             
-                        await asyncio.sleep(6) # Wait for password field to appear
+                        await wait_for_selector(tab, 'input[type="password"]', timeout=6) # Wait for password field to appear
     
                         print("Entering password...")
                         pass_input = await tab.find(tag_name="input", type="password", timeout=10)
@@ -329,50 +541,13 @@ async def fetch_single_tender(tab: Tab, config: dict):
                 await tab.go_to(initial_url)
                 print(f"Failed to login for {CITY_NAME}. Skipping.")
             # Log In look to element Log In, if so, set login flag to true
-            await asyncio.sleep(random.uniform(4, 5))
-            page_source = await tab.page_source
-            with open(f"{base_dir}/{CITY_NAME}_bonfire.html", "w", encoding='utf-8', errors='ignore') as f:
-                f.write(page_source)
-
             # --- 2. Scrape the Main Table ---
+            # Wait for the DataTables grid to fill, 5s at most
+            await wait_for_selector(tab, 'div.dataTables_scrollBody tbody tr', timeout=5)
+            page_source = await tab.page_source
+            get_artifact_writer().save_html(f"{base_dir}/{CITY_NAME}_bonfire.html", page_source, source=CITY_NAME)
             print(f"Parsing opportunities table for {CITY_NAME}...")
-            dataTables_scroll_soup = BeautifulSoup(page_source, 'html.parser')
-            table_wrapper = dataTables_scroll_soup.find('div', class_='dataTables_scroll')
-            if not table_wrapper:
-                # Fallback: Sometimes if scrolling isn't triggered, DataTables just uses a wrapper ID
-                table_wrapper = dataTables_scroll_soup.find('div', id=lambda x: x and x.endswith('_wrapper'))
-
-            if not table_wrapper:
-                print("this doesnt matter if it fails it fails")
-            # Extract Headers
-            header_list = []
-            header_table_soup = dataTables_scroll_soup.find('div', class_='dataTables_scrollHead')
-            if header_table_soup:
-                headers_th = header_table_soup.find_all('th')
-                header_list = [th.get_text(strip=True) for th in headers_th]
-                if header_list and header_list[-1].lower() == "action":
-                    header_list[-1] = "Action Link"
-            else:
-                print(f"Warning: Could not find headers for {CITY_NAME}. Using default headers.")
-                header_list = ['Status', 'Ref. #', 'Project', 'Close Date', 'Days Left', 'Action Link', 'Contact Information']
-
-            # Extract Data Rows
-            all_rows_data = []
-            body_table_soup = dataTables_scroll_soup.find('div', class_='dataTables_scrollBody')
-            if body_table_soup:
-                tbody = body_table_soup.find('tbody')
-                if tbody:
-                    for row_tr in tbody.find_all('tr'):
-                        cells_td = row_tr.find_all('td')
-                        row_data = [cell.get_text(separator=' ', strip=True) for cell in cells_td]
-                        
-                        # Special handling for the last cell to get the href
-                        if cells_td:
-                            link_tag = cells_td[-1].find('a')
-                            row_data[-1] = link_tag['href'] if link_tag and link_tag.has_attr('href') else None
-                        
-                        if len(row_data) == len(header_list):
-                            all_rows_data.append(row_data)
+            header_list, all_rows_data = parse_opportunities_table(page_source, CITY_NAME)
 
             if not all_rows_data:
                 print(f"No data rows found in the table for {CITY_NAME}.")
@@ -410,102 +585,45 @@ async def fetch_single_tender(tab: Tab, config: dict):
                         else:
                             # Direct navigation for everything else
                             await tab.go_to(full_link)
-                            await asyncio.sleep(random.uniform(3, 4))
+                            await wait_for_selector(tab, DETAIL_PAGE_READY_XPATH, timeout=4)
                         # dont need the human loop
                         # selector = "//body"
                         # await perform_human_loop(tab, selector, 1)
                         # print(f"Failed to solve captcha challenge for detail page {full_link}. Skipping.")
                         new_page_source = await tab.page_source
-                        with open(f"{base_dir}/{CITY_NAME}_tender_scrap_{index}.html", "w", encoding='utf-8', errors='ignore') as f:
-                            f.write(new_page_source)
 
                         # Take screenshot and get page source
                         screenshot_path = f"{base_dir}/{CITY_NAME}_tender_{index}.png"
-                        await tab.take_screenshot(path=screenshot_path)
+                        await get_artifact_writer().save_screenshot(tab, screenshot_path, source=CITY_NAME)
+                        get_artifact_writer().save_html(f"{base_dir}/{CITY_NAME}_tender_scrap_{index}.html", new_page_source, source=CITY_NAME)
 
                         # Parse details from the new page
-                        detail_soup = BeautifulSoup(new_page_source, 'html.parser')
-                        
-                        type_text = get_tag_on_details_page(detail_soup, labelText = "Type:")
-                        project_description = get_tag_on_details_page(detail_soup, labelText = "Project Description:")
-                        open_date = get_tag_on_details_page(detail_soup, labelText = "Open Date:")
-                        close_date = get_tag_on_details_page(detail_soup, labelText = "Close Date:")
-                        days_left = get_tag_on_details_page(detail_soup, labelText = "Days Left:")
-                        contact_information = get_tag_on_details_page(detail_soup, labelText = "Contact Information:")
-
-                        status_val = row.get('Status')
-                        ref_val = row.get('Ref. #')
-                        project_val = row.get('Project')
-                        new_page_source = await tab.page_source
-                        detail_soup = BeautifulSoup(new_page_source, 'html.parser')
-
-                        # Mechanism 2: Fallback to checking the new div-based layout inside the details page
-                        project_container = detail_soup.find('div', class_='projectDetailContainer')
-                        if project_container:
-                            # Build a dictionary of all available fields from the container
-                            div_data = {}
-                            sections = project_container.find_all('div', class_='modalSection projectDetailSection')
-                            
-                            for section in sections:
-                                b_tag = section.find('b')
-                                if b_tag:
-                                    # Extract Key (e.g., "Open Date") and remove trailing colon
-                                    key = b_tag.get_text(strip=True).rstrip(':')
-                                    
-                                    # Extract Value by stripping the <b> tag's text out of the full section text
-                                    full_text = section.get_text(separator=' ', strip=True)
-                                    b_text = b_tag.get_text(separator=' ', strip=True)
-                                    value = full_text.replace(b_text, '', 1).strip()
-                                    
-                                    div_data[key] = value
-
-                            # Fill in any missing details from Mechanism 1 using the extracted div_data
-                            if not type_text: type_text = div_data.get('Type')
-                            if not project_description: project_description = div_data.get('Project Description')
-                            if not open_date: open_date = div_data.get('Open Date')
-                            if not close_date: close_date = div_data.get('Close Date')
-                            if not days_left: days_left = div_data.get('Days Left')
-                            if not contact_information: contact_information = div_data.get('Contact Information')
-                            
-                            # Fill in row values if they were missing from the initial main table scrape
-                            if not status_val: status_val = div_data.get('Status')
-                            if not ref_val: ref_val = div_data.get('Ref. #')
-                            if not project_val: project_val = div_data.get('Project')
-                        # Mechanism 3: Final emergency fallback for open_date
-                        new_page_source = await tab.page_source
-                        detail_soup = BeautifulSoup(new_page_source, 'html.parser')
-                        if not open_date:
-                            # Search the entire soup for an element containing "Open Date:"
-                            open_date_element = detail_soup.find(string=lambda text: text and "Open Date" in text)
-                            print("scanned for open_date_element", open_date_element)
-                            if open_date_element:
-                                # Get the parent container's full text
-                                parent_text = open_date_element.parent.get_text(strip=True)
-                                # Strip out the "Open Date:" label to isolate just the date value
-                                open_date = parent_text.replace("Open Date:", "").strip()
-
-                        if not open_date:
-                            date_pattern = r"(\b\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}\b|\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2}(?:st|nd|rd|th)?,? \d{4}(?:,?\s+\d{1,2}:\d{2}(?::\d{2})?\s*[AP]M\s*[A-Z]{1,5})?\b)"
-                            all_matches = re.findall(date_pattern, new_page_source, re.IGNORECASE)
-
-                            if all_matches:
-                                first_raw_date = all_matches[0]
-                                print(f"Found raw text date match: {first_raw_date}")
-                    
-                                try:
-                                    # Use dateutil parser to cleanly format the date string
-                                    # make sure length is greater than 5 characters
-                                    if len(first_raw_date) > 5:
-                                        open_date = first_raw_date
-                                        print(f"Successfully parsed fallback date: {open_date}")
-                                    else:
-                                        print("failed to parse date")
-                                        failed_to_parse_open_date_num = failed_to_parse_open_date_num + 1
-                                        if failed_to_parse_open_date_num >= 5:
-                                            break
-                    
-                                except (ValueError, TypeError) as e:
-                                    print(f"Could not parse the found date string: {e}")
+                        detail_fields = run_extractor('bonfire_detail_page', new_page_source)
+
+                        type_text = detail_fields["Type"]
+                        project_description = detail_fields["Project Description"]
+                        open_date = detail_fields["Open Date"]
+                        close_date = detail_fields["Close Date"]
+                        days_left = detail_fields["Days Left"]
+                        contact_information = detail_fields["Contact Information"]
+
+                        # Fill in row values if they were missing from the initial main table scrape
+                        status_val = row.get('Status') or detail_fields["Status"]
+                        ref_val = row.get('Ref. #') or detail_fields["Ref. #"]
+                        project_val = row.get('Project') or detail_fields["Project"]
+
+                        first_raw_date = detail_fields["Fallback Date"]
+                        if not open_date and first_raw_date:
+                            print(f"Found raw text date match: {first_raw_date}")
+                            # make sure length is greater than 5 characters
+                            if len(first_raw_date) > 5:
+                                open_date = first_raw_date
+                                print(f"Successfully parsed fallback date: {open_date}")
+                            else:
+                                print("failed to parse date")
+                                failed_to_parse_open_date_num = failed_to_parse_open_date_num + 1
+                                if failed_to_parse_open_date_num >= 5:
+                                    break
                         page_data = [
                             status_val, ref_val, project_val,
                             type_text, full_link, project_description,
@@ -545,6 +663,62 @@ async def fetch_single_tender(tab: Tab, config: dict):
         # if page:
         #     await page.close() # Close the page after use
 
+# Number of tabs working through the portals at once, 1 goes through them one by one
+BONFIRE_TABS = int(os.getenv('BONFIRE_TABS', 3))
+
+async def fetch_portals_in_tabs(browser, first_tab: Tab, portal_configs: list, max_tabs: int = BONFIRE_TABS,
+                                proxy_url: str = None):
+    """
+    Runs fetch_single_tender for every portal on a pool of tabs in the same browser.
+
+    Each tab takes the next portal off a shared queue as soon as it finishes
+    its current one, so the run takes roughly the total portal time divided
+    by the number of tabs. Cloudflare handling and the fraserhealth/icbc
+    pacing stay inside fetch_single_tender and so apply per tab.
+    """
+    queue = asyncio.Queue()
+    for portal_config in portal_configs:
+        queue.put_nowait(portal_config)
+
+    tab_count = max(1, min(max_tabs, len(portal_configs)))
+    tabs = [first_tab]
+    for _ in range(tab_count - 1):
+        tabs.append(await browser.new_tab())
+    print(f"--- Fetching {len(portal_configs)} portals with {tab_count} tab(s) ---")
+
+    async def worker(worker_tab: Tab, worker_index: int):
+        # stagger the first navigation so the tabs do not hit Cloudflare together
+        await asyncio.sleep(worker_index * random.uniform(2, 4))
+        while True:
+            try:
+                portal_config = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            await fetch_single_tender(worker_tab, portal_config)
+            print(f"[tab {worker_index}] {portal_config['city_name']} finished in {time.perf_counter() - start:.0f}s")
+            # Short rest between different portals
+            await asyncio.sleep(random.uniform(2, 5))
+
+    blockers = [await block_resources(worker_tab, f"bonfire tab {index}", proxy_url=proxy_url)
+                for index, worker_tab in enumerate(tabs)]
+    run_start = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker(worker_tab, index) for index, worker_tab in enumerate(tabs)))
+    finally:
+        for blocker in blockers:
+            try:
+                await blocker.stop()
+            except Exception as e:
+                print(f"Could not stop resource blocking: {e}")
+        for extra_tab in tabs[1:]:
+            try:
+                await extra_tab.close()
+            except Exception as e:
+                print(f"Could not close tab: {e}")
+    print(f"--- All portals fetched in {time.perf_counter() - run_start:.0f}s ---")
+    get_artifact_writer().report()
+
 async def main():
     load_dotenv() # Load environment variables from .env file
 
@@ -606,6 +780,7 @@ async def main():
     )
     # proxy_auth = f'{proxy_username}:{proxy_password}_country-ca_city-vancouver_session-EWassIZ9_lifetime-30m_streaming-1'
 
+    proxy_url = None
     if proxy_username and proxy_password:
         proxy_url = f'http://{proxy_auth}@{proxy}'
         print("Using proxy:", proxy_url)
@@ -618,39 +793,23 @@ async def main():
     try:
         async with Chrome(options=options) as browser:
             tab = await browser.start()
-            # --- START HIGH PERFORMANCE IMAGE BLOCKING ---
-            # blocked_count = 0
-            
-            # async def block_resource(event: RequestPausedEvent):
-            #     nonlocal blocked_count
-            #     request_id = event['params']['requestId']
-            #     url = event['params']['request']['url']
-            #     blocked_count += 1
-            #     print(f"🚫 Blocked Image ({blocked_count}): {url[:60]}")
-            #     # Instantly drop image requests at client side
-            #     await tab.fail_request(request_id, ErrorReason.BLOCKED_BY_CLIENT)
-
-            # # Only intercept 'Image' resource types to maximize network speed
-            # await tab.enable_fetch_events(resource_type='Image')
-            # await tab.on(FetchEvent.REQUEST_PAUSED, block_resource)
-            # --- END HIGH PERFORMANCE IMAGE BLOCKING ---
+            # images, fonts, media and trackers are dropped per tab in fetch_portals_in_tabs
             await asyncio.sleep(5)
             # visit google.com and then youtube.com after 10 seconds
+            portal_configs = []
             for config_item in tender_configs:
                 base_url = os.getenv(config_item['base_url_env_key'])
                 if not base_url:
                     print(f"Skipping {config_item['city_name']} - No URL found.")
                     continue
                 
-                current_config = {
+                portal_configs.append({
                     "base_url": base_url,
                     "csv_file_name": config_item['csv_file_name'],
                     "city_name": config_item['city_name']
-                }
-                
-                await fetch_single_tender(tab, current_config)
-                # Short rest between different portals
-                await asyncio.sleep(random.uniform(2, 5))
+                })
+
+            await fetch_portals_in_tabs(browser, tab, portal_configs, max_tabs=BONFIRE_TABS, proxy_url=proxy_url)
 
     except Exception as e:
         has_errors = True
@@ -0,0 +1,180 @@
+import io
+import os
+import gzip
+import queue
+import base64
+import atexit
+import random
+import threading
+from collections import Counter
+
+try:
+    from PIL import Image
+except ImportError:
+    # screenshots are still re-encoded by Chrome, just not downscaled
+    Image = None
+
+# Which debug artifacts (HTML dumps, screenshots) are kept:
+#   all        every one
+#   failure    only the ones saved on an error path
+#   first:N    the first N per source (site, scan, city), plus failures
+#   sample:P   a random P percent, plus failures
+#   none       nothing
+ARTIFACT_POLICY = os.getenv('ARTIFACT_POLICY', 'all').lower()
+# Disk budget for one run, artifacts past it are dropped
+ARTIFACT_BUDGET_MB = float(os.getenv('ARTIFACT_BUDGET_MB', 200))
+# HTML dumps are written as .html.gz
+ARTIFACT_COMPRESS_HTML = os.getenv('ARTIFACT_COMPRESS_HTML', 'True') == 'True'
+# Screenshots are captured as jpeg or webp at this quality instead of full PNGs
+ARTIFACT_SCREENSHOT_FORMAT = os.getenv('ARTIFACT_SCREENSHOT_FORMAT', 'jpeg').lower()
+ARTIFACT_SCREENSHOT_QUALITY = int(os.getenv('ARTIFACT_SCREENSHOT_QUALITY', 60))
+# Wider screenshots are scaled down to this width when Pillow is installed
+ARTIFACT_SCREENSHOT_MAX_WIDTH = int(os.getenv('ARTIFACT_SCREENSHOT_MAX_WIDTH', 1280))
+
+_EXTENSIONS = {'jpeg': 'jpg', 'webp': 'webp', 'png': 'png'}
+
+
+def screenshot_path(path, image_format=ARTIFACT_SCREENSHOT_FORMAT):
+    """Swaps the extension of a screenshot path for the configured format."""
+    return f"{os.path.splitext(path)[0]}.{_EXTENSIONS.get(image_format, image_format)}"
+
+
+def _downscale(data, image_format, max_width, quality):
+    if Image is None or not max_width:
+        return data
+    with Image.open(io.BytesIO(data)) as image:
+        if image.width <= max_width:
+            return data
+        height = round(image.height * max_width / image.width)
+        resized = image.convert('RGB').resize((max_width, height), Image.LANCZOS)
+        output = io.BytesIO()
+        resized.save(output, format=image_format.upper(), quality=quality)
+        return output.getvalue()
+
+
+class ArtifactWriter:
+    """
+    Writes debug artifacts on a background thread, so saving a page never
+    blocks the scraper's event loop, and decides which ones are worth
+    keeping at all.
+
+    Usage:
+        artifacts = get_artifact_writer()
+        artifacts.save_html(f"{base_dir}/page_1.html", page_source, source="victoria")
+        await artifacts.save_screenshot(tab, f"{base_dir}/page_1.png", source="victoria")
+        artifacts.save_html(path, page_source, source="victoria", failure=True)  # error paths
+
+    A screenshot the policy would drop is never captured. The writer is
+    flushed when the process exits, or by calling flush().
+    """
+
+    def __init__(self, policy=ARTIFACT_POLICY, budget_mb=ARTIFACT_BUDGET_MB, compress_html=ARTIFACT_COMPRESS_HTML):
+        self.policy = policy
+        self.budget_bytes = budget_mb * 1024 * 1024
+        self.compress_html = compress_html
+        self.bytes_written = 0
+        self.kept = Counter()
+        self.dropped = 0
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._budget_reported = False
+        self._thread = threading.Thread(target=self._work, name="artifact-writer", daemon=True)
+        self._thread.start()
+
+    def should_keep(self, source, failure=False):
+        """Applies the policy and the budget to the next artifact from source."""
+        with self._lock:
+            if self.bytes_written >= self.budget_bytes:
+                if not self._budget_reported:
+                    print(f"Artifact budget of {self.budget_bytes / 1024 / 1024:.0f} MB used up, dropping the rest")
+                    self._budget_reported = True
+                keep = False
+            elif self.policy == 'none':
+                keep = False
+            elif self.policy == 'all' or failure:
+                keep = True
+            elif self.policy == 'failure':
+                keep = False
+            elif self.policy.startswith('first:'):
+                keep = self.kept[source] < int(self.policy.split(':', 1)[1])
+            elif self.policy.startswith('sample:'):
+                keep = random.random() * 100 < float(self.policy.split(':', 1)[1])
+            else:
+                keep = True
+            if keep:
+                self.kept[source] += 1
+            else:
+                self.dropped += 1
+            return keep
+
+    def save_html(self, path, html, source, failure=False):
+        """Queues an HTML dump, gzipped to path + '.gz' when compression is on."""
+        if not html or not self.should_keep(source, failure):
+            return
+        self._queue.put(('html', path, html))
+
+    async def save_screenshot(self, tab, path, source, failure=False, beyond_viewport=False):
+        """
+        Captures a screenshot of tab as a compressed image, if the policy keeps it.
+        The extension of path is replaced to match ARTIFACT_SCREENSHOT_FORMAT.
+        """
+        if not self.should_keep(source, failure):
+            return
+        path = screenshot_path(path)
+        try:
+            # with as_base64 pydoll only uses path for its extension, nothing is written
+            data = await tab.take_screenshot(path=path, quality=ARTIFACT_SCREENSHOT_QUALITY,
+                                             beyond_viewport=beyond_viewport, as_base64=True)
+        except Exception as e:
+            print(f"Could not take screenshot {path}: {e}")
+            return
+        self._queue.put(('screenshot', path, data))
+
+    def flush(self):
+        """Blocks until every queued artifact is on disk."""
+        self._queue.join()
+
+    def report(self):
+        print(f"Artifacts: {sum(self.kept.values())} kept, {self.dropped} dropped, "
+              f"{self.bytes_written / 1024 / 1024:.1f} MB written")
+
+    def _write(self, kind, path, payload):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        if kind == 'html':
+            data = payload.encode('utf-8', errors='ignore')
+            if self.compress_html:
+                path = f"{path}.gz"
+                data = gzip.compress(data, compresslevel=6)
+        else:
+            data = _downscale(base64.b64decode(payload), ARTIFACT_SCREENSHOT_FORMAT,
+                              ARTIFACT_SCREENSHOT_MAX_WIDTH, ARTIFACT_SCREENSHOT_QUALITY)
+        with open(path, 'wb') as f:
+            f.write(data)
+        with self._lock:
+            self.bytes_written += len(data)
+
+    def _work(self):
+        while True:
+            kind, path, payload = self._queue.get()
+            try:
+                self._write(kind, path, payload)
+            except Exception as e:
+                print(f"Could not write artifact {path}: {e}")
+            finally:
+                self._queue.task_done()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_artifact_writer():
+    """Returns the process-wide ArtifactWriter, creating it on first use."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = ArtifactWriter()
+            atexit.register(_writer.flush)
+        return _writer
@@ -0,0 +1,134 @@
+import re
+import html
+
+# Hidden fields ASP.NET WebForms expects to be posted back on every request
+HIDDEN_STATE_FIELDS = ("__VIEWSTATE", "__VIEWSTATEGENERATOR", "__EVENTVALIDATION")
+
+# Only <input> tags whose id starts with "__" are looked at, so the scan skips
+# straight over the rest of the page without building a DOM.
+_HIDDEN_INPUT_RE = re.compile(r'<input\b[^>]*?\bid="(__[A-Z]+)"[^>]*>', re.IGNORECASE)
+_VALUE_ATTR_RE = re.compile(r'\bvalue="([^"]*)"', re.IGNORECASE)
+
+
+def parse_delta_response(text):
+    """
+    Splits an MS-AJAX UpdatePanel delta response into its parts.
+
+    The body of an __ASYNCPOST response is a sequence of
+    "length|type|id|content|" records where length is the size of content.
+
+    Args:
+        text (str): The raw response body.
+
+    Returns:
+        list: (type, id, content) tuples, or an empty list if the body is
+              not a delta response (e.g. the server sent a full page).
+    """
+    records = []
+    position = 0
+    text_length = len(text)
+    while position < text_length:
+        length_end = text.find('|', position)
+        if length_end == -1:
+            break
+        length_str = text[position:length_end]
+        if not length_str.isdigit():
+            # not a delta envelope
+            return []
+        type_end = text.find('|', length_end + 1)
+        id_end = text.find('|', type_end + 1)
+        if type_end == -1 or id_end == -1:
+            return []
+        content_start = id_end + 1
+        content_end = content_start + int(length_str)
+        if content_end > text_length or (content_end < text_length and text[content_end] != '|'):
+            return []
+        records.append((text[length_end + 1:type_end], text[type_end + 1:id_end], text[content_start:content_end]))
+        position = content_end + 1
+    return records
+
+
+def extract_hidden_state(text, records=None):
+    """
+    Pulls __VIEWSTATE, __VIEWSTATEGENERATOR and __EVENTVALIDATION out of a
+    WebForms response with a single scan, for either a full HTML page or a
+    delta response.
+
+    Args:
+        text (str): The raw response body.
+        records (list, optional): Already parsed delta records for text.
+
+    Returns:
+        dict: Field name -> value for the hidden fields that were found.
+    """
+    if records is None:
+        records = parse_delta_response(text)
+
+    state = {}
+    if records:
+        for record_type, record_id, content in records:
+            if record_type == 'hiddenField' and record_id in HIDDEN_STATE_FIELDS:
+                state[record_id] = content
+        return state
+
+    for match in _HIDDEN_INPUT_RE.finditer(text):
+        field = match.group(1)
+        if field not in HIDDEN_STATE_FIELDS:
+            continue
+        value_match = _VALUE_ATTR_RE.search(match.group(0))
+        state[field] = html.unescape(value_match.group(1)) if value_match else ""
+    return state
+
+
+class PostbackClient:
+    """
+    Wraps a requests.Session for an ASP.NET WebForms page and carries the
+    hidden view state from each response into the next postback.
+
+    Usage:
+        client = PostbackClient(session, url, proxies=proxies)
+        client.get()
+        resp = client.post({"ctl00$FeaturedContent$SearchButton": "Search"})
+    """
+
+    def __init__(self, session, url, proxies=None, timeout=None):
+        self.session = session
+        self.url = url
+        self.proxies = proxies or {}
+        self.timeout = timeout
+        self.state = {}
+
+    def update_state(self, text):
+        """Merges the hidden fields found in a response body into the carried state."""
+        self.state.update(extract_hidden_state(text))
+        return self.state
+
+    def get(self, **kwargs):
+        """Loads the page and captures its initial view state."""
+        kwargs.setdefault('proxies', self.proxies)
+        kwargs.setdefault('timeout', self.timeout)
+        response = self.session.get(self.url, **kwargs)
+        self.update_state(response.text)
+        return response
+
+    def build_payload(self, fields=None, event_target="", event_argument=""):
+        """Combines the carried view state with the form fields for a postback."""
+        if "__VIEWSTATE" not in self.state:
+            raise ValueError(f"No __VIEWSTATE captured for {self.url}")
+        payload = {
+            "__EVENTTARGET": event_target,
+            "__EVENTARGUMENT": event_argument,
+            "__VIEWSTATEENCRYPTED": "",
+        }
+        payload.update(self.state)
+        payload.update(fields or {})
+        return payload
+
+    def post(self, fields=None, event_target="", event_argument="", **kwargs):
+        """Posts the form back with the current view state and captures the new state."""
+        kwargs.setdefault('proxies', self.proxies)
+        kwargs.setdefault('timeout', self.timeout)
+        payload = self.build_payload(fields, event_target, event_argument)
+        response = self.session.post(self.url, data=payload, **kwargs)
+        self.update_state(response.text)
+        return response
@@ -1,10 +1,13 @@
 import asyncio
 import csv
+import re
 from pydoll.browser.chromium import Chrome
 from pydoll.browser.options import ChromiumOptions
 import time
 import os
 
+from lib.contacts import contact_after_label
+
 def get_browser_options(headless=False):
     """
     Returns a configured ChromiumOptions object with stealth settings,
@@ -123,15 +126,15 @@ async def scrape_competition_details(tab):
     closing_time = re.search(r"Closing Time:\s*(\d{1,2}:\d{2}\s*[apAP][mM])", text)
 
     # 3. Extract first email under Primary Contact
-    # Finds the block after "Primary Contact" and captures the first email pattern
-    email_match = re.search(r"Primary Contact[\s\S]*?([\w\.-]+@[\w\.-]+\.\w+)", text)
+    # Only the block right after "Primary Contact" is searched, not the rest of the page
+    contact = contact_after_label(text, "Primary Contact")
 
     return {
         "competition": page_data['mergedHeader'],
         "published": published.group(1) if published else "N/A",
         "closing_date": closing_date.group(1) if closing_date else "N/A",
         "closing_time": closing_time.group(1) if closing_time else "N/A",
-        "primary_email": email_match.group(1) if email_match else "N/A",
+        "primary_email": contact.email or "N/A",
         "intro_sentence": page_data['firstSentence']
     }
 
@@ -8,7 +8,7 @@ from dateutil.relativedelta import relativedelta
 import os
 from typing import Dict, List
 from zoneinfo import ZoneInfo
-import dateparser
+from lib.dates import parse_date
 import requests
 import unidecode
 import re
@@ -16,6 +16,7 @@ from lib.discord import send_discord_embed, send_discord_message
 from lib.utils import dash_pattern, unrelated_phrases, unrelated_commodities, unrelated_organizations, \
 load_city_mapping, find_bcbid_city_match
 from lib.timing import filter_tenders_by_last_run
+from lib.bcbid_planner import confirm_upload
 from mappers import _map_tender_type_to_stage
 from process_project_data import get_latest_issue, get_project_type_id, set_entry_issue_id
 
@@ -52,7 +53,7 @@ def _map_bcbid_tender_entry(tender_record: dict, params: dict, city_mapping: dic
     # Dates
     issue_date_str = tender_record.get('Issue Date and Time (Pacific Time)')
     if issue_date_str:
-        parsed_open_date = dateparser.parse(issue_date_str)
+        parsed_open_date = parse_date(issue_date_str)
         if parsed_open_date:
             entry['ys_date'] = parsed_open_date.strftime('%Y-%m-%d')
 
@@ -125,7 +126,7 @@ def _map_bcbid_tender_entry(tender_record: dict, params: dict, city_mapping: dic
     # Parse Closing date
     closing_date_str = tender_record.get('Closing Date and Time (Pacific Time)')
     if closing_date_str:
-        parsed_date_close = dateparser.parse(closing_date_str)
+        parsed_date_close = parse_date(closing_date_str)
         if parsed_date_close:
             if is_windows:
                 # Use '#' for Windows
@@ -451,6 +452,8 @@ if __name__ == "__main__":
         try:
             # we dont want to reupload the entire file if anything goes wrong
             process_and_send_bcbid_tenders(params)
+            # only now may the next scrape skip the pages this run fingerprinted
+            confirm_upload()
         except Exception as e:
             print(f"❌ An unexpected error occurred: {e}")
             try:
@@ -0,0 +1,241 @@
+import os
+import json
+import hashlib
+from datetime import datetime
+
+# 'False' runs every scan with every filter value and pages to the end, as before
+BCBID_SCAN_PLANNER = os.getenv('BCBID_SCAN_PLANNER', 'True') == 'True'
+# What the planner remembers between runs (fingerprints, organization coverage)
+BCBID_PLAN_STATE = os.getenv('BCBID_PLAN_STATE', 'screenshots/bcbid_scan_state.json')
+# An organization is dropped from the Organization Scan once this many of its
+# tenders have all come back from the Region Scan too
+BCBID_PLAN_MIN_OBSERVATIONS = int(os.getenv('BCBID_PLAN_MIN_OBSERVATIONS', 5))
+# Every Nth run uses the full plan, so dropped organizations are checked again
+BCBID_PLAN_FULL_EVERY = int(os.getenv('BCBID_PLAN_FULL_EVERY', 10))
+
+ISSUE_DATE_COLUMN = 'Issue Date and Time (Pacific Time)'
+ORGANIZATION_COLUMN = 'Organization (Issued by)'
+ORGANIZATION_SCAN = 'Organization Scan'
+REGION_SCAN = 'Region Scan'
+# The formats BC Bid prints issue dates in
+ISSUE_DATE_FORMATS = ("%Y-%m-%d %I:%M:%S %p", "%Y-%m-%d %I:%M %p", "%Y-%m-%d %H:%M:%S", "%Y-%m-%d")
+
+
+def _normalize(text):
+    return " ".join(str(text).split()).casefold()
+
+
+def parse_issue_date(text):
+    """Parses a grid issue date as a naive Pacific time, None if it is not in a known format."""
+    if not isinstance(text, str):
+        return None
+    for date_format in ISSUE_DATE_FORMATS:
+        try:
+            return datetime.strptime(text.strip(), date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def page_fingerprint(records, filters):
+    """A hash of a results page and the filters that produced it."""
+    rows = [(record.get('Opportunity Url', ''), record.get(ISSUE_DATE_COLUMN, '')) for record in records]
+    return hashlib.sha1(json.dumps([filters, rows], sort_keys=True).encode('utf-8')).hexdigest()
+
+
+class ScanPlanner:
+    """
+    Decides how much of each BC Bid filter scan actually has to run.
+
+    - plan() drops filter values that cannot add anything: repeated values,
+      and organizations whose tenders the Region Scan has always returned
+      too, learned over previous runs. A scan left with no values is skipped.
+    - should_stop() ends pagination once a page only holds tenders issued
+      before the execution window, or when a scan's first page is the same
+      as last run's. Last run's fingerprints only count if that run finished
+      and its results were uploaded (confirm_upload), otherwise the pages it
+      fingerprinted may never have reached the API.
+
+    Usage:
+        planner = ScanPlanner(min_date, window_start)
+        scans = planner.plan(scans)
+        ...  # per results page
+        if planner.should_stop(scan, page, page_records, has_next):
+            break
+        ...
+        ...  # everything else the run does
+        planner.finish()  # at the very end: learns from this run, saves state and logs the savings
+        ...
+        confirm_upload()  # in the processor, once the results are uploaded
+
+    The results pages are assumed to list the newest tenders first, which is
+    what both stopping rules rely on.
+    """
+
+    def __init__(self, min_date, window_start=None, state_path=BCBID_PLAN_STATE, enabled=BCBID_SCAN_PLANNER):
+        self.min_date = min_date
+        # naive Pacific time, like the grid's issue dates
+        self.window_start = window_start.replace(tzinfo=None) if window_start else None
+        self.state_path = state_path
+        self.enabled = enabled
+        self.state = self._load()
+        self.organizations_dropped = 0
+        self.values_dropped = 0
+        self.scans_skipped = 0
+        self.early_stops = []
+        self._records = {}
+
+    def _load(self):
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        state.setdefault('runs', 0)
+        state.setdefault('fingerprints', {})
+        state.setdefault('organizations', {})
+        # state files from before these flags come from finished, uploaded runs
+        state.setdefault('completed', True)
+        state.setdefault('uploaded', True)
+        return state
+
+    def _save(self):
+        directory = os.path.dirname(self.state_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        try:
+            with open(self.state_path, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f, indent=2)
+        except OSError as e:
+            print(f"Could not save the scan planner state: {e}")
+
+    def _filters(self, scan):
+        return {'values': sorted(scan['values']), 'min_date': self.min_date}
+
+    def covered_organizations(self):
+        """Organizations whose every observed tender was also in the Region Scan results."""
+        return {
+            name for name, counts in self.state['organizations'].items()
+            if counts.get('seen', 0) >= BCBID_PLAN_MIN_OBSERVATIONS and counts.get('missed', 0) == 0
+        }
+
+    def plan(self, scans):
+        """
+        Returns the scans to run, with redundant filter values removed, and
+        prints the plan.
+        """
+        if not self.state['completed']:
+            print("The last BC Bid run did not finish, ignoring its first-page fingerprints")
+            self.state['fingerprints'] = {}
+        elif not self.state['uploaded']:
+            print("The last BC Bid run's upload was not confirmed, ignoring its first-page fingerprints")
+            self.state['fingerprints'] = {}
+        self.state['runs'] += 1
+        # stay False on disk unless finish() and confirm_upload() are reached
+        self.state['completed'] = False
+        self.state['uploaded'] = False
+        self._save()
+        full_plan = not self.enabled or self.state['runs'] % BCBID_PLAN_FULL_EVERY == 0
+        covered = set() if full_plan else self.covered_organizations()
+
+        planned = []
+        print(f"--- BC Bid scan plan (run {self.state['runs']}{', full' if full_plan else ''}) ---")
+        for scan in scans:
+            values = []
+            seen = set()
+            for value in scan['values']:
+                key = _normalize(value)
+                if key in seen:
+                    continue
+                seen.add(key)
+                if scan['name'] == ORGANIZATION_SCAN and key in covered:
+                    print(f"  {scan['name']}: dropping '{value}', the Region Scan has returned all its tenders")
+                    self.organizations_dropped += 1
+                    continue
+                values.append(value)
+            self.values_dropped += len(scan['values']) - len(values)
+            if not values:
+                print(f"  {scan['name']}: nothing left to filter on, skipped")
+                self.scans_skipped += 1
+                continue
+            print(f"  {scan['name']}: {len(values)} of {len(scan['values'])} filter values")
+            planned.append({**scan, 'values': values})
+        return planned
+
+    def should_stop(self, scan, page, records, has_next=True):
+        """Called after each results page is read, True if the next pages are not needed."""
+        # only what coverage learning needs, the records themselves go to the spool
+        self._records.setdefault(scan['name'], []).extend(
+            (record.get('Opportunity Url'), record.get(ORGANIZATION_COLUMN)) for record in records
+        )
+        previous = None
+        if page == 1:
+            previous = self.state['fingerprints'].get(scan['name'])
+            self.state['fingerprints'][scan['name']] = page_fingerprint(records, self._filters(scan))
+        if not self.enabled or not has_next:
+            return False
+
+        if page == 1:
+            if self.state['fingerprints'][scan['name']] == previous:
+                print(f"[{scan['name']}] first page unchanged since the last run, not paging further")
+                self.early_stops.append((scan['name'], page, 'unchanged'))
+                return True
+
+        if self.window_start and records:
+            issue_dates = [parse_issue_date(record.get(ISSUE_DATE_COLUMN)) for record in records]
+            # an unreadable date counts as recent, so it never ends a scan
+            if all(issue_date is not None and issue_date < self.window_start for issue_date in issue_dates):
+                print(f"[{scan['name']}] page {page} is all older than {self.window_start}, not paging further")
+                self.early_stops.append((scan['name'], page, 'older than window'))
+                return True
+        return False
+
+    def _learn_coverage(self):
+        # only a run where both scans ran with every organization tells us anything
+        if self.organizations_dropped or ORGANIZATION_SCAN not in self._records or REGION_SCAN not in self._records:
+            return
+        region_urls = {url for url, _ in self._records[REGION_SCAN]}
+        for url, organization in self._records[ORGANIZATION_SCAN]:
+            if not isinstance(organization, str) or not organization.strip():
+                continue
+            counts = self.state['organizations'].setdefault(_normalize(organization), {'seen': 0, 'missed': 0})
+            counts['seen'] += 1
+            if url not in region_urls:
+                counts['missed'] += 1
+
+    def finish(self, completed=True):
+        """
+        Logs what the plan saved and, if the run completed, learns organization
+        coverage from it and saves the state with this run's fingerprints.
+        Call it once everything the scraper does has succeeded, the upload is
+        confirmed separately with confirm_upload().
+        """
+        if completed:
+            self._learn_coverage()
+            self.state['completed'] = True
+            self._save()
+        else:
+            print("BC Bid run did not complete, the scan planner state is not updated")
+        print(f"--- BC Bid scan plan saved {self.values_dropped} filter values, {self.scans_skipped} scans "
+              f"and stopped paging early {len(self.early_stops)} time(s) ---")
+        for scan_name, page, reason in self.early_stops:
+            print(f"  {scan_name}: stopped after page {page} ({reason})")
+
+
+def confirm_upload(state_path=BCBID_PLAN_STATE):
+    """
+    Marks the last run's results as uploaded, so the next run may trust its
+    first-page fingerprints. The processor calls it after a successful upload.
+    """
+    try:
+        with open(state_path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        print(f"No scan planner state at {state_path}, nothing to confirm")
+        return
+    state['uploaded'] = True
+    try:
+        with open(state_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f, indent=2)
+    except OSError as e:
+        print(f"Could not save the scan planner state: {e}")
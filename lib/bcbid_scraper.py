@@ -1,7 +1,7 @@
 import asyncio
 import os
 import time
-import lxml
+import lxml.html
 import re
 import pandas as pd
 import random
@@ -13,11 +13,142 @@ from pydoll.constants import Key
 from pydoll.constants import By
 from pydoll.constants import ScrollPosition
 from pydoll.exceptions import FailedToStartBrowser
+from lib.resource_blocker import block_resources
+from lib.readiness import NetworkMonitor, PolitenessBudget, evaluate, pace, wait_for_condition, wait_for_change, \
+row_signature_expression
+from lib.artifacts import get_artifact_writer
+from lib.html_parser import parse_html, register_extractor, run_extractor
+from lib.bcbid_planner import ScanPlanner
+from lib.spool import RecordSpool, iter_pages, iter_records, unique_records, write_csv
+from lib.contacts import contact_near_email, page_text
+from lxml import etree
 from lib.utils import find_bcbid_city_match, load_city_mapping, regional_districts, target_organizations, \
 scan_text_for_cities, DEFAULT_CITY
 from datetime import datetime, timedelta
 
 FILE_DIR = "screenshots"
+# Changes whenever the results grid shows a different page of rows
+GRID_SIGNATURE = row_signature_expression("#body_x_grid_grd tr")
+BCBID_URL = "https://bcbid.gov.bc.ca"
+_GRID_XPATH = etree.XPath("//table[@id='body_x_grid_grd']")
+# the rows pandas reads from a table, nested tables left out
+_GRID_ROWS_XPATH = etree.XPath("./thead/tr | ./tbody/tr | ./tr | ./tfoot/tr")
+_STYLED_XPATH = etree.XPath("descendant::style | descendant::*[@style]")
+_ROW_LINK_XPATH = etree.XPath("descendant::a/@href")
+# what pandas.read_html collapses in a cell's text
+_CELL_WHITESPACE_RE = re.compile(r"[\r\n]+|\s{2,}")
+
+
+def _grid_cell_text(cell):
+    if not _STYLED_XPATH(cell):
+        return _CELL_WHITESPACE_RE.sub(" ", cell.text_content().strip())
+    # read_html skips <style> and display:none elements (displayed_only=True)
+    parts = []
+
+    def walk(element):
+        if element.tag is etree.Comment or element.tag is etree.ProcessingInstruction:
+            return
+        hidden = element.tag == 'style' or 'display:none' in element.get('style', '').replace(' ', '')
+        if not hidden and element.text:
+            parts.append(element.text)
+        if not hidden:
+            for child in element:
+                walk(child)
+        if element is not cell and element.tail:
+            parts.append(element.tail)
+
+    walk(cell)
+    return _CELL_WHITESPACE_RE.sub(" ", "".join(parts).strip())
+
+
+def _grid_headers(texts):
+    # column names as read_html gives them: "Unnamed: i" for blanks, ".1" on repeats
+    headers = []
+    seen = {}
+    for index, text in enumerate(texts):
+        name = text or f"Unnamed: {index}"
+        if name in seen:
+            seen[name] += 1
+            name = f"{name}.{seen[name]}"
+        else:
+            seen[name] = 0
+        headers.append(name)
+    return headers
+
+
+def _extract_grid_records_lxml(page_source):
+    """
+    Reads the results grid in one pass: the text of every cell, keyed by
+    column header, and the opportunity link of the row.
+
+    Returns:
+        list: One dict per result row, with the 'Opportunity Url' last.
+    """
+    root = parse_html(page_source)
+    grids = _GRID_XPATH(root) if root is not None else []
+    if not grids:
+        raise ValueError("No tables found matching id body_x_grid_grd")
+    headers = None
+    records = []
+    for row in _GRID_ROWS_XPATH(grids[0]):
+        cells = [cell for cell in row if cell.tag in ('td', 'th')]
+        if headers is None:
+            if cells and all(cell.tag == 'th' for cell in cells):
+                headers = _grid_headers([_grid_cell_text(cell) for cell in cells])
+            continue
+        if not any(cell.tag == 'td' for cell in cells):
+            continue
+        values = []
+        for cell in cells:
+            values.extend([_grid_cell_text(cell)] * int(cell.get('colspan', 1) or 1))
+        record = dict(zip(headers, values + [""] * (len(headers) - len(values))))
+        hrefs = _ROW_LINK_XPATH(cells[1]) if len(cells) > 1 and cells[1].tag == 'td' else []
+        record['Opportunity Url'] = f"{BCBID_URL}{hrefs[0]}" if hrefs else ""
+        records.append(record)
+    return records
+
+
+def _extract_grid_records_pandas(page_source):
+    """The pandas.read_html version the grid was first read with, kept as the reference."""
+    tree = lxml.html.fromstring(page_source)
+    header_count = len(tree.xpath("//table[@id='body_x_grid_grd']//tr[th][1]/th"))
+    grid_tables = pd.read_html(
+        StringIO(page_source),
+        attrs={'id': 'body_x_grid_grd'},
+        keep_default_na=False,
+        converters={column: str for column in range(header_count)},
+    )
+    df = grid_tables[0]
+
+    # Extract URLs
+    rows = tree.xpath("//table[@id='body_x_grid_grd']//tr[td]")
+
+    urls = []
+    for row in rows:
+        hrefs = row.xpath("./td[2]//a/@href")
+        if hrefs:
+            urls.append(f"{BCBID_URL}{hrefs[0]}")
+        else:
+            urls.append("")
+
+    df['Opportunity Url'] = pd.Series(urls)
+    return df.to_dict('records')
+
+# Benchmark and parity check on the result pages a scan saves (BCBID_KEEP_PAGE_HTML=True):
+#   python -m lib.html_parser lib.bcbid_scraper bcbid_grid screenshots/*_Scan_page_*.html*
+register_extractor('bcbid_grid', _extract_grid_records_lxml, _extract_grid_records_pandas)
+
+# 'True' keeps the raw HTML of every results page, for debugging and benchmarks
+BCBID_KEEP_PAGE_HTML = os.getenv('BCBID_KEEP_PAGE_HTML', 'False') == 'True'
+# Where each scan appends its parsed rows as it pages through the grid
+SPOOL_DIR = f"{FILE_DIR}/bcbid_spool"
+
+# Tabs the filter scans run on at once, one per scan by default
+BCBID_SCAN_TABS = int(os.getenv('BCBID_SCAN_TABS', 2))
+# Tabs opening opportunity pages at once in the deep dive
+BCBID_DEEP_DIVE_TABS = int(os.getenv('BCBID_DEEP_DIVE_TABS', 3))
+# Seconds between two navigations to bcbid.gov.bc.ca, shared by all deep dive tabs
+BCBID_MIN_REQUEST_INTERVAL = float(os.getenv('BCBID_MIN_REQUEST_INTERVAL', 1.5))
 
 def get_browser_options(headless=False):
     """
@@ -199,7 +330,7 @@ async def navigate_to_opportunities(tab: Tab):
             os.mkdir(FILE_DIR)
         await opps_link.click()
         await asyncio.sleep(3)
-        await tab.take_screenshot(f'{FILE_DIR}/trying_to_login.png', quality=90, beyond_viewport=True)
+        await get_artifact_writer().save_screenshot(tab, f'{FILE_DIR}/trying_to_login.png', source='bcbid login', beyond_viewport=True)
         await asyncio.sleep(4)  # Wait for portal redirection
         # wait for page to load
         selector = "//h1[contains(@class, 'maintitle') and contains(text(), 'Opportunities')]"
@@ -211,7 +342,7 @@ async def navigate_to_opportunities(tab: Tab):
         except Exception as e:
             print(f"Timed out waiting for text: {e}")
         # take a screenshot
-        await tab.take_screenshot(f'{FILE_DIR}/after_login.png', quality=90, beyond_viewport=True)
+        await get_artifact_writer().save_screenshot(tab, f'{FILE_DIR}/after_login.png', source='bcbid login', beyond_viewport=True)
         # try:
         #     submit_button = await tab.find(id='submit-btn')
         #     await submit_button.click()
@@ -242,374 +373,477 @@ async def perform_human_loop(tab: Tab, selector: str, max_attempts=2):
                 return True
         except Exception as e:
             print(f"Action {i} failed: {e}")
-            await tab.take_screenshot(f'{FILE_DIR}/action_error_{i}.png')
+            await get_artifact_writer().save_screenshot(tab, f'{FILE_DIR}/action_error_{i}.png', source='bcbid', failure=True)
             
     return False
 
-async def main():
-    opts = get_browser_options()
-    
-    async with Chrome(options=opts) as browser:
-        print("Starting browser...")
-        tab = await browser.start()
-        
-        url = "https://bcbid.gov.bc.ca/page.aspx/en/rfp/request_browse_public"
-        days_to_check = int(os.getenv('DAYS_TO_CHECK', 1))
-        # Calculate consistent dates for both passes
-        min_date = (datetime.now() - timedelta(days=days_to_check)).strftime('%Y-%m-%d')
-        max_date = datetime.now().strftime('%Y-%m-%d')
-
-        # Create our scan sequences for the dual extraction
-        # consider splitting target organizations if it gets better.
-        scans = [
-            {
-                "name": "Region Scan",
-                "input_id": "body_x_selRfpIdAreaLevelAreaNode_search",
-                "values": regional_districts
-            },
-            {
-                "name": "Organization Scan",
-                "input_id": "body_x_selBpmIdOrgaLevelOrgaNode_search", 
-                "values": target_organizations
-            }
-        ]
-        # if directory exists
-        if not os.path.exists(FILE_DIR):
-            # remove directory
-            os.mkdir(FILE_DIR)
-        global_all_table_htmls = []
-        global_all_dfs = []
-        print(f"Navigating to {url} to state...")
-        await tab.go_to(url)
-        for scan_index, scan in enumerate(scans):
-            print(f"\n========== Starting {scan['name']} ==========")
+async def run_scan(tab: Tab, monitor: NetworkMonitor, scan: dict, url: str, min_date: str, max_date: str,
+                   planner: ScanPlanner):
+    """
+    Runs one filtered scan (Region or Organization) on a tab that is already
+    on the opportunities page: sets the filters, searches and pages through
+    the results grid until the last page or until planner says to stop.
 
-            await asyncio.sleep(random.uniform(2.0, 4.0))
+    Every page's records are appended to the scan's spool as soon as they
+    are read, nothing is kept in memory.
 
-            # Wait for page to load via header
-            selector = "//h1[contains(@class, 'maintitle') and contains(text(), 'Opportunities')]"
-            success = await perform_human_loop(tab, selector)
+    Returns:
+        str: The path of the scan's spool file.
+    """
+    spool = RecordSpool(f"{SPOOL_DIR}/{scan['name'].replace(' ', '_')}.jsonl")
+    print(f"\n========== Starting {scan['name']} ==========")
+    previous_grid_signature = None
 
-            if not success:
-                print("Target not found after actions. Forcing navigation/wait...")
-                try:
-                    await tab.go_to(url)
-                    await tab.find_or_wait_element(By.XPATH, selector, timeout=15)
-                    await tab.take_screenshot(f'{FILE_DIR}/{scan["name"]}_recovery_success.png')
-                except Exception as e:
-                    print(f"Final recovery failed: {e}")
-                    await tab.take_screenshot(f'{FILE_DIR}/{scan["name"]}_final_timeout.png')
+    await asyncio.sleep(random.uniform(2.0, 4.0))
 
-            # 1. Set specific scan entity filters (Region or Organizations)
-            try:
-                print(f"Setting text filters for {scan['name']}...")
-                filter_search = await tab.find(scan['input_id'], timeout=15)
-                await filter_search.click()
-                # also click on the parent element
-                # await filter_search.parent().click()
-
-                for value_tag in scan['values']:
-                    print(f"Typing: {value_tag}")
-                    await filter_search.type_text(value_tag, humanize=False)
-                    await asyncio.sleep(random.uniform(0.5, 0.7))
-                    await tab.keyboard.press(Key.ENTER)
-                    await asyncio.sleep(random.uniform(0.5, 1.2))
-
-                await tab.keyboard.press(Key.ESCAPE)
-            except Exception as e:
-                print(f"Error during {scan['name']} filtering: {e}")
-                break
+    # Wait for page to load via header
+    selector = "//h1[contains(@class, 'maintitle') and contains(text(), 'Opportunities')]"
+    success = await perform_human_loop(tab, selector)
+
+    if not success:
+        print("Target not found after actions. Forcing navigation/wait...")
+        try:
+            await tab.go_to(url)
+            await tab.find_or_wait_element(By.XPATH, selector, timeout=15)
+            await get_artifact_writer().save_screenshot(tab, f'{FILE_DIR}/{scan["name"]}_recovery_success.png', source=scan['name'])
+        except Exception as e:
+            print(f"Final recovery failed: {e}")
+            await get_artifact_writer().save_screenshot(tab, f'{FILE_DIR}/{scan["name"]}_final_timeout.png', source=scan['name'], failure=True)
+
+    # 1. Set specific scan entity filters (Region or Organizations)
+    try:
+        print(f"Setting text filters for {scan['name']}...")
+        filter_search = await tab.find(scan['input_id'], timeout=15)
+        await filter_search.click()
+        # also click on the parent element
+        # await filter_search.parent().click()
+
+        for value_tag in scan['values']:
+            print(f"Typing: {value_tag}")
+            await filter_search.type_text(value_tag, humanize=False)
+            await asyncio.sleep(random.uniform(0.5, 0.7))
+            await tab.keyboard.press(Key.ENTER)
+            await asyncio.sleep(random.uniform(0.5, 1.2))
+
+        await tab.keyboard.press(Key.ESCAPE)
+    except Exception as e:
+        print(f"Error during {scan['name']} filtering: {e}")
+        return spool.path
+
+    # 2. Set Dates filters (applied on top of current scan limits)
+    try:
+        print("Setting date filters...")
+        await tab.execute_script(f"""
+            (() => {{
+                const minInput = document.getElementById('body_x_txtRfpBeginDate');
+                if (minInput) {{
+                    minInput.value = '{min_date}';
+                    minInput.dispatchEvent(new Event('change', {{ bubbles: true }}));
+                }}
+
+                const datePickerDiv = document.getElementById('ui-datepicker-div');
+                if (datePickerDiv) {{
+                    datePickerDiv.style.display = 'none';
+                }}
+            }})()
+        """)
+
+        # the date inputs can post back on change, let that settle (5s at most)
+        await monitor.wait_for_idle(timeout=5)
+        # the grid as it is before the search, page 1 is ready once it changes
+        previous_grid_signature = await evaluate(tab, GRID_SIGNATURE)
+
+        try:
+            search_button = await tab.find(id='body_x_prxFilterBar_x_cmdSearchBtn')
+            await search_button.click()
+        except Exception as e:
+            print(f"Error clicking search button: {e}")
+
+        print(f"Set Issue Date filters: Min = {min_date}, Max = {max_date}")
+    except Exception as e:
+        print(f"Error during date filtering: {e}")
+    # ==========================================
+    # FILTER VALIDATION CHECK
+    # ==========================================
+    print(f"Validating if {scan['name']} filters were successfully applied...")
+
+    # The summary data-id matches the input_id but without '_search'
+    # e.g., 'body_x_selBpmIdOrgaLevelOrgaNode_search' -> 'body_x_selBpmIdOrgaLevelOrgaNode'
+    summary_data_id = scan['input_id'].replace('_search', '')
+
+    validation_script = f"""
+        (() => {{
+            const summaryUl = document.querySelector('ul.tag-summary[data-id="{summary_data_id}"]');
+            if (!summaryUl) return false;
+
+            // If it has the 'hidden' class, it means no filters were applied for this category
+            if (summaryUl.classList.contains('hidden')) return false;
+
+            // Ensure there is at least one active tag value rendered
+            return summaryUl.querySelectorAll('li.tag-value').length > 0;
+        }})()
+    """
+
+    # Give the AJAX/DOM up to 10s to render the filter summary tags
+    filters_applied = await wait_for_condition(tab, validation_script, timeout=10)
+
+    if not filters_applied:
+        print(f"⚠️ ERROR: Validation failed for {scan['name']}. The filter labels did not appear.")
+        # Take an error screenshot for debugging later
+        await get_artifact_writer().save_screenshot(tab, f'{FILE_DIR}/{scan["name"].replace(" ", "_")}_validation_error.png', source=scan['name'], failure=True)
+
+        # You can choose to skip to the next scan here, or continue anyway. 
+        # If you want to skip:
+        # break 
+        # If you want to just log it and continue as requested:
+        print("Continuing despite missing filter tags...")
+        from lib.discord import send_discord_message
+        discord_webhook_url = os.getenv('DISCORD_WEBHOOK_URL')
+        send_discord_message(f"BC Bid Scraper Failed to start the scan for {scan['name']} @grandfleet:", discord_webhook_url)
+        return spool.path
+    else:
+        print(f"[SUCCESS] Validation passed: {scan['name']} tags are visible in the summary.")
+    # ==========================================
+    # 3. Scrape current Tabular Data
+    try:
+        print(f"Starting tabular data extraction for {scan['name']}...")
+        page = 1
+        max_pages = 10
+
+        while page <= max_pages:
+            print(f"[{scan['name']}] Extracting data from page {page}...")
 
-            # 2. Set Dates filters (applied on top of current scan limits)
             try:
-                print("Setting date filters...")
-                await tab.execute_script(f"""
-                    (() => {{
-                        const minInput = document.getElementById('body_x_txtRfpBeginDate');
-                        if (minInput) {{
-                            minInput.value = '{min_date}';
-                            minInput.dispatchEvent(new Event('change', {{ bubbles: true }}));
-                        }}
-
-                        const datePickerDiv = document.getElementById('ui-datepicker-div');
-                        if (datePickerDiv) {{
-                            datePickerDiv.style.display = 'none';
-                        }}
-                    }})()
-                """)
-
-                await asyncio.sleep(5)
+                # Wait for the AJAX grid to show new rows, 8s at most
+                await wait_for_change(tab, GRID_SIGNATURE, previous_grid_signature, timeout=8)
+                await monitor.wait_for_idle(timeout=3)
+                page_source = await tab.page_source
+
+                # Save the page source to an html page
+                if BCBID_KEEP_PAGE_HTML:
+                    get_artifact_writer().save_html(f'{FILE_DIR}/{scan["name"].replace(" ", "_")}_page_{page}.html', page_source, source=scan['name'])
+
+                page_records = run_extractor('bcbid_grid', page_source)
+                spool.append(page_records, page=page)
+                del page_source
+
+                # Check pagination
+                scriptReturnResult = await tab.execute_script("""
+                    (() => {
+                        const nextBtn = document.getElementById("body_x_grid_gridPagerBtnNextPage");
+                        if (!nextBtn) return true;
+                        const isClassDisabled = nextBtn.className.toLowerCase().includes('disabled');
+                        return isClassDisabled || nextBtn.disabled;
+                    })()
+                """, return_by_value=True, await_promise=True)
+                print(f"Next button is disabled: {scriptReturnResult}")
 
                 try:
-                    search_button = await tab.find(id='body_x_prxFilterBar_x_cmdSearchBtn')
-                    await search_button.click()
+                    is_disabled = scriptReturnResult.get('result', {}).get('result', {}).get('value')
                 except Exception as e:
-                    print(f"Error clicking search button: {e}")
-                
-                print(f"Set Issue Date filters: Min = {min_date}, Max = {max_date}")
+                    print(f"Error checking if next button is disabled: {e}")
+                    is_disabled = True
+
+                stop_early = planner.should_stop(scan, page, page_records, has_next=not is_disabled)
+                if is_disabled:
+                    print(f"Reached the last page for {scan['name']}.")
+                    break
+                if stop_early:
+                    break
+
+                print(f"Clicking 'Next' button to navigate to page {page + 1}...")
+                previous_grid_signature = await evaluate(tab, GRID_SIGNATURE)
+                await tab.execute_script('document.getElementById("body_x_grid_gridPagerBtnNextPage").click()')
+
+                page += 1
+
             except Exception as e:
-                print(f"Error during date filtering: {e}")
-            # ==========================================
-            # FILTER VALIDATION CHECK
-            # ==========================================
-            print(f"Validating if {scan['name']} filters were successfully applied...")
-            
-            # Give the AJAX/DOM a moment to render the filter summary tags
-            await asyncio.sleep(3) 
-
-            # The summary data-id matches the input_id but without '_search'
-            # e.g., 'body_x_selBpmIdOrgaLevelOrgaNode_search' -> 'body_x_selBpmIdOrgaLevelOrgaNode'
-            summary_data_id = scan['input_id'].replace('_search', '')
-
-            validation_script = f"""
-                (() => {{
-                    const summaryUl = document.querySelector('ul.tag-summary[data-id="{summary_data_id}"]');
-                    if (!summaryUl) return false;
-                    
-                    // If it has the 'hidden' class, it means no filters were applied for this category
-                    if (summaryUl.classList.contains('hidden')) return false;
-                    
-                    // Ensure there is at least one active tag value rendered
-                    return summaryUl.querySelectorAll('li.tag-value').length > 0;
-                }})()
-            """
-            
-            validation_result = await tab.execute_script(validation_script, return_by_value=True, await_promise=True)
-            
+                print(f"Error encountered during pagination on page {page}: {e}")
+                break
+
+        await get_artifact_writer().save_screenshot(tab, f'{FILE_DIR}/{scan["name"].replace(" ", "_")}_last_page.png', source=scan['name'], beyond_viewport=True)
+    except Exception as e:
+        print(f"Error during tabular data extraction for {scan['name']}: {e}")
+    # make FILE_DIR if it doesnt exist
+    if not os.path.exists(FILE_DIR):
+        os.mkdir(FILE_DIR)
+    # Optional network events bundle save per scan
+    await tab.save_bundle(f"{FILE_DIR}/bcbid_{scan['name'].replace(' ', '_')}.zip")
+
+    print(f"Scan {scan['name']} complete.")
+    # save csv as temp with scan name
+    if spool.records_written:
+        write_csv(f"{FILE_DIR}/{scan['name'].replace(' ', '_')}.csv", lambda: iter(spool))
+    return spool.path
+
+def execution_window_start():
+    """Start of this run's execution window, None if it cannot be worked out."""
+    try:
+        # lib.timing pulls in dateparser, which is only needed for this
+        from lib.timing import get_execution_window
+        from zoneinfo import ZoneInfo
+        start_dt, _ = get_execution_window(datetime.now(ZoneInfo("America/Vancouver")))
+        return start_dt
+    except Exception as e:
+        print(f"Could not work out the execution window, paging every scan to the end: {e}")
+        return None
+
+async def reset_filters(tab: Tab, monitor: NetworkMonitor):
+    """Clicks Reset so the next scan on this tab starts from empty filters."""
+    print(f"Clicking 'Reset' button...")
+    try:
+        # body_x_prxFilterBar_x_cmdRazBtn
+        await tab.execute_script('document.getElementById("body_x_prxFilterBar_x_cmdRazBtn").click()')
+        # let reset happen, 10s at most
+        await monitor.wait_for_idle(timeout=10)
+    except Exception as e:
+        print(f"Error clicking 'Reset' button: {e}")
+
+async def run_scans_in_tabs(browser, first_tab: Tab, first_monitor: NetworkMonitor, scans: list, url: str,
+                            min_date: str, max_date: str, planner: ScanPlanner, max_tabs: int = BCBID_SCAN_TABS):
+    """
+    Runs the scans on a pool of tabs in the same browser, each tab taking
+    the next scan off a shared queue, so with one tab per scan they all run
+    at the same time.
+
+    Returns:
+        list: The spool file of every scan that ran, in the order of scans.
+    """
+    queue = asyncio.Queue()
+    for scan_index, scan in enumerate(scans):
+        queue.put_nowait((scan_index, scan))
+    results = [None for _ in scans]
+
+    tab_count = max(1, min(max_tabs, len(scans)))
+    tabs = [(first_tab, first_monitor, None)]
+    for index in range(1, tab_count):
+        scan_tab = await browser.new_tab()
+        blocker = await block_resources(scan_tab, f'bcbid tab {index}', proxy_url=os.environ.get("PROXY_URL"))
+        monitor = NetworkMonitor(scan_tab)
+        await monitor.start()
+        tabs.append((scan_tab, monitor, blocker))
+    print(f"--- Running {len(scans)} scans with {tab_count} tab(s) ---")
+
+    async def worker(scan_tab: Tab, monitor: NetworkMonitor, worker_index: int):
+        # stagger the first navigation so the tabs do not hit the site together
+        await asyncio.sleep(worker_index * random.uniform(2, 4))
+        print(f"Navigating to {url} to state...")
+        await scan_tab.go_to(url)
+        first = True
+        while True:
+            try:
+                scan_index, scan = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            if not first:
+                await reset_filters(scan_tab, monitor)
+            first = False
+            start = time.perf_counter()
             try:
-                filters_applied = validation_result.get('result', {}).get('result', {}).get('value')
+                results[scan_index] = await run_scan(scan_tab, monitor, scan, url, min_date, max_date, planner)
             except Exception as e:
-                print(f"Error parsing validation script result: {e}")
-                filters_applied = False
-
-            if not filters_applied:
-                print(f"⚠️ ERROR: Validation failed for {scan['name']}. The filter labels did not appear.")
-                # Take an error screenshot for debugging later
-                await tab.take_screenshot(f'{FILE_DIR}/{scan["name"].replace(" ", "_")}_validation_error.png', quality=90)
-                
-                # You can choose to skip to the next scan here, or continue anyway. 
-                # If you want to skip:
-                # break 
-                # If you want to just log it and continue as requested:
-                print("Continuing despite missing filter tags...")
-                from lib.discord import send_discord_message
-                discord_webhook_url = os.getenv('DISCORD_WEBHOOK_URL')
-                send_discord_message(f"BC Bid Scraper Failed to start the scan for {scan['name']} @grandfleet:", discord_webhook_url)
-                break
-            else:
-                print(f"[SUCCESS] Validation passed: {scan['name']} tags are visible in the summary.")
-            # ==========================================
-            # 3. Scrape current Tabular Data
+                print(f"{scan['name']} failed: {e}")
+            print(f"[tab {worker_index}] {scan['name']} finished in {time.perf_counter() - start:.0f}s")
+
+    try:
+        await asyncio.gather(*(worker(scan_tab, monitor, index) for index, (scan_tab, monitor, _) in enumerate(tabs)))
+    finally:
+        for scan_tab, monitor, blocker in tabs[1:]:
             try:
-                print(f"Starting tabular data extraction for {scan['name']}...")
-                page = 1
-                max_pages = 10
-                
-                while page <= max_pages:
-                    print(f"[{scan['name']}] Extracting data from page {page}...")
-                    
-                    try:
-                        # Wait for AJAX table to fully load
-                        await asyncio.sleep(8)
-                        page_source = await tab.page_source
-                        
-                        # Save the page source to an html page
-                        with open(f'{FILE_DIR}/{scan["name"].replace(" ", "_")}_page_{page}.html', 'w', encoding='utf-8') as f:
-                            f.write(page_source)
-                            
-                        dfs = pd.read_html(
-                                StringIO(page_source), 
-                                attrs={'id': 'body_x_grid_grd'}
-                            )
-                        df = dfs[0]
-
-                        # Extract URLs
-                        tree = lxml.html.fromstring(page_source)
-                        rows = tree.xpath("//table[@id='body_x_grid_grd']//tr[td]")
-                        
-                        urls = []
-                        for row in rows:
-                            hrefs = row.xpath("./td[2]//a/@href")
-                            if hrefs:
-                                urls.append(f"https://bcbid.gov.bc.ca{hrefs[0]}")
-                            else:
-                                urls.append("")
-                        
-                        df['Opportunity Url'] = pd.Series(urls)
-                        table_html = df.to_html(index=False)
-            
-                        global_all_table_htmls.append(table_html)
-                        global_all_dfs.append(df)
-                            
-                        # Check pagination
-                        scriptReturnResult = await tab.execute_script("""
-                            (() => {
-                                const nextBtn = document.getElementById("body_x_grid_gridPagerBtnNextPage");
-                                if (!nextBtn) return true;
-                                const isClassDisabled = nextBtn.className.toLowerCase().includes('disabled');
-                                return isClassDisabled || nextBtn.disabled;
-                            })()
-                        """, return_by_value=True, await_promise=True)
-                        print(f"Next button is disabled: {scriptReturnResult}")
-
-                        try:
-                            is_disabled = scriptReturnResult.get('result', {}).get('result', {}).get('value')
-                        except Exception as e:
-                            print(f"Error checking if next button is disabled: {e}")
-                            is_disabled = True
-                        
-                        if is_disabled:
-                            print(f"Reached the last page for {scan['name']}.")
-                            break
-                            
-                        print(f"Clicking 'Next' button to navigate to page {page + 1}...")
-                        await tab.execute_script('document.getElementById("body_x_grid_gridPagerBtnNextPage").click()')
-                        
-                        page += 1
-                        
-                    except Exception as e:
-                        print(f"Error encountered during pagination on page {page}: {e}")
-                        break
-
-                await tab.take_screenshot(f'{FILE_DIR}/{scan["name"].replace(" ", "_")}_last_page.png', quality=90, beyond_viewport=True)
+                await monitor.stop()
+                await blocker.stop()
+                await scan_tab.close()
             except Exception as e:
-                print(f"Error during tabular data extraction for {scan['name']}: {e}")
-            # make FILE_DIR if it doesnt exist
-            if not os.path.exists(FILE_DIR):
-                os.mkdir(FILE_DIR)
-            # Optional network events bundle save per scan
-            await tab.save_bundle(f"{FILE_DIR}/bcbid_{scan['name'].replace(' ', '_')}.zip")
+                print(f"Could not close scan tab: {e}")
 
-            # click the reset button to start the next scan
-            # body_x_prxFilterBar_x_cmdRazBtn
-            
-            print(f"Clicking 'Reset' button...")
+    return [path for path in results if path]
 
-            if scan_index < len(scans) - 1:
-                try:
-                    await tab.execute_script('document.getElementById("body_x_prxFilterBar_x_cmdRazBtn").click()')
-                    # let reset happen
-                    await asyncio.sleep(10)
-                except Exception as e:
-                    print(f"Error clicking 'Reset' button: {e}")
-            print(f"Scan {scan['name']} complete.")
-            # save csv as temp with scan name combine global dfs
-            if global_all_dfs:
-                df_temp = pd.concat(global_all_dfs, ignore_index=True)
-                df_temp.to_csv(f"{FILE_DIR}/{scan['name'].replace(' ', '_')}.csv", index=False)
-
-        # --- END OF SCANS: Combine, Deduplicate and Save Phase ---
-        print(f"\n========== Scans complete. Processing output... ==========")
-        
-        try:
-            with open(f"{FILE_DIR}/bcbid.html", "w", encoding="utf-8") as f:
-                f.write("<html><head><meta charset='utf-8'></head><body>\n")
-                for idx, html_content in enumerate(global_all_table_htmls):
-                    f.write(f"<h2>Table Page Extraction {idx + 1}</h2>\n")
-                    f.write(html_content)
-                    f.write("\n<hr>\n")
-                f.write("</body></html>\n")
-            print(f"Successfully compiled all tables to 'bcbid.html'")
-        except Exception as e:
-            print(f"Failed to write combined HTML file: {e}")
+async def deep_dive_opportunity(tab: Tab, url: str, row_dict: dict, city_mapping, budget: PolitenessBudget):
+    """
+    Opens one opportunity page and reads its contact details and city.
+
+    Returns:
+        dict: Email, Name, Phone and City for the row.
+    """
+    await budget.wait()
+    print(f"Navigating to {url}")
+    await tab.go_to(url)
+
+    # per-tab pacing on top of the shared budget
+    await pace(1.5, 3.0)
+
+    selector = "//h2[contains(text(), 'RFx General Information')]"
+    success = await perform_human_loop(tab, selector, max_attempts=1)
+
+    if not success:
+        print(f"Warning: Could not definitively find general info tab on {url}")
+
+    page_source = await tab.page_source
+    clean_text = page_text(page_source)
+    contact = contact_near_email(clean_text)
+
+    city = find_bcbid_city_match(row_dict, city_mapping)
 
-        if global_all_dfs:
+    if city.lower() == DEFAULT_CITY:
+        deep_scan_city = scan_text_for_cities(clean_text, city_mapping)
+        city = deep_scan_city
+
+    return {'Email': contact.email, 'Name': contact.name, 'Phone': contact.phone, 'City': city}
+
+async def deep_dive_in_tabs(browser, first_tab: Tab, df: pd.DataFrame, city_mapping, max_tabs: int = BCBID_DEEP_DIVE_TABS):
+    """
+    Runs deep_dive_opportunity for every row with an Opportunity Url on a
+    bounded pool of tabs. All tabs share one PolitenessBudget, so
+    bcbid.gov.bc.ca never sees more than one navigation every
+    BCBID_MIN_REQUEST_INTERVAL seconds however many tabs are open.
+
+    Returns:
+        dict: row index -> the contact fields read for that row.
+    """
+    queue = asyncio.Queue()
+    for index, row in df.iterrows():
+        url = row.get('Opportunity Url')
+        if pd.isna(url) or not url:
+            continue
+        queue.put_nowait((index, url, row.to_dict()))
+    if queue.empty():
+        return {}
+
+    budget = PolitenessBudget(BCBID_MIN_REQUEST_INTERVAL)
+    tab_count = max(1, min(max_tabs, queue.qsize()))
+    tabs = [(first_tab, None)]
+    for index in range(1, tab_count):
+        dive_tab = await browser.new_tab()
+        tabs.append((dive_tab, await block_resources(dive_tab, f'bcbid deep dive tab {index}', proxy_url=os.environ.get("PROXY_URL"))))
+    print(f"--- Deep diving {queue.qsize()} opportunities with {tab_count} tab(s) ---")
+    contacts = {}
+
+    async def worker(dive_tab: Tab):
+        while True:
+            try:
+                index, url, row_dict = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
             try:
-                # Concatenate all DataFrames
-                final_df = pd.concat(global_all_dfs, ignore_index=True)
-                # final_df.dropna(how='all', inplace=True) 
-                
-                original_count = len(final_df)
-                # Drop duplicate URLs gathered from combining scans
-                final_df.drop_duplicates(subset=['Opportunity Url'], inplace=True, keep='first')
-                
-                print(f"Total rows extracted: {original_count}. Distinct unique rows after merge: {len(final_df)}")
-                
-                # Save DataFrames
-                final_df.to_csv(f"{FILE_DIR}/bid_recent_raw.csv", index=False, encoding='utf-8')
-                final_df.to_csv(f"{FILE_DIR}/bid_recent.csv", index=False, encoding='utf-8')
-                print("Successfully combined and saved merged data to CSVs.")
+                contacts[index] = await deep_dive_opportunity(dive_tab, url, row_dict, city_mapping, budget)
             except Exception as e:
-                print(f"Failed to concatenate or save CSV: {e}")
-        else:
-            print("No DataFrames were created across any scans. Skipping CSV generation.")
+                print(f"Error processing {url}: {e}")
 
+    start = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker(dive_tab) for dive_tab, _ in tabs))
+    finally:
+        for dive_tab, blocker in tabs[1:]:
+            try:
+                await blocker.stop()
+                await dive_tab.close()
+            except Exception as e:
+                print(f"Could not close deep dive tab: {e}")
+    print(f"--- Deep dive of {budget.requests} opportunities took {time.perf_counter() - start:.0f}s ---")
+    return contacts
 
-        # --- Deep Dive Link Extraction Phase ---
-        csv_path = f"{FILE_DIR}/bid_recent.csv"
+async def main():
+    opts = get_browser_options()
+    
+    async with Chrome(options=opts) as browser:
+        print("Starting browser...")
+        tab = await browser.start()
+        blocker = await block_resources(tab, 'bcbid', proxy_url=os.environ.get("PROXY_URL"))
+        monitor = NetworkMonitor(tab)
+        try:
+            await monitor.start()
         
-        if os.path.exists(csv_path):
-            print(f"Found {csv_path}. Processing individual distinct opportunity URLs...")
-            df = pd.read_csv(csv_path)
-            CITY_MAPPING = load_city_mapping('data/city.csv')
-            
-            for col in ['Name', 'Email', 'Phone', 'City']:
-                if col not in df.columns:
-                    df[col] = ""
+            url = "https://bcbid.gov.bc.ca/page.aspx/en/rfp/request_browse_public"
+            days_to_check = int(os.getenv('DAYS_TO_CHECK', 1))
+            # Calculate consistent dates for both passes
+            min_date = (datetime.now() - timedelta(days=days_to_check)).strftime('%Y-%m-%d')
+            max_date = datetime.now().strftime('%Y-%m-%d')
+
+            # Create our scan sequences for the dual extraction
+            # consider splitting target organizations if it gets better.
+            scans = [
+                {
+                    "name": "Region Scan",
+                    "input_id": "body_x_selRfpIdAreaLevelAreaNode_search",
+                    "values": regional_districts
+                },
+                {
+                    "name": "Organization Scan",
+                    "input_id": "body_x_selBpmIdOrgaLevelOrgaNode_search", 
+                    "values": target_organizations
+                }
+            ]
+            # if directory exists
+            if not os.path.exists(FILE_DIR):
+                # remove directory
+                os.mkdir(FILE_DIR)
+            planner = ScanPlanner(min_date, execution_window_start())
+            scans = planner.plan(scans)
+            spool_paths = await run_scans_in_tabs(
+                browser, tab, monitor, scans, url, min_date, max_date, planner
+            )
+            # --- END OF SCANS: Combine, Deduplicate and Save Phase ---
+            print(f"\n========== Scans complete. Processing output... ==========")
+        
+            try:
+                with open(f"{FILE_DIR}/bcbid.html", "w", encoding="utf-8") as f:
+                    f.write("<html><head><meta charset='utf-8'></head><body>\n")
+                    # one page of the spools in memory at a time
+                    for idx, page_records in enumerate(iter_pages(spool_paths)):
+                        f.write(f"<h2>Table Page Extraction {idx + 1}</h2>\n")
+                        f.write(pd.DataFrame(page_records).to_html(index=False))
+                        f.write("\n<hr>\n")
+                    f.write("</body></html>\n")
+                print(f"Successfully compiled all tables to 'bcbid.html'")
+            except Exception as e:
+                print(f"Failed to write combined HTML file: {e}")
 
-            for index, row in df.iterrows():
+            # the planner state is only saved if the CSVs and the deep dive all went through
+            completed = True
+            original_count = sum(1 for _ in iter_records(spool_paths))
+            if original_count:
                 try:
-                    url = row.get('Opportunity Url')
-                    if pd.isna(url) or not url:
-                        continue
-
-                    print(f"Navigating to {url}")
-                    await tab.go_to(url)
-                    
-                    await asyncio.sleep(random.uniform(1.5, 3.0))
-
-                    selector = "//h2[contains(text(), 'RFx General Information')]"
-                    success = await perform_human_loop(tab, selector, max_attempts=1)
-
-                    if not success:
-                        print(f"Warning: Could not definitively find general info tab on {url}")
-
-                    page_source = await tab.page_source
-                    clean_text = re.sub(r'<[^>]+>', ' ', page_source)
-                    clean_text = re.sub(r'\s+', ' ', clean_text)
-
-                    email_match = re.search(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', clean_text)
-                    email = email_match.group(0) if email_match else ""
-
-                    name = ""
-                    phone = ""
-                    
-                    if email:
-                        email_idx = clean_text.find(email)
-                        start_idx = max(0, email_idx - 200)
-                        end_idx = min(len(clean_text), email_idx + 200)
-                        window = clean_text[start_idx:end_idx]
-
-                        attention_match = re.search(r'Attention:\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)', window)
-                        if attention_match:
-                            name = attention_match.group(1).strip()
-                        else:
-                            pre_email_window = clean_text[max(0, email_idx - 80):email_idx]
-                            name_match = re.search(r'\b([A-Z][a-z]+\s+[A-Z][a-z]+)\b', pre_email_window)
-                            if name_match:
-                                name = name_match.group(1).strip()
-
-                        phone_match = re.search(r'\(?\b\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b', window)
-                        if phone_match:
-                            phone = phone_match.group(0).strip()
-
-                    row_dict = row.to_dict()
-                    city = find_bcbid_city_match(row_dict, CITY_MAPPING)
-
-                    if city.lower() == DEFAULT_CITY:
-                        deep_scan_city = scan_text_for_cities(clean_text, CITY_MAPPING)
-                        city = deep_scan_city
-
-                    df.at[index, 'Email'] = email
-                    df.at[index, 'Name'] = name
-                    df.at[index, 'Phone'] = phone
-                    df.at[index, 'City'] = city
-
+                    # Drop duplicate URLs gathered from combining scans, streamed from the spools
+                    def merged_records():
+                        return unique_records(iter_records(spool_paths), 'Opportunity Url')
+
+                    distinct_count = write_csv(f"{FILE_DIR}/bid_recent_raw.csv", merged_records)
+                    write_csv(f"{FILE_DIR}/bid_recent.csv", merged_records)
+                    print(f"Total rows extracted: {original_count}. Distinct unique rows after merge: {distinct_count}")
+                    print("Successfully combined and saved merged data to CSVs.")
                 except Exception as e:
-                    print(f"Error processing {url}: {e}")
+                    print(f"Failed to concatenate or save CSV: {e}")
+                    completed = False
+            else:
+                print("No rows were extracted across any scans. Skipping CSV generation.")
 
-            df.to_csv(csv_path, index=False, encoding='utf-8')
-            print(f"Successfully processed URLs and updated {csv_path} with Contact fields.")
+            # --- Deep Dive Link Extraction Phase ---
+            csv_path = f"{FILE_DIR}/bid_recent.csv"
+        
+            if os.path.exists(csv_path):
+                print(f"Found {csv_path}. Processing individual distinct opportunity URLs...")
+                df = pd.read_csv(csv_path)
+                CITY_MAPPING = load_city_mapping('data/city.csv')
+            
+                for col in ['Name', 'Email', 'Phone', 'City']:
+                    if col not in df.columns:
+                        df[col] = ""
+
+                contacts = await deep_dive_in_tabs(browser, tab, df, CITY_MAPPING)
+                # written back by row index, so the CSV keeps its original order
+                for index, values in contacts.items():
+                    for col, value in values.items():
+                        df.at[index, col] = value
+
+                df.to_csv(csv_path, index=False, encoding='utf-8')
+                print(f"Successfully processed URLs and updated {csv_path} with Contact fields.")
+            planner.finish(completed)
+        finally:
+            try:
+                await monitor.stop()
+            finally:
+                await blocker.stop()
+        get_artifact_writer().report()
 
 if __name__ == "__main__":
     try:
@@ -6,13 +6,13 @@ import pandas as pd
 from dateutil.relativedelta import relativedelta
 import os
 from typing import Dict, List
-import dateparser
+from lib.dates import parse_date
 import requests
 import unidecode
 import re
 from lib.discord import send_discord_embed, send_discord_message
 from lib.utils import dash_pattern, unrelated_phrases, unrelated_commodities, unrelated_organizations, \
-    load_city_mapping, find_bcbid_city_match, DEFAULT_CITY
+    load_city_mapping, find_bcbid_city_match, get_city_matcher, DEFAULT_CITY
 from lib.timing import filter_tenders_by_last_run
 from mappers import _map_tender_type_to_stage
 from process_project_data import get_latest_issue, get_project_type_id, set_entry_issue_id
@@ -30,22 +30,9 @@ def canada_buys_city_match(tender_record: dict, city_mapping: dict) -> str:
         tender_record.get('Description', ''),
         tender_record.get('Title', '')
     ]
-    
-    # Sort cities by length descending so "North Vancouver" matches before "Vancouver"
-    sorted_cities = sorted(city_mapping.keys(), key=len, reverse=True)
-    
-    for field in check_fields:
-        # Ignore empty strings, None types, or pandas "nan" string values
-        if not field or not isinstance(field, str) or field.lower() == 'nan':
-            continue
-            
-        field_lower = field.lower()
-        for city_name in sorted_cities:
-            # Use regex boundaries \b to ensure we don't match 'Hope' inside 'Hopewell'
-            if re.search(rf'\b{re.escape(city_name.lower())}\b', field_lower):
-                return city_name
-                
-    return DEFAULT_CITY
+    # Ignore empty strings, None types, or pandas "nan" string values
+    check_fields = [field for field in check_fields if isinstance(field, str) and field.lower() != 'nan']
+    return get_city_matcher(city_mapping).first_match(check_fields)
 
 
 def _map_canadabuys_tender_entry(tender_record: dict, params: dict, city_mapping: dict) -> dict:
@@ -80,7 +67,7 @@ def _map_canadabuys_tender_entry(tender_record: dict, params: dict, city_mapping
     # Dates
     issue_date_str = str(tender_record.get('Publication date', ''))
     if issue_date_str and issue_date_str.lower() != 'nan':
-        parsed_open_date = dateparser.parse(issue_date_str)
+        parsed_open_date = parse_date(issue_date_str)
         if parsed_open_date:
             entry['ys_date'] = parsed_open_date.strftime('%Y-%m-%d')
 
@@ -177,7 +164,7 @@ def _map_canadabuys_tender_entry(tender_record: dict, params: dict, city_mapping
     # Parse Closing date
     closing_date_str = str(tender_record.get('Closing date and time', ''))
     if closing_date_str and closing_date_str.lower() != "nan":
-        parsed_date_close = dateparser.parse(closing_date_str)
+        parsed_date_close = parse_date(closing_date_str)
         if parsed_date_close:
             if is_windows:
                 fmt = "%#m/%#d/%Y - %#I %p"
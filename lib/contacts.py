@@ -0,0 +1,196 @@
+import os
+import re
+import string
+from typing import NamedTuple
+
+from lib.html_parser import register_extractor
+
+# How far past a label (e.g. 'Primary Contact') its email is looked for, in characters
+CONTACT_LABEL_WINDOW = int(os.getenv('CONTACT_LABEL_WINDOW', 2000))
+# Characters either side of an email searched for its contact's name and phone
+CONTACT_EMAIL_WINDOW = 200
+# Characters before an email searched for a bare 'First Last' name
+CONTACT_NAME_WINDOW = 80
+
+TAG_RE = re.compile(r'<[^>]+>')
+SPACE_RE = re.compile(r'\s+')
+EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+ATTENTION_RE = re.compile(r'Attention:\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)')
+NAME_RE = re.compile(r'\b([A-Z][a-z]+\s+[A-Z][a-z]+)\b')
+PHONE_RE = re.compile(r'\(?\b\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b')
+MAILTO_RE = re.compile(r'^mailto:')
+
+# what EMAIL_RE accepts before the '@'
+_LOCAL_CHARS = frozenset(string.ascii_letters + string.digits + '._%+-')
+
+
+class Contact(NamedTuple):
+    """The contact details read from a detail page, empty strings for what was not found."""
+    email: str = ""
+    name: str = ""
+    title: str = ""
+    phone: str = ""
+
+
+def page_text(page_source):
+    """A page's source with the tags removed and whitespace collapsed."""
+    return SPACE_RE.sub(' ', TAG_RE.sub(' ', page_source))
+
+
+def find_email(text, pos=0, endpos=None):
+    """
+    The first EMAIL_RE match in text[pos:endpos], same as EMAIL_RE.search
+    but only tried where there is an '@', so long runs of letters (inline
+    scripts, encoded blobs) are not rescanned from every position.
+
+    Returns:
+        re.Match: The match, or None.
+    """
+    endpos = len(text) if endpos is None else endpos
+    at = text.find('@', pos, endpos)
+    while at != -1:
+        start = at
+        while start > pos and text[start - 1] in _LOCAL_CHARS:
+            start -= 1
+        if start < at:
+            match = EMAIL_RE.match(text, start, endpos)
+            if match:
+                return match
+        at = text.find('@', at + 1, endpos)
+    return None
+
+
+def contact_near_email(text):
+    """
+    Reads the first email of a page's text and the name and phone around
+    it: an 'Attention: First Last' within CONTACT_EMAIL_WINDOW characters,
+    else a 'First Last' just before the email.
+    """
+    email_match = find_email(text)
+    if not email_match:
+        return Contact()
+
+    email_idx = email_match.start()
+    window = text[max(0, email_idx - CONTACT_EMAIL_WINDOW):email_idx + CONTACT_EMAIL_WINDOW]
+
+    name = ""
+    attention_match = ATTENTION_RE.search(window)
+    if attention_match:
+        name = attention_match.group(1).strip()
+    else:
+        # sliced, so \b treats the window's edges as word boundaries
+        name_match = NAME_RE.search(text[max(0, email_idx - CONTACT_NAME_WINDOW):email_idx])
+        if name_match:
+            name = name_match.group(1).strip()
+
+    phone_match = PHONE_RE.search(window)
+    phone = phone_match.group(0).strip() if phone_match else ""
+    return Contact(email=email_match.group(0), name=name, phone=phone)
+
+
+def contact_after_label(text, label, window=CONTACT_LABEL_WINDOW):
+    """The first email within window characters after the first occurrence of label."""
+    label_idx = text.find(label)
+    if label_idx == -1:
+        return Contact()
+    start = label_idx + len(label)
+    email_match = find_email(text, start, min(len(text), start + window))
+    return Contact(email=email_match.group(0)) if email_match else Contact()
+
+
+def contact_from_mailto(element, text_fallback=False):
+    """
+    Reads the contact of a BeautifulSoup element from its first mailto link:
+    the link text is the email, and the line before the 'Email:' line of the
+    link's paragraph is 'Name, Job Title' or just the name.
+
+    Args:
+        element (Tag): The part of the page holding the contact.
+        text_fallback (bool): Without a mailto link, take the first email
+            in the element's text instead.
+    """
+    mailto_link = element.find('a', href=MAILTO_RE)
+    if not mailto_link:
+        if text_fallback:
+            email_match = find_email(element.get_text())
+            if email_match:
+                return Contact(email=email_match.group(0))
+        return Contact()
+
+    email = mailto_link.get_text(strip=True)
+    name = ""
+    title = ""
+    parent_p = mailto_link.find_parent('p')
+    if parent_p:
+        for br in parent_p.find_all('br'):
+            br.replace_with('\n')
+        lines = [line.strip() for line in parent_p.get_text().split('\n') if line.strip()]
+        for i, line in enumerate(lines):
+            if 'Email:' in line or email in line:
+                if i > 0:
+                    parts = lines[i - 1].split(',')
+                    if len(parts) > 1:
+                        # e.g. "Keona Wiley, Parks Planner"
+                        name = parts[0].strip()
+                        title = parts[1].strip()
+                    else:
+                        name = lines[i - 1]
+                        title = "N/A"
+                break
+    return Contact(email=email, name=name, title=title)
+
+
+def contact_from_selectors(soup, email_selector, name_selector):
+    """Reads a contact from the dedicated fields of a structured page, e.g. CanadaBuys' contact tab."""
+    def field_text(selector):
+        element = soup.select_one(selector)
+        return " ".join(element.get_text(separator=" ", strip=True).split()) if element else ""
+
+    return Contact(email=field_text(email_selector), name=field_text(name_selector))
+
+
+def _contact_text_fast(page_source):
+    return contact_near_email(page_text(page_source))
+
+
+def _contact_text_regex(page_source):
+    # the per-call regexes the BC Bid deep dive used, kept as the reference
+    clean_text = re.sub(r'<[^>]+>', ' ', page_source)
+    clean_text = re.sub(r'\s+', ' ', clean_text)
+
+    email_match = re.search(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', clean_text)
+    email = email_match.group(0) if email_match else ""
+    name = ""
+    phone = ""
+    if email:
+        email_idx = clean_text.find(email)
+        window = clean_text[max(0, email_idx - 200):min(len(clean_text), email_idx + 200)]
+        attention_match = re.search(r'Attention:\s*([A-Z][a-z]+(?:\s+[A-Z][a-z]+)+)', window)
+        if attention_match:
+            name = attention_match.group(1).strip()
+        else:
+            name_match = re.search(r'\b([A-Z][a-z]+\s+[A-Z][a-z]+)\b', clean_text[max(0, email_idx - 80):email_idx])
+            if name_match:
+                name = name_match.group(1).strip()
+        phone_match = re.search(r'\(?\b\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}\b', window)
+        if phone_match:
+            phone = phone_match.group(0).strip()
+    return Contact(email=email, name=name, phone=phone)
+
+
+def _primary_contact_fast(text):
+    # text is the competition container's innerText, as bc_ferries reads it
+    return contact_after_label(text, "Primary Contact")
+
+
+def _primary_contact_regex(text):
+    # the lazy scan BC Ferries used, unchanged, kept as the reference
+    email_match = re.search(r"Primary Contact[\s\S]*?([\w\.-]+@[\w\.-]+\.\w+)", text)
+    return Contact(email=email_match.group(1)) if email_match else Contact()
+
+
+# Benchmark and parity check on any saved detail pages:
+#   python -m lib.html_parser lib.contacts contact_text screenshots/*.html*
+#   python -m lib.html_parser lib.contacts primary_contact bc_ferries_*.txt  (competition innerText)
+register_extractor('contact_text', _contact_text_fast, _contact_text_regex)
+register_extractor('primary_contact', _primary_contact_fast, _primary_contact_regex)
@@ -0,0 +1,202 @@
+import os
+import re
+import sys
+import time
+import threading
+from datetime import datetime
+from functools import lru_cache
+
+import dateparser
+import pandas as pd
+import pytz
+
+# Number of distinct (string, settings) results kept in memory
+DATE_CACHE_SIZE = int(os.getenv('DATE_CACHE_SIZE', 4096))
+
+# Formats the scraped sites actually use, tried with strptime before falling
+# back to dateparser. Each one must parse to the same value dateparser gives,
+# run `python -m lib.dates` after adding one.
+KNOWN_DATE_FORMATS = (
+    "%Y-%m-%d",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%d %I:%M:%S %p",          # BC Bid "Issue Date and Time"
+    "%Y-%m-%d %I:%M %p",
+    "%b %d, %Y",                     # Prospero "Jun 20, 2025"
+    "%B %d, %Y",                     # RDN "March 24, 2026"
+    "%b %d, %Y %I:%M %p",
+    "%B %d, %Y %I:%M %p",
+    "%m/%d/%Y",                      # PIP reports "05/01/2024"
+    "%m/%d/%Y %I:%M:%S %p",
+    "%m/%d/%Y %I:%M %p",
+    "%A %B %d, %Y %I:%M %p",         # Bids&Tenders documents "Monday June 2, 2025 9:00 AM"
+    "%a %b %d, %Y %I:%M %p",
+)
+
+# Phrases that resolve against the clock, these are never cached
+_RELATIVE_DATE_RE = re.compile(
+    r'\b(ago|now|today|yesterday|tomorrow|next|last|this|in)\b', re.IGNORECASE
+)
+
+# The only settings the strptime fast path can reproduce: the time is read
+# as local to TIMEZONE and returned aware in that same zone.
+_FAST_PATH_AWARE_KEYS = {'TIMEZONE', 'TO_TIMEZONE', 'RETURN_AS_TIMEZONE_AWARE'}
+
+_parsers = {}
+# dateparser keeps shared state in its parsers, one parse at a time
+_parser_lock = threading.Lock()
+
+
+def _settings_key(settings):
+    return tuple(sorted(settings.items())) if settings else ()
+
+
+def _fallback_parser(settings_key):
+    parser = _parsers.get(settings_key)
+    if parser is None:
+        parser = dateparser.DateDataParser(languages=['en'], settings=dict(settings_key) or None)
+        _parsers[settings_key] = parser
+    return parser
+
+
+def _fast_path_timezone(settings_key):
+    """
+    Returns (usable, tz) for a settings key: whether strptime results can
+    stand in for dateparser's, and the pytz zone to localize them to.
+    """
+    if not settings_key:
+        return True, None
+    settings = dict(settings_key)
+    if set(settings) - _FAST_PATH_AWARE_KEYS or not settings.get('TIMEZONE'):
+        return False, None
+    if settings.get('TO_TIMEZONE', settings['TIMEZONE']) != settings['TIMEZONE']:
+        return False, None
+    if settings.get('RETURN_AS_TIMEZONE_AWARE') is not True:
+        return False, None
+    return True, pytz.timezone(settings['TIMEZONE'])
+
+
+def _localize(value, tz):
+    return tz.localize(value) if tz is not None else value
+
+
+def parse_known_format(text):
+    """Parses text with the first matching entry of KNOWN_DATE_FORMATS, None if none match."""
+    for date_format in KNOWN_DATE_FORMATS:
+        try:
+            return datetime.strptime(text, date_format)
+        except ValueError:
+            continue
+    return None
+
+
+def _parse(text, settings_key):
+    usable, tz = _fast_path_timezone(settings_key)
+    if usable:
+        parsed = parse_known_format(text.strip())
+        if parsed is not None:
+            return _localize(parsed, tz)
+    with _parser_lock:
+        data = _fallback_parser(settings_key).get_date_data(text)
+    return data['date_obj'] if data else None
+
+
+@lru_cache(maxsize=DATE_CACHE_SIZE)
+def _parse_cached(text, settings_key):
+    return _parse(text, settings_key)
+
+
+def parse_date(date_string, settings=None):
+    """
+    Drop-in replacement for dateparser.parse for the strings this project scrapes.
+
+    Known site formats are read with strptime, anything else goes to a
+    dateparser instance restricted to English. Results are memoized per
+    (string, settings) except for relative phrases like "2 days ago".
+
+    Args:
+        date_string (str): The date to parse.
+        settings (dict, optional): dateparser settings, e.g. TIMEZONE.
+
+    Returns:
+        datetime: The parsed date, or None if it could not be parsed.
+    """
+    if not isinstance(date_string, str):
+        raise TypeError("Input type must be str")
+    settings_key = _settings_key(settings)
+    if _RELATIVE_DATE_RE.search(date_string):
+        return _parse(date_string, settings_key)
+    return _parse_cached(date_string, settings_key)
+
+
+def parse_date_series(series, settings=None):
+    """
+    Vectorized parse_date for a DataFrame column.
+
+    Every distinct string is parsed once: the known formats are applied to
+    the whole column with pd.to_datetime, and only the values none of them
+    match go through parse_date one by one. Non-string values become None.
+
+    Args:
+        series (pd.Series): The column to parse.
+        settings (dict, optional): dateparser settings, as for parse_date.
+
+    Returns:
+        pd.Series: The parsed dates, aligned with series.
+    """
+    is_text = series.map(lambda value: isinstance(value, str))
+    remaining = pd.Index(series[is_text].unique())
+    parsed = {}
+
+    usable, tz = _fast_path_timezone(_settings_key(settings))
+    if usable:
+        stripped = remaining.str.strip()
+        for date_format in KNOWN_DATE_FORMATS:
+            if remaining.empty:
+                break
+            hits = pd.to_datetime(stripped, format=date_format, errors='coerce')
+            matched = ~hits.isna()
+            for original, timestamp in zip(remaining[matched], hits[matched]):
+                parsed[original] = _localize(timestamp.to_pydatetime(), tz)
+            remaining = remaining[~matched]
+            stripped = stripped[~matched]
+
+    for value in remaining:
+        parsed[value] = parse_date(value, settings=settings)
+
+    return series.map(lambda value: parsed.get(value) if isinstance(value, str) else None)
+
+
+if __name__ == "__main__":
+    # python -m lib.dates ["Jun 20, 2025" ...]
+    # checks the fast path against dateparser and times both
+    samples = sys.argv[1:] or [
+        "Jun 20, 2025", "June 2, 2025", "2025-06-20", "2025-06-20 10:00:00 AM",
+        "2025-06-20 14:30:00", "05/01/2024", "11/16/2024 2:00 PM",
+        "Monday June 2, 2025 9:00 AM", "March 24, 2026 2:00 PM",
+        "Jun 20, 2025 2:00 PM PST", "Closing 20th June 2025",
+    ]
+    vancouver = {'TIMEZONE': 'America/Vancouver', 'TO_TIMEZONE': 'America/Vancouver', 'RETURN_AS_TIMEZONE_AWARE': True}
+    mismatches = 0
+    for settings in (None, vancouver):
+        for sample in samples:
+            expected = dateparser.parse(sample, settings=settings)
+            actual = parse_date(sample, settings=settings)
+            if expected != actual or repr(expected) != repr(actual):
+                mismatches += 1
+                print(f"MISMATCH {sample!r} settings={settings}: dateparser {expected!r}, parse_date {actual!r}")
+
+    column = pd.Series(samples * 200)
+    start = time.perf_counter()
+    slow = column.apply(lambda value: dateparser.parse(value))
+    slow_seconds = time.perf_counter() - start
+    _parse_cached.cache_clear()
+    start = time.perf_counter()
+    fast = parse_date_series(column)
+    fast_seconds = time.perf_counter() - start
+    if not slow.equals(fast):
+        mismatches += 1
+        print("MISMATCH parse_date_series differs from Series.apply(dateparser.parse)")
+    print(f"{len(column)} values: apply(dateparser.parse) {slow_seconds * 1000:.0f}ms, "
+          f"parse_date_series {fast_seconds * 1000:.0f}ms")
+    if mismatches:
+        sys.exit(1)
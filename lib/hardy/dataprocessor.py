@@ -5,7 +5,7 @@ import re
 from datetime import date, datetime
 import traceback
 from zoneinfo import ZoneInfo
-import dateparser
+from lib.dates import parse_date
 from dateutil.relativedelta import relativedelta
 import pandas as pd
 import requests
@@ -100,7 +100,7 @@ def _map_porthardy_tender_entry(tender_record: dict, params: dict, city_mapping:
     closing_date_str = tender_record.get('closing_date')
     
     if closing_date_str and str(closing_date_str).lower() not in ['nan', 'nat', '']:
-        parsed_date_close = dateparser.parse(str(closing_date_str))
+        parsed_date_close = parse_date(str(closing_date_str))
         if parsed_date_close:
             fmt = "%#m/%#d/%Y - %#I %p" if is_windows else "%-m/%-d/%Y - %-I %p"
             ys_body['ys_closing'] = parsed_date_close.strftime(fmt)
@@ -0,0 +1,152 @@
+import os
+import sys
+import gzip
+import time
+import importlib
+import lxml.html
+from lxml import etree
+
+# 'lxml' runs the registered fast extractors and falls back to BeautifulSoup
+# if one of them raises, 'soup' runs the BeautifulSoup versions only.
+HTML_PARSER_BACKEND = os.getenv('HTML_PARSER_BACKEND', 'lxml').lower()
+
+SKIP_TEXT_TAGS = ('script', 'style')
+# BeautifulSoup keeps whitespace-only strings as they are only inside these
+PRESERVE_WHITESPACE_TAGS = ('pre', 'textarea')
+_ASCII_SPACES = '\x20\x0a\x09\x0c\x0d'
+
+# extractor name -> (lxml version, BeautifulSoup version)
+_EXTRACTORS = {}
+
+
+def parse_html(text):
+    """
+    Parses a page or a fragment into an lxml document, so searches always
+    start from an <html> root the way they start from a BeautifulSoup object.
+
+    Returns:
+        lxml.html.HtmlElement: The <html> root, or None for an empty body.
+    """
+    if not text or not text.strip():
+        return None
+    try:
+        return lxml.html.document_fromstring(text)
+    except ValueError:
+        # lxml refuses str input that carries an XML encoding declaration
+        return lxml.html.document_fromstring(text.encode('utf-8'))
+
+
+def _soup_string(text, preserve):
+    # BeautifulSoup stores a whitespace-only string as a single '\n' or ' '
+    if not preserve and not text.strip(_ASCII_SPACES):
+        return '\n' if '\n' in text else ' '
+    return text
+
+
+def iter_strings(element, preserve=False):
+    """Yields the text of element the way BeautifulSoup's get_text sees it: no comments, scripts or styles."""
+    if isinstance(element.tag, str) and element.tag not in SKIP_TEXT_TAGS:
+        preserve = preserve or element.tag in PRESERVE_WHITESPACE_TAGS
+        if element.text:
+            yield _soup_string(element.text, preserve)
+        for child in element:
+            yield from iter_strings(child, preserve)
+            if child.tail:
+                yield _soup_string(child.tail, preserve)
+
+
+def element_text(element, separator="", strip=False):
+    """lxml equivalent of BeautifulSoup's Tag.get_text(separator, strip)."""
+    if strip:
+        return separator.join(s.strip() for s in iter_strings(element) if s.strip())
+    return separator.join(iter_strings(element))
+
+
+def only_string(element):
+    """
+    lxml equivalent of BeautifulSoup's Tag.string: the text of an element
+    whose only child is a single string, following single-child chains.
+    """
+    children = list(element)
+    if not children:
+        return element.text
+    if len(children) == 1 and not element.text and not children[0].tail and isinstance(children[0].tag, str):
+        return only_string(children[0])
+    return None
+
+
+def class_xpath(class_name, tag='*', axis='descendant'):
+    """Precompiles an XPath matching tag elements whose class list holds class_name."""
+    return etree.XPath(
+        f"{axis}::{tag}[contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')]"
+    )
+
+
+def has_class(element, class_name):
+    return class_name in element.get('class', '').split()
+
+
+def register_extractor(name, fast, fallback):
+    """
+    Registers an extractor under name with an lxml version and the
+    BeautifulSoup version it must match. Both take the same arguments.
+    """
+    _EXTRACTORS[name] = (fast, fallback)
+
+
+def run_extractor(name, *args, **kwargs):
+    """Runs the extractor registered as name on the configured backend."""
+    fast, fallback = _EXTRACTORS[name]
+    if HTML_PARSER_BACKEND == 'lxml':
+        try:
+            return fast(*args, **kwargs)
+        except Exception as e:
+            print(f"lxml extractor {name} failed, falling back to BeautifulSoup: {e}")
+    return fallback(*args, **kwargs)
+
+
+def check_parity(name, paths, repeat=5, **kwargs):
+    """
+    Runs both versions of an extractor over saved pages, prints the timings
+    and whether their results match.
+
+    Returns:
+        bool: True if every page gave the same result on both backends.
+    """
+    fast, fallback = _EXTRACTORS[name]
+    all_match = True
+    for path in paths:
+        # pages saved by the artifact writer are gzipped
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8', errors='ignore') as f:
+            text = f.read()
+
+        timings = []
+        results = []
+        for extractor in (fallback, fast):
+            start = time.perf_counter()
+            for _ in range(repeat):
+                result = extractor(text, **kwargs)
+            timings.append((time.perf_counter() - start) / repeat)
+            results.append(result)
+
+        match = results[0] == results[1]
+        all_match = all_match and match
+        speedup = timings[0] / timings[1] if timings[1] else float('inf')
+        print(f"{name} {path}: soup {timings[0] * 1000:.1f}ms, lxml {timings[1] * 1000:.1f}ms, "
+              f"{speedup:.1f}x faster, parity {'OK' if match else 'MISMATCH'}")
+        if not match:
+            print(f"  soup: {results[0]}")
+            print(f"  lxml: {results[1]}")
+    return all_match
+
+
+if __name__ == "__main__":
+    # python -m lib.html_parser <module> <extractor> page1.html page2.html
+    # e.g. python -m lib.html_parser web_requests pip_permits permits_sidney.html
+    module_name, extractor_name = sys.argv[1], sys.argv[2]
+    importlib.import_module(module_name)
+    # the extractors registered themselves on lib.html_parser, not on __main__
+    registry = importlib.import_module('lib.html_parser')
+    if not registry.check_parity(extractor_name, sys.argv[3:]):
+        sys.exit(1)
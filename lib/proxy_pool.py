@@ -0,0 +1,261 @@
+import os
+import json
+import time
+import threading
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+# The pool is shared by every site in a run and persisted between runs, so a
+# warm pool hands out a proxy without scraping or probing anything.
+PROXY_POOL_PATH = os.getenv('PROXY_POOL_PATH', 'data/proxy_pool.json')
+# How long a scraped candidate list and its scores stay valid
+PROXY_POOL_TTL_HOURS = float(os.getenv('PROXY_POOL_TTL_HOURS', 6))
+# Candidates probed when a host has no working proxy on record
+PROXY_VALIDATE_LIMIT = int(os.getenv('PROXY_VALIDATE_LIMIT', 40))
+PROXY_VALIDATE_WORKERS = int(os.getenv('PROXY_VALIDATE_WORKERS', 16))
+PROXY_VALIDATE_TIMEOUT = float(os.getenv('PROXY_VALIDATE_TIMEOUT', 5))
+# Probing stops once this many proxies have answered for a host
+PROXY_POOL_MIN_GOOD = int(os.getenv('PROXY_POOL_MIN_GOOD', 5))
+
+
+def _host_of(url):
+    return urlparse(url).netloc.lower() or url.lower()
+
+
+def proxy_score(stats):
+    """
+    Orders proxies for a host: best success rate first, then lowest latency.
+
+    Args:
+        stats (dict): {"successes", "failures", "latency"} for one proxy.
+
+    Returns:
+        tuple: A sort key, smaller is better.
+    """
+    attempts = stats['successes'] + stats['failures']
+    success_rate = stats['successes'] / attempts if attempts else 0
+    return (-success_rate, stats['latency'])
+
+
+def validate_proxy(proxy, url, timeout=PROXY_VALIDATE_TIMEOUT):
+    """
+    Checks that a proxy can reach the host of url.
+
+    The callers install proxies as {'http': proxy}, so the probe goes to the
+    host over plain http, which is the traffic the proxy will actually carry.
+
+    Args:
+        proxy (str): The proxy url, e.g. "http://1.2.3.4:8080".
+        url (str): Any url on the target host.
+        timeout (float): Seconds before the proxy counts as dead.
+
+    Returns:
+        float: The round trip in seconds, or None if the proxy failed.
+    """
+    probe_url = f"http://{_host_of(url)}/"
+    start = time.perf_counter()
+    try:
+        requests.head(probe_url, proxies={'http': proxy}, timeout=timeout, allow_redirects=False)
+    except requests.exceptions.RequestException:
+        return None
+    return time.perf_counter() - start
+
+
+class ProxyPool:
+    """
+    Keeps a scored, on-disk pool of free proxies for each target host.
+
+    Usage:
+        pool = ProxyPool(get_proxy_list)
+        proxy = pool.acquire(url)
+        ...
+        pool.report_success(proxy, url, elapsed)  # or pool.report_failure(proxy, url)
+
+    The candidate list comes from fetch_candidates and is re-scraped once it
+    is older than the TTL. Candidates are probed concurrently against a host
+    the first time it asks for a proxy and each host keeps its own scores.
+    """
+
+    def __init__(self, fetch_candidates, path=PROXY_POOL_PATH, ttl_hours=PROXY_POOL_TTL_HOURS):
+        self.fetch_candidates = fetch_candidates
+        self.path = path
+        self.ttl_seconds = ttl_hours * 3600
+        # guards self.state, never held across network calls
+        self.lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._host_locks = {}
+        self.state = self._load()
+
+    def _empty_state(self):
+        return {"fetched_at": 0, "candidates": [], "hosts": {}}
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return self._empty_state()
+        try:
+            with open(self.path, 'r') as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"Could not read proxy pool {self.path}: {e}")
+            return self._empty_state()
+        if time.time() - state.get('fetched_at', 0) > self.ttl_seconds:
+            print("Proxy pool is past its TTL, it will be rebuilt")
+            return self._empty_state()
+        return state
+
+    def _save(self):
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.state, f, indent=4)
+        os.replace(tmp_path, self.path)
+
+    def _candidates_stale(self):
+        # called with self.lock held
+        return not self.state['candidates'] or time.time() - self.state['fetched_at'] > self.ttl_seconds
+
+    def _refresh_candidates(self):
+        """
+        Re-scrapes the candidate list once it is past its TTL. One thread
+        scrapes at a time, without holding self.lock, so hosts that already
+        have proxies are not held up by it.
+        """
+        with self._refresh_lock:
+            with self.lock:
+                if not self._candidates_stale():
+                    return
+            candidates = list(dict.fromkeys(self.fetch_candidates() or []))
+            with self.lock:
+                # scores from an old candidate list are not worth keeping
+                self.state = self._empty_state()
+                self.state['candidates'] = candidates
+                self.state['fetched_at'] = time.time()
+
+    def _host_lock(self, host):
+        with self.lock:
+            return self._host_locks.setdefault(host, threading.Lock())
+
+    def _validate_host(self, url, host):
+        """
+        Probes untried candidates against host. The probes run outside
+        self.lock, under a per-host lock so a host is only probed by one
+        thread at a time while other hosts carry on.
+        """
+        with self._host_lock(host):
+            with self.lock:
+                tried = self.state['hosts'].setdefault(host, {"proxies": {}, "tried": []})
+                if tried['proxies']:
+                    # another thread validated this host while we waited
+                    return
+                to_probe = [c for c in self.state['candidates'] if c not in tried['tried']][:PROXY_VALIDATE_LIMIT]
+            if not to_probe:
+                return
+
+            start = time.perf_counter()
+            usable = {}
+            executor = ThreadPoolExecutor(max_workers=PROXY_VALIDATE_WORKERS)
+            futures = {executor.submit(validate_proxy, proxy, url): proxy for proxy in to_probe}
+            try:
+                for future in as_completed(futures):
+                    latency = future.result()
+                    if latency is not None:
+                        usable[futures[future]] = latency
+                        if len(usable) >= PROXY_POOL_MIN_GOOD:
+                            break
+            finally:
+                # probes still in flight are left to time out on their own
+                executor.shutdown(wait=False, cancel_futures=True)
+            # unfinished probes stay untried so a later call can pick them up
+            probed = [futures[f] for f in futures if f.done() and not f.cancelled()]
+
+            with self.lock:
+                # the candidate list may have been refreshed while probing
+                candidates = set(self.state['candidates'])
+                tried = self.state['hosts'].setdefault(host, {"proxies": {}, "tried": []})
+                for proxy, latency in usable.items():
+                    if proxy in candidates:
+                        tried['proxies'][proxy] = {"successes": 1, "failures": 0, "latency": latency}
+                tried['tried'].extend(p for p in probed if p in candidates and p not in tried['tried'])
+                self._save()
+            print(f"Validated {len(probed)} proxies for {host} in {time.perf_counter() - start:.1f}s, {len(usable)} usable")
+
+    def _best(self, host):
+        # called with self.lock held
+        entry = self.state['hosts'].get(host)
+        if not entry or not entry['proxies']:
+            return None
+        return min(entry['proxies'], key=lambda p: proxy_score(entry['proxies'][p]))
+
+    def acquire(self, url):
+        """
+        Returns the best proxy on record for the host of url.
+
+        Scraping the candidate list and probing a host happen outside the
+        pool lock, so a site asking for a validated host never waits on
+        another site's scrape or probes.
+
+        Args:
+            url (str): The url the proxy will be used for.
+
+        Returns:
+            str: The proxy url, or None if no candidate could reach the host.
+        """
+        host = _host_of(url)
+        with self.lock:
+            stale = self._candidates_stale()
+            proxy = None if stale else self._best(host)
+        if proxy:
+            return proxy
+        if stale:
+            self._refresh_candidates()
+        self._validate_host(url, host)
+        with self.lock:
+            return self._best(host)
+
+    def report_success(self, proxy, url, latency):
+        """Records a request that went through proxy, folding latency into its average."""
+        if not proxy:
+            return
+        with self.lock:
+            stats = self.state['hosts'].get(_host_of(url), {}).get('proxies', {}).get(proxy)
+            if stats is None:
+                return
+            stats['successes'] += 1
+            stats['latency'] += (latency - stats['latency']) / stats['successes']
+            self._save()
+
+    def report_failure(self, proxy, url):
+        """
+        Records a failed request through proxy. The proxy is evicted from the
+        host's pool once it has failed at least as often as it has worked, so
+        a freshly validated proxy goes on its first failure while one with a
+        track record survives the odd timeout.
+        """
+        if not proxy:
+            return
+        with self.lock:
+            host_proxies = self.state['hosts'].get(_host_of(url), {}).get('proxies', {})
+            stats = host_proxies.get(proxy)
+            if stats is None:
+                return
+            stats['failures'] += 1
+            if stats['failures'] >= stats['successes']:
+                del host_proxies[proxy]
+                print(f"Evicted proxy {proxy} for {_host_of(url)}")
+            self._save()
+
+
+_shared_pools = {}
+_shared_pools_lock = threading.Lock()
+
+
+def get_proxy_pool(fetch_candidates, path=PROXY_POOL_PATH):
+    """Returns the process-wide ProxyPool for path, creating it on first use."""
+    with _shared_pools_lock:
+        if path not in _shared_pools:
+            _shared_pools[path] = ProxyPool(fetch_candidates, path=path)
+        return _shared_pools[path]
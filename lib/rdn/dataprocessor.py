@@ -6,13 +6,14 @@ from datetime import date, datetime
 import traceback
 from zoneinfo import ZoneInfo
 from bs4 import BeautifulSoup
-import dateparser
+from lib.dates import parse_date
 from dateutil.relativedelta import relativedelta
 import pandas as pd
 import requests
 from unidecode import unidecode
 from lib.discord import send_discord_embed, send_discord_message
 from lib.timing import filter_tenders_by_last_run
+from lib.html_parser import parse_html, element_text, class_xpath, register_extractor, run_extractor
 from process_project_data import get_latest_issue, get_project_type_id, set_entry_issue_id
 FILE_DIR = os.environ.get("FILE_DIR") or "screenshots_rdn"
 
@@ -22,6 +23,42 @@ def extract_rdn_tender_data(html_content: str) -> dict:
     """
     Parses the raw HTML from the RDN procurement page to extract key tender details.
     """
+    return run_extractor('rdn_tender', html_content)
+
+_RDN_TITLE_XPATH = class_xpath('title', tag='h1')
+_RDN_CLOSING_XPATH = class_xpath('datetime', tag='time')
+_RDN_BODY_XPATH = class_xpath('field--name-body', tag='div')
+_RDN_DOCUMENTS_XPATH = class_xpath('views-field-field-documents', tag='div')
+
+def _first(xpath, root):
+    found = xpath(root)
+    return found[0] if found else None
+
+def _extract_rdn_tender_data_lxml(html_content: str) -> dict:
+    """lxml version of _extract_rdn_tender_data_soup"""
+    root = parse_html(html_content)
+
+    title_elem = _first(_RDN_TITLE_XPATH, root)
+    title = element_text(title_elem).strip() if title_elem is not None else ""
+    opp_id = title.split(' ')[0] if title else ""
+
+    closing_elem = _first(_RDN_CLOSING_XPATH, root)
+    closing_date_str = closing_elem.attrib['datetime'] if closing_elem is not None else ""
+
+    body_elem = _first(_RDN_BODY_XPATH, root)
+    description_text = element_text(body_elem).strip() if body_elem is not None else ""
+
+    doc_elem = _first(_RDN_DOCUMENTS_XPATH, root)
+    doc_link = ""
+    if doc_elem is not None:
+        a_tag = next(doc_elem.iterdescendants('a'), None)
+        if a_tag is not None and 'href' in a_tag.attrib:
+            href = a_tag.attrib['href']
+            doc_link = href if href.startswith('http') else f"https://www.rdn.bc.ca{href}"
+
+    return _rdn_tender_record(opp_id, title, description_text, closing_date_str, doc_link)
+
+def _extract_rdn_tender_data_soup(html_content: str) -> dict:
     soup = BeautifulSoup(html_content, 'html.parser')
     
     # 1. Extract Title & Opportunity ID
@@ -49,6 +86,9 @@ def extract_rdn_tender_data(html_content: str) -> dict:
             href = a_tag['href']
             doc_link = href if href.startswith('http') else f"https://www.rdn.bc.ca{href}"
             
+    return _rdn_tender_record(opp_id, title, description_text, closing_date_str, doc_link)
+
+def _rdn_tender_record(opp_id, title, description_text, closing_date_str, doc_link):
     return {
         'Opportunity ID': opp_id,
         'Opportunity Description': title,
@@ -59,6 +99,8 @@ def extract_rdn_tender_data(html_content: str) -> dict:
         'Type': 'Request for Proposal' # Explicitly stated in the description
     }
 
+register_extractor('rdn_tender', _extract_rdn_tender_data_lxml, _extract_rdn_tender_data_soup)
+
 def _map_rdn_tender_entry(tender_record: dict, params: dict, city_mapping: dict) -> dict:
     """
     Maps the parsed RDN tender data into the required system payload structure.
@@ -129,7 +171,7 @@ def _map_rdn_tender_entry(tender_record: dict, params: dict, city_mapping: dict)
     closing_date_str = tender_record.get('Parsed Date')
     
     if closing_date_str:
-        parsed_date_close = dateparser.parse(closing_date_str)
+        parsed_date_close = parse_date(closing_date_str)
         if parsed_date_close:
             if is_windows:
                 fmt = "%#m/%#d/%Y - %#I %p"
@@ -0,0 +1,228 @@
+import os
+import re
+import json
+import time
+import random
+import asyncio
+
+from pydoll.protocol.network.events import NetworkEvent
+
+# Upper bound for a single readiness wait, in seconds. Waits return as soon
+# as their condition holds, so this is only paid when a page never settles.
+READY_TIMEOUT = float(os.getenv('READY_TIMEOUT', 20))
+READY_POLL_INTERVAL = float(os.getenv('READY_POLL_INTERVAL', 0.25))
+# How long the network has to stay quiet to count as idle
+NETWORK_IDLE_SECONDS = float(os.getenv('NETWORK_IDLE_SECONDS', 0.5))
+# Long-lived or fire-and-forget requests that never settle a page
+NETWORK_IDLE_IGNORED_TYPES = ('WebSocket', 'EventSource', 'Ping', 'Image', 'Media', 'Font')
+
+
+async def evaluate(tab, expression):
+    """Runs a JavaScript expression in the page and returns its value, None if it threw."""
+    response = await tab.execute_script(expression, return_by_value=True, await_promise=True)
+    result = response.get('result', {})
+    if result.get('exceptionDetails'):
+        return None
+    return result.get('result', {}).get('value')
+
+
+def selector_expression(selector):
+    """JavaScript that is true once selector matches, XPath if it starts with '/' or '(', CSS otherwise."""
+    if selector.startswith(('/', '(')):
+        return (f"!!document.evaluate({json.dumps(selector)}, document, null, "
+                f"XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue")
+    return f"!!document.querySelector({json.dumps(selector)})"
+
+
+def row_signature_expression(rows_selector):
+    """JavaScript summarising the rows matched by a CSS selector: their count and first and last row text."""
+    return (
+        f"(() => {{ const rows = document.querySelectorAll({json.dumps(rows_selector)});"
+        " if (!rows.length) return null;"
+        " return rows.length + '|' + rows[0].innerText + '|' + rows[rows.length - 1].innerText; })()"
+    )
+
+
+async def wait_for_condition(tab, expression, timeout=READY_TIMEOUT, interval=READY_POLL_INTERVAL):
+    """
+    Polls a JavaScript expression until it is truthy.
+
+    Returns:
+        The expression's last value, falsy if timeout ran out first.
+    """
+    deadline = time.perf_counter() + timeout
+    value = None
+    while True:
+        try:
+            value = await evaluate(tab, expression)
+        except Exception:
+            # the page can be between documents while a navigation lands
+            value = None
+        if value or time.perf_counter() >= deadline:
+            return value
+        await asyncio.sleep(interval)
+
+
+async def wait_for_selector(tab, selector, timeout=READY_TIMEOUT):
+    """Waits until selector (CSS or XPath) matches an element. Returns False on timeout."""
+    found = await wait_for_condition(tab, selector_expression(selector), timeout=timeout)
+    if not found:
+        print(f"Timed out after {timeout}s waiting for {selector}")
+    return bool(found)
+
+
+async def wait_for_change(tab, expression, previous, timeout=READY_TIMEOUT):
+    """
+    Waits until a JavaScript expression gives a non-empty value different
+    from previous, e.g. a grid's row signature after clicking Next.
+
+    Returns:
+        The new value, or None on timeout.
+    """
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            value = await evaluate(tab, expression)
+        except Exception:
+            value = None
+        if value and value != previous:
+            return value
+        if time.perf_counter() >= deadline:
+            print(f"Timed out after {timeout}s waiting for the page to change")
+            return None
+        await asyncio.sleep(READY_POLL_INTERVAL)
+
+
+async def pace(low, high):
+    """
+    A randomized pause for the places where anti-bot pacing is wanted,
+    between navigations to the same site, not for waiting on a page.
+    """
+    await asyncio.sleep(random.uniform(low, high))
+
+
+class PolitenessBudget:
+    """
+    Spaces out navigations to one site across every tab that shares the
+    budget, so a pool of tabs never hits it faster than one request every
+    min_interval seconds.
+
+    Usage:
+        budget = PolitenessBudget(1.5)
+        await budget.wait()  # in each tab, before tab.go_to(...)
+    """
+
+    def __init__(self, min_interval):
+        self.min_interval = min_interval
+        self.requests = 0
+        self._next_slot = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self):
+        """Waits for the next free slot, slots are handed out in call order."""
+        async with self._lock:
+            now = time.perf_counter()
+            slot = max(now, self._next_slot)
+            self._next_slot = slot + self.min_interval
+            self.requests += 1
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class NetworkMonitor:
+    """
+    Tracks the requests in flight on a tab so a scraper can wait for the
+    network to go quiet, or for a specific XHR to complete, instead of
+    sleeping a fixed time after a click.
+
+    Usage:
+        monitor = NetworkMonitor(tab)
+        await monitor.start()
+        marker = monitor.mark()
+        await button.click()
+        await monitor.wait_for_response(r"request_browse", since=marker)
+        await monitor.wait_for_idle()
+    """
+
+    def __init__(self, tab, ignored_types=NETWORK_IDLE_IGNORED_TYPES):
+        self.tab = tab
+        self.ignored_types = set(ignored_types)
+        self._inflight = {}
+        # urls of completed responses, in order
+        self._finished = []
+        self._last_activity = time.perf_counter()
+        self._callback_ids = []
+        self._owns_network_events = False
+
+    async def start(self):
+        if not self.tab.network_events_enabled:
+            await self.tab.enable_network_events()
+            self._owns_network_events = True
+        self._callback_ids = [
+            await self.tab.on(NetworkEvent.REQUEST_WILL_BE_SENT, self._on_request),
+            await self.tab.on(NetworkEvent.LOADING_FINISHED, self._on_done),
+            await self.tab.on(NetworkEvent.LOADING_FAILED, self._on_done),
+        ]
+
+    async def stop(self):
+        for callback_id in self._callback_ids:
+            await self.tab.remove_callback(callback_id)
+        self._callback_ids = []
+        if self._owns_network_events:
+            await self.tab.disable_network_events()
+            self._owns_network_events = False
+
+    def mark(self):
+        """Returns a marker for wait_for_response, so only responses after it count."""
+        return len(self._finished)
+
+    async def wait_for_idle(self, idle_seconds=NETWORK_IDLE_SECONDS, timeout=READY_TIMEOUT):
+        """
+        Waits until no request has been in flight for idle_seconds.
+
+        Returns:
+            bool: False if timeout ran out first.
+        """
+        deadline = time.perf_counter() + timeout
+        while True:
+            now = time.perf_counter()
+            if not self._inflight and now - self._last_activity >= idle_seconds:
+                return True
+            if now >= deadline:
+                print(f"Network still busy after {timeout}s ({len(self._inflight)} requests in flight)")
+                return False
+            await asyncio.sleep(min(READY_POLL_INTERVAL, idle_seconds))
+
+    async def wait_for_response(self, url_pattern, since=None, timeout=READY_TIMEOUT):
+        """
+        Waits until a response whose url matches url_pattern has finished
+        loading, counting only responses after the since marker.
+
+        Returns:
+            str: The matching url, or None on timeout.
+        """
+        pattern = re.compile(url_pattern)
+        start = since if since is not None else self.mark()
+        deadline = time.perf_counter() + timeout
+        while True:
+            for url in self._finished[start:]:
+                if pattern.search(url):
+                    return url
+            start = len(self._finished)
+            if time.perf_counter() >= deadline:
+                print(f"Timed out after {timeout}s waiting for a response from {url_pattern}")
+                return None
+            await asyncio.sleep(READY_POLL_INTERVAL)
+
+    async def _on_request(self, event):
+        params = event.get('params', {})
+        if params.get('type') in self.ignored_types:
+            return
+        self._inflight[params.get('requestId')] = params.get('request', {}).get('url', '')
+        self._last_activity = time.perf_counter()
+
+    async def _on_done(self, event):
+        url = self._inflight.pop(event.get('params', {}).get('requestId'), None)
+        if url is not None:
+            self._finished.append(url)
+            self._last_activity = time.perf_counter()
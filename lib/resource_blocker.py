@@ -0,0 +1,185 @@
+import os
+import re
+from collections import Counter
+from urllib.parse import urlparse
+
+from pydoll.protocol.fetch.events import FetchEvent
+from pydoll.protocol.network.events import NetworkEvent
+from pydoll.protocol.fetch.types import AuthChallengeResponseType
+from pydoll.protocol.network.types import ErrorReason
+
+# 'False' lets every request through, e.g. to compare bytes with and without blocking
+RESOURCE_BLOCKING = os.getenv('RESOURCE_BLOCKING', 'True') == 'True'
+# CDP resource types (Image, Media, Font, Stylesheet, ...) that are never fetched.
+# Stylesheets stay on by default, pydoll needs the layout to click elements.
+BLOCK_RESOURCE_TYPES = tuple(
+    t.strip() for t in os.getenv('BLOCK_RESOURCE_TYPES', 'Image,Media,Font').split(',') if t.strip()
+)
+# Hosts whose requests are dropped whatever their type: analytics, ads, maps and video embeds
+BLOCK_HOST_PATTERNS = tuple(
+    h.strip() for h in os.getenv(
+        'BLOCK_HOST_PATTERNS',
+        'google-analytics.com,googletagmanager.com,doubleclick.net,googlesyndication.com,'
+        'facebook.net,facebook.com/tr,hotjar.com,clarity.ms,newrelic.com,nr-data.net,'
+        'maps.googleapis.com,maps.gstatic.com,api.mapbox.com,arcgis.com,'
+        'youtube.com,ytimg.com,vimeo.com,vimeocdn.com'
+    ).split(',') if h.strip()
+)
+# Urls that always load, so Cloudflare challenges (and their images) still work
+CLOUDFLARE_ALLOW_PATTERNS = ('challenges.cloudflare.com', '/cdn-cgi/', 'turnstile')
+
+
+def _compile_patterns(patterns):
+    patterns = [p for p in patterns if p]
+    if not patterns:
+        return None
+    return re.compile('|'.join(re.escape(p) for p in patterns), re.IGNORECASE)
+
+
+def proxy_credentials(proxy_url):
+    """
+    The (username, password) of a '--proxy-server' url, split the way pydoll
+    splits it, or None if the url carries no credentials.
+    """
+    if not proxy_url or '@' not in proxy_url:
+        return None
+    creds_part = proxy_url.split('://', 1)[-1].split('@', 1)[0]
+    if ':' not in creds_part:
+        return None
+    return tuple(creds_part.split(':', 1))
+
+
+class ResourceBlocker:
+    """
+    Drops requests a scraper never reads (images, fonts, media, trackers,
+    map and video embeds) through pydoll's Fetch domain, before they reach
+    the network or the proxy.
+
+    Usage:
+        blocker = await block_resources(tab, "rdn")
+        ...
+        await blocker.stop()  # prints what was blocked and what was downloaded
+
+    Requests matching allow_patterns are always continued, whatever the
+    block lists say. Bytes are counted from Network.loadingFinished, so a run
+    with RESOURCE_BLOCKING=False gives the baseline to compare against.
+
+    With proxy_auth the tab's Fetch domain also takes the proxy's auth
+    challenges and answers them, since enabling Fetch on the tab without
+    handle_auth would leave an authenticated proxy's 407s unanswered.
+    """
+
+    def __init__(self, tab, site, block_types=BLOCK_RESOURCE_TYPES, block_hosts=BLOCK_HOST_PATTERNS,
+                 allow_patterns=CLOUDFLARE_ALLOW_PATTERNS, proxy_auth=None):
+        self.tab = tab
+        self.site = site
+        self.block_types = set(block_types)
+        self.block_hosts = _compile_patterns(block_hosts)
+        self.allow = _compile_patterns(allow_patterns)
+        self.proxy_auth = proxy_auth
+        self.blocked_by_type = Counter()
+        self.blocked_by_host = Counter()
+        self.continued = 0
+        self.bytes_loaded = 0
+        self.responses_loaded = 0
+        self._callback_ids = []
+        self._owns_network_events = False
+
+    def should_block(self, url, resource_type):
+        """Returns the reason to block a request, or None to let it through."""
+        if self.allow and self.allow.search(url):
+            return None
+        if resource_type in self.block_types:
+            return resource_type
+        if self.block_hosts:
+            parsed = urlparse(url)
+            if self.block_hosts.search(f"{parsed.netloc}{parsed.path}"):
+                return parsed.netloc
+        return None
+
+    async def start(self):
+        if not self.tab.network_events_enabled:
+            await self.tab.enable_network_events()
+            self._owns_network_events = True
+        self._callback_ids.append(await self.tab.on(NetworkEvent.LOADING_FINISHED, self._on_loading_finished))
+        if RESOURCE_BLOCKING:
+            await self.tab.enable_fetch_events(handle_auth=bool(self.proxy_auth))
+            self._callback_ids.append(await self.tab.on(FetchEvent.REQUEST_PAUSED, self._on_request_paused))
+            if self.proxy_auth:
+                self._callback_ids.append(await self.tab.on(FetchEvent.AUTH_REQUIRED, self._on_auth_required))
+
+    async def stop(self):
+        """Releases the tab and prints the run's numbers."""
+        for callback_id in self._callback_ids:
+            await self.tab.remove_callback(callback_id)
+        self._callback_ids = []
+        if RESOURCE_BLOCKING:
+            await self.tab.disable_fetch_events()
+        if self._owns_network_events:
+            await self.tab.disable_network_events()
+            self._owns_network_events = False
+        self.report()
+
+    def report(self):
+        blocked = sum(self.blocked_by_type.values()) + sum(self.blocked_by_host.values())
+        print(f"[{self.site}] blocked {blocked} requests, loaded {self.responses_loaded} "
+              f"({self.bytes_loaded / 1024 / 1024:.2f} MB transferred)")
+        if self.blocked_by_type:
+            print(f"[{self.site}] blocked by type: {dict(self.blocked_by_type.most_common())}")
+        if self.blocked_by_host:
+            print(f"[{self.site}] blocked by host: {dict(self.blocked_by_host.most_common(10))}")
+
+    async def _on_request_paused(self, event):
+        params = event['params']
+        request_id = params['requestId']
+        resource_type = params.get('resourceType')
+        # every paused request has to be answered or the page stalls on it
+        try:
+            reason = self.should_block(params['request']['url'], resource_type)
+            if reason is None:
+                self.continued += 1
+                await self.tab.continue_request(request_id)
+            else:
+                if reason == resource_type:
+                    self.blocked_by_type[reason] += 1
+                else:
+                    self.blocked_by_host[reason] += 1
+                await self.tab.fail_request(request_id, ErrorReason.BLOCKED_BY_CLIENT)
+        except Exception as e:
+            print(f"[{self.site}] could not resolve paused request {request_id}: {e}")
+
+    async def _on_auth_required(self, event):
+        request_id = event['params']['requestId']
+        username, password = self.proxy_auth
+        try:
+            await self.tab.continue_with_auth(
+                request_id, AuthChallengeResponseType.PROVIDE_CREDENTIALS,
+                proxy_username=username, proxy_password=password,
+            )
+        except Exception as e:
+            print(f"[{self.site}] could not answer the proxy auth challenge for {request_id}: {e}")
+
+    async def _on_loading_finished(self, event):
+        self.responses_loaded += 1
+        self.bytes_loaded += event.get('params', {}).get('encodedDataLength', 0) or 0
+
+
+async def block_resources(tab, site, allow_patterns=(), proxy_url=None, **kwargs):
+    """
+    Starts a ResourceBlocker on tab.
+
+    Args:
+        tab (Tab): The pydoll tab to filter.
+        site (str): Name used in the printed stats.
+        allow_patterns (tuple): Extra url fragments this site needs loaded,
+            on top of the Cloudflare challenge assets.
+        proxy_url (str): The '--proxy-server' url the browser was started
+            with, its credentials answer the proxy's auth challenges.
+
+    Returns:
+        ResourceBlocker: The started blocker, stop() it when the tab is done.
+    """
+    blocker = ResourceBlocker(tab, site, allow_patterns=CLOUDFLARE_ALLOW_PATTERNS + tuple(allow_patterns),
+                              proxy_auth=proxy_credentials(proxy_url), **kwargs)
+    await blocker.start()
+    return blocker
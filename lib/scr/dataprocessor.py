@@ -6,7 +6,7 @@ from datetime import date, datetime
 import traceback
 from zoneinfo import ZoneInfo
 from bs4 import BeautifulSoup
-import dateparser
+from lib.dates import parse_date
 from dateutil.relativedelta import relativedelta
 import pandas as pd
 import requests
@@ -107,7 +107,7 @@ def _map_srd_tender_entry(tender_record: dict, params: dict, city_mapping: dict)
     if closing_date_str and closing_date_str.lower() != 'nan':
         # Remove the pipe separator to help dateparser "Jul 29, 2026 | 2:00 pm" -> "Jul 29, 2026 2:00 pm"
         clean_closing = closing_date_str.replace('|', '').strip()
-        parsed_date_close = dateparser.parse(clean_closing)
+        parsed_date_close = parse_date(clean_closing)
         
         if parsed_date_close:
             if is_windows:
@@ -0,0 +1,105 @@
+import os
+import csv
+import json
+from itertools import groupby
+
+# Key every spooled record carries with the number of the page it came from
+PAGE_KEY = '_page'
+
+
+class RecordSpool:
+    """
+    An append-only JSON Lines file of scraped records, so a scraper can hand
+    each page's rows to disk as soon as they are parsed instead of keeping
+    the whole run in memory.
+
+    Usage:
+        spool = RecordSpool("screenshots/spool/Region_Scan.jsonl")
+        spool.append(page_records, page=1)
+        ...
+        for record in spool:  # read back lazily, one line at a time
+            ...
+
+    The file is emptied when the spool is created.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.records_written = 0
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        open(path, 'w', encoding='utf-8').close()
+
+    def append(self, records, page=None):
+        """Appends records, tagged with page when given."""
+        with open(self.path, 'a', encoding='utf-8') as f:
+            for record in records:
+                if page is not None:
+                    record = {**record, PAGE_KEY: page}
+                f.write(json.dumps(record, ensure_ascii=False))
+                f.write('\n')
+        self.records_written += len(records)
+
+    def __iter__(self):
+        return iter_records([self.path])
+
+
+def iter_records(paths, keep_page=False):
+    """Yields the records of one or more spool files in order, without loading them."""
+    for path in paths:
+        if not os.path.exists(path):
+            continue
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if not keep_page:
+                    record.pop(PAGE_KEY, None)
+                yield record
+
+
+def iter_pages(paths):
+    """Yields the records of each spool file grouped back into their pages, one list at a time."""
+    for path in paths:
+        for _, page in groupby(iter_records([path], keep_page=True), key=lambda record: record.get(PAGE_KEY)):
+            yield [{key: value for key, value in record.items() if key != PAGE_KEY} for record in page]
+
+
+def unique_records(records, key):
+    """Drops records whose key value was already seen, keeping the first. Only the keys are held in memory."""
+    seen = set()
+    for record in records:
+        value = record.get(key)
+        if value in seen:
+            continue
+        seen.add(value)
+        yield record
+
+
+def write_csv(path, records_factory):
+    """
+    Writes records to a CSV with the columns in first-seen order, the way
+    pd.DataFrame(records).to_csv(index=False) lays them out.
+
+    Args:
+        path (str): The CSV to write.
+        records_factory (callable): Returns a fresh iterator over the
+            records, it is called twice: once for the columns, once to write.
+
+    Returns:
+        int: The number of rows written.
+    """
+    columns = {}
+    for record in records_factory():
+        for column in record:
+            columns.setdefault(column, None)
+    rows = 0
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(columns), restval='', lineterminator=os.linesep)
+        writer.writeheader()
+        for record in records_factory():
+            writer.writerow(record)
+            rows += 1
+    return rows
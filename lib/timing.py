@@ -1,7 +1,7 @@
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
-import dateparser
+from lib.dates import parse_date
 import requests
 import os
 
@@ -128,7 +128,7 @@ def filter_tenders_by_last_run(tender_records: List[Dict], date_field: str = 'Is
             continue
 
         try:
-            parsed_datetime = dateparser.parse(
+            parsed_datetime = parse_date(
                 date_str, 
                 settings={'TIMEZONE': 'America/Vancouver', 'TO_TIMEZONE': 'America/Vancouver', 'RETURN_AS_TIMEZONE_AWARE': True}
             )
@@ -184,6 +184,112 @@ def load_city_mapping(filepath="data/city.csv") -> dict:
     return city_mapping
 
 
+def _trie_pattern(words):
+    """
+    A regex alternation of words laid out as a character trie, so each
+    position is checked in one walk instead of once per word. Longer
+    continuations are tried first, the regex only backtracks to a shorter
+    word when the longer one is not followed by a word boundary.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[''] = None
+
+    def build(node):
+        branches = [re.escape(char) + build(child) for char, child in node.items() if char]
+        if '' in node:
+            # end of a word, tried last
+            branches.append('')
+        if len(branches) == 1:
+            return branches[0]
+        return '(?:' + '|'.join(branches) + ')'
+
+    return build(trie)
+
+
+class CityMatcher:
+    """
+    Finds city names from city.csv in free text, built once per mapping.
+
+    A city matches as a whole word, case-insensitively. When several cities
+    appear, the longest wins so "North Vancouver" beats "Vancouver", and
+    cities of the same length keep the order of the mapping. That is what
+    the per-city regex loops did, in a single scan of the text.
+
+    Usage:
+        matcher = get_city_matcher(city_mapping)
+        matcher.match("District of North Vancouver")  # ('North Vancouver', '<city_id>')
+        df['City'] = matcher.match_series(df['Organization (Issued by)'])
+    """
+
+    def __init__(self, city_mapping: dict):
+        self.city_mapping = city_mapping
+        # Sort cities by length descending so "North Vancouver" matches before "Vancouver"
+        sorted_cities = sorted(city_mapping.keys(), key=len, reverse=True)
+        self._by_lower = {}
+        self._rank = {}
+        for rank, city_name in enumerate(sorted_cities):
+            lower = city_name.lower()
+            if lower not in self._by_lower:
+                self._by_lower[lower] = city_name
+                self._rank[lower] = rank
+        # zero-width, so a city inside a longer overlapping match is still seen
+        self._pattern = re.compile(rf'(?=\b({_trie_pattern(self._by_lower)})\b)') if self._by_lower else None
+
+    def match(self, text: str):
+        """
+        Returns:
+            tuple: (city_name, city_id) of the best whole-word match in text, or None.
+        """
+        if not text or not isinstance(text, str) or self._pattern is None:
+            return None
+        best = None
+        for found in self._pattern.finditer(text.lower()):
+            lower = found.group(1)
+            if best is None or self._rank[lower] < self._rank[best]:
+                best = lower
+        if best is None:
+            return None
+        city_name = self._by_lower[best]
+        return city_name, self.city_mapping[city_name]
+
+    def match_series(self, series, default=DEFAULT_CITY):
+        """
+        match() over a pandas Series of text, giving a Series of city names
+        with default where nothing matched. Each distinct value is only
+        scanned once.
+        """
+        names = {}
+        for value in series.drop_duplicates():
+            if isinstance(value, str):
+                found = self.match(value)
+                names[value] = found[0] if found else default
+        return series.map(lambda value: names.get(value, default) if isinstance(value, str) else default)
+
+    def first_match(self, fields, default=DEFAULT_CITY) -> str:
+        """The city of the first field that names one, checked in order."""
+        for field in fields:
+            found = self.match(field)
+            if found:
+                return found[0]
+        return default
+
+
+_city_matchers = {}
+
+
+def get_city_matcher(city_mapping: dict) -> CityMatcher:
+    """Returns the CityMatcher for city_mapping, building it on first use."""
+    key = tuple(city_mapping.items())
+    matcher = _city_matchers.get(key)
+    if matcher is None:
+        matcher = _city_matchers[key] = CityMatcher(city_mapping)
+    return matcher
+
+
 def find_bcbid_city_match(tender_record: dict, city_mapping: dict) -> str:
     """
     Searches for a valid city name in the 'Organization (Issued for)' or 
@@ -194,21 +300,7 @@ def find_bcbid_city_match(tender_record: dict, city_mapping: dict) -> str:
         tender_record.get('Organization (Issued by)', ''),
         tender_record.get('Opportunity Description', '')
     ]
-    
-    # Sort cities by length descending so "North Vancouver" matches before "Vancouver"
-    sorted_cities = sorted(city_mapping.keys(), key=len, reverse=True)
-    
-    for field in check_fields:
-        if not field or not isinstance(field, str):
-            continue
-            
-        field_lower = field.lower()
-        for city_name in sorted_cities:
-            # Use regex boundaries \b to ensure we don't match 'Hope' inside 'Hopewell'
-            if re.search(rf'\b{re.escape(city_name.lower())}\b', field_lower):
-                return city_name
-                
-    return DEFAULT_CITY
+    return get_city_matcher(city_mapping).first_match(check_fields)
 
 def scan_text_for_cities(text: str, city_mapping: dict) -> str:
     """
@@ -218,13 +310,70 @@ def scan_text_for_cities(text: str, city_mapping: dict) -> str:
     if not text:
         return "victoria"
 
-    # Sort by length descending to catch "North Vancouver" before "Vancouver"
+    found = get_city_matcher(city_mapping).match(text)
+    return found[0] if found else DEFAULT_CITY
+
+
+def _scan_text_for_cities_regex(text: str, city_mapping: dict) -> str:
+    # the per-city regex loop the matchers replaced, kept as the reference
+    if not text or not isinstance(text, str):
+        return DEFAULT_CITY
     sorted_cities = sorted(city_mapping.keys(), key=len, reverse=True)
     text_lower = text.lower()
-
     for city_name in sorted_cities:
-        # \b ensures we match the whole word only
         if re.search(rf'\b{re.escape(city_name.lower())}\b', text_lower):
             return city_name
-            
     return DEFAULT_CITY
+
+
+def check_city_parity(paths, city_mapping_path='data/city.csv'):
+    """
+    Runs the city matcher and the per-city regex loop over every text cell
+    of saved CSVs, prints the timings and whether they agree.
+
+    Returns:
+        bool: True if every cell gave the same city both ways.
+    """
+    import time
+    import pandas as pd
+
+    city_mapping = load_city_mapping(city_mapping_path)
+    texts = []
+    for path in paths:
+        frame = pd.read_csv(path, dtype=str, keep_default_na=False)
+        for column in frame.columns:
+            texts.extend(frame[column].tolist())
+    print(f"{len(texts)} text cells")
+
+    start = time.perf_counter()
+    expected = [_scan_text_for_cities_regex(text, city_mapping) for text in texts]
+    regex_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = get_city_matcher(city_mapping)
+    actual = [scan_text_for_cities(text, city_mapping) if text else DEFAULT_CITY for text in texts]
+    matcher_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    series_actual = matcher.match_series(pd.Series(texts, dtype=object)).tolist()
+    series_seconds = time.perf_counter() - start
+
+    mismatches = [(text, e, a) for text, e, a in zip(texts, expected, actual) if e != a]
+    series_mismatches = sum(e != a for e, a in zip(expected, series_actual))
+    print(f"per-city regex {regex_seconds * 1000:.1f}ms, matcher {matcher_seconds * 1000:.1f}ms, "
+          f"series {series_seconds * 1000:.1f}ms, "
+          f"{regex_seconds / matcher_seconds if matcher_seconds else float('inf'):.1f}x faster")
+    print(f"parity {'OK' if not mismatches and not series_mismatches else 'MISMATCH'}")
+    for text, e, a in mismatches[:10]:
+        print(f"  {text[:80]!r}: regex {e}, matcher {a}")
+    return not mismatches and not series_mismatches
+
+
+if __name__ == "__main__":
+    # Parity and timing of the city matcher against the per-city regex loop,
+    # over every text cell of saved CSVs:
+    #   python -m lib.utils screenshots/bid_recent.csv screenshots_canadabuys/canadabuys_final_details.csv
+    import sys
+
+    if not check_city_parity(sys.argv[1:]):
+        sys.exit(1)
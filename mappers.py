@@ -1,4 +1,4 @@
-import dateparser
+from lib.dates import parse_date
 import platform
 import requests
 import os
@@ -77,7 +77,7 @@ def _map_tender_entry(tender_record: dict, params: dict) -> dict:
     # Use dateparser for robust date handling from various formats
     open_date_str = info_table.get('PublishedDate')
     if open_date_str:
-        parsed_open_date = dateparser.parse(open_date_str)
+        parsed_open_date = parse_date(open_date_str)
         if parsed_open_date:
             entry['ys_date'] = parsed_open_date.strftime('%Y-%m-%d')
 
@@ -113,7 +113,7 @@ def _map_tender_entry(tender_record: dict, params: dict) -> dict:
     # Parse and format the closing date
     closing_date_str = tender_record.get('Closing Date')
     if closing_date_str:
-        parsed_date_close = dateparser.parse(closing_date_str)
+        parsed_date_close = parse_date(closing_date_str)
         if parsed_date_close:
             try:
                 is_windows = platform.system() == "Windows"
@@ -189,7 +189,7 @@ def _map_bid_tender_entry(tender_record: dict, params: dict) -> dict:
     # Use dateparser for robust date handling from various formats
     published_date_str = get_tender_value('Published Date')
     if published_date_str:
-        parsed_published_date = dateparser.parse(published_date_str)
+        parsed_published_date = parse_date(published_date_str)
         if parsed_published_date:
             entry['ys_date'] = parsed_published_date.strftime('%Y-%m-%d')
     
@@ -236,7 +236,7 @@ def _map_bid_tender_entry(tender_record: dict, params: dict) -> dict:
     # Format the closing date
     closing_date_str = get_tender_value('Bid Closing Date')
     if closing_date_str:
-        parsed_date_close = dateparser.parse(closing_date_str)
+        parsed_date_close = parse_date(closing_date_str)
         if parsed_date_close:
             try:
                 # Windows-specific format codes ('#')
@@ -300,7 +300,7 @@ def _filter_tenders_by_recent_date(tender_records: List[Dict]) -> List[Dict]:
 
         # 3. Parse the date and compare
         try:
-            parsed_datetime = dateparser.parse(date_str)
+            parsed_datetime = parse_date(date_str)
             if parsed_datetime and parsed_datetime.date() in target_dates:
                 filtered_records.append(record)
         except Exception as e:
@@ -331,7 +331,7 @@ def _filter_bid_tenders_by_last_run(tender_records: List[Dict]) -> List[Dict]:
 
         try:
             # Parse date using Vancouver settings
-            parsed_datetime = dateparser.parse(
+            parsed_datetime = parse_date(
                 date_str, 
                 settings={'TIMEZONE': 'America/Vancouver', 'TO_TIMEZONE': 'America/Vancouver', 'RETURN_AS_TIMEZONE_AWARE': True,}
             )
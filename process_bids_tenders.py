@@ -3,6 +3,7 @@ import os
 import pandas as pd
 from pydoll.browser.chromium import Chrome
 from pydoll.browser.options import ChromiumOptions
+from pydoll.browser.tab import Tab
 import time
 import random
 from io import StringIO
@@ -10,9 +11,18 @@ from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 from lib.discord import send_discord_message
 from lib.bcbid_scraper import perform_human_loop
+from lib.html_parser import parse_html, element_text, register_extractor, run_extractor
+from lib.resource_blocker import block_resources
+from lib.readiness import wait_for_selector, pace
+from lib.artifacts import get_artifact_writer
 
 from mappers import _filter_bid_tenders_by_last_run, process_and_send_bid_tenders # A more robust way to join URL parts
 
+# Tenants scraped at once, one tab each in the shared browser.
+# Every tenant writes its own {file_prefix}_* files so tabs don't overwrite each other
+BIDS_TENDERS_TABS = int(os.getenv('BIDS_TENDERS_TABS', 3))
+# Seconds to wait before retrying a tenant that failed
+BIDS_TENDERS_RETRY_DELAY = float(os.getenv('BIDS_TENDERS_RETRY_DELAY', 10))
 
 
 def parse_document_date(html_string):
@@ -57,13 +67,43 @@ def parse_bid_details_from_html(html_string):
         A dictionary where keys are the bid detail headers (th) and values are
         the corresponding data (td).
     """
+    bid_details = run_extractor('bids_tenders_details', html_string)
+    if bid_details is None:
+        return {"error": "No table found in the HTML."}
+    if not bid_details.get('Published Date'):
+        print("No published date found in bid details.")
+        try:
+            bid_details.update(parse_document_date(html_string))
+            print(bid_details)
+        except Exception as e:
+            print(f"Error parsing document date: {e}")
+            bid_details["published_date_parsing_error"] = f"Error parsing document date: {e}"
+
+    return bid_details
+
+def _parse_bid_details_table_lxml(html_string):
+    """lxml version of _parse_bid_details_table_soup"""
+    root = parse_html(html_string)
+    table = next(root.iter('table'), None) if root is not None else None
+    if table is None:
+        return None
+    bid_details = {}
+    for row in table.iter('tr'):
+        header_tag = next(row.iterdescendants('th'), None)
+        value_tag = next(row.iterdescendants('td'), None)
+        if header_tag is not None and value_tag is not None:
+            header = element_text(header_tag, strip=True).replace(':', '')
+            bid_details[header] = element_text(value_tag, ' ', strip=True)
+    return bid_details
+
+def _parse_bid_details_table_soup(html_string):
     soup = BeautifulSoup(html_string, 'html.parser')
     bid_details = {}
     
     # Find the first table in the HTML
     table = soup.find('table')
     if not table:
-        return {"error": "No table found in the HTML."}
+        return None
     
     # Iterate through all table rows (tr)
     for row in table.find_all('tr'):
@@ -81,24 +121,12 @@ def parse_bid_details_from_html(html_string):
             
             # Add the key-value pair to the dictionary
             bid_details[header] = value
-    if not bid_details.get('Published Date'):
-        print("No published date found in bid details.")
-        try:
-            bid_details.update(parse_document_date(html_string))
-            print(bid_details)
-        except Exception as e:
-            print(f"Error parsing document date: {e}")
-            bid_details["published_date_parsing_error"] = f"Error parsing document date: {e}"
-
     return bid_details
 
-async def scrap_bids_and_tenders_site(config: dict):
-    base_url = config['url']
-    region_name = config['region_name']
-    tender_authority = config['tender_authority']
-    file_prefix = config['file_prefix']
-    base_dir = os.getenv('BASE_DIR', "data")
+register_extractor('bids_tenders_details', _parse_bid_details_table_lxml, _parse_bid_details_table_soup)
 
+def build_browser_options():
+    """ChromiumOptions shared by every Bids&Tenders tenant in a run."""
     options = ChromiumOptions()
     if not os.environ.get("NODRIVER_HEADLESS") == "True" and os.environ.get("DISPLAY", ":99"):
         display_var = os.environ.get("DISPLAY")
@@ -135,24 +163,30 @@ async def scrap_bids_and_tenders_site(config: dict):
     #     proxy_url = f'http://{proxy_auth}@{proxy}'
     #     print("Using proxy:", proxy_url)
     #     options.add_argument(f'--proxy-server={proxy_url}')
+    return options
 
-    async with Chrome(options=options) as browser:
-        try:
-            tab = await browser.start()
-        except Exception as e:
-            print(f"Error starting browser: {e}")
-            await asyncio.sleep(5)
-            tab = await browser.start()
+async def scrap_bids_and_tenders_site(tab: Tab, config: dict):
+    """
+    Scrapes one bidsandtenders.ca tenant on an already running tab: the
+    opportunities list, then every Bid Details page.
+    """
+    base_url = config['url']
+    region_name = config['region_name']
+    tender_authority = config['tender_authority']
+    file_prefix = config['file_prefix']
+    base_dir = os.getenv('BASE_DIR', "data")
 
+    blocker = await block_resources(tab, region_name)
+    try:
         await tab.go_to(base_url)
         await perform_human_loop(tab, 'body', 1)
         print(f'Page loaded for {region_name}, waiting for captcha to be handled...')
-        await asyncio.sleep(5)
+        # the opportunities table only renders once the captcha is through, 5s at most
+        await wait_for_selector(tab, 'table thead th', timeout=5)
 
         page_source = await tab.page_source
         os.makedirs(base_dir, exist_ok=True)
-        with open(f'{base_dir}/page_source_{region_name}.html', 'w', errors='ignore') as f:
-            f.write(page_source)
+        get_artifact_writer().save_html(f'{base_dir}/page_source_{file_prefix}.html', page_source, source=region_name)
         tables = pd.read_html(StringIO(page_source))
 
         soup = BeautifulSoup(page_source, 'html.parser')
@@ -231,7 +265,6 @@ async def scrap_bids_and_tenders_site(config: dict):
                         print(f"Warning: Skipping a row because its cell count ({len(data_row_text)}) doesn't match the header count ({len(headers)}).")
                         print(data_row_text)
 
-        await asyncio.sleep(4)
         print(final_data)
         # This code runs only after the captcha is successfully bypassed
         output_dir = "screenshots"
@@ -239,15 +272,15 @@ async def scrap_bids_and_tenders_site(config: dict):
         screenshot_path = os.path.join(output_dir, f"{file_prefix}_cloudflare_bypass_screenshot.png")
         
         print(f"Taking screenshot and saving to {screenshot_path}")
-        await tab.take_screenshot(path=screenshot_path, quality=90) # Save as PNG, full page
+        await get_artifact_writer().save_screenshot(tab, screenshot_path, source=region_name)
 
         print(f"Screenshot saved: {screenshot_path}")
         
         # await tab.disable_auto_solve_cloudflare_captcha()
         # convert to final_data
         df = pd.DataFrame(final_data)
-        df.to_csv(f'{base_dir}/output.csv', index=False)
-        await asyncio.sleep(3)
+        df.to_csv(f'{base_dir}/{file_prefix}_output.csv', index=False)
+        await pace(1, 3)
         full_results = []
         # go through each row and download the files
         for index, row in df.iterrows():
@@ -262,6 +295,7 @@ async def scrap_bids_and_tenders_site(config: dict):
             
             if details_url:
                 await tab.go_to(details_url)
+                await wait_for_selector(tab, 'table th', timeout=5)
                 page_source = await tab.page_source
                 values = parse_bid_details_from_html(page_source)
             
@@ -269,11 +303,11 @@ async def scrap_bids_and_tenders_site(config: dict):
             
             # Append the new, merged dictionary to the results list
             full_results.append(merged_dict)
-            await asyncio.sleep(3)
+            # pace the detail pages, they sit behind Cloudflare
+            await pace(1, 3)
 
         df = pd.DataFrame(full_results)
         df.to_csv(f'{base_dir}/{file_prefix}_tenders.csv', index=False)
-        await asyncio.sleep(3)
         # await tab.close()
         # loop through each entry
         clean_entries = _filter_bid_tenders_by_last_run(full_results)
@@ -287,6 +321,68 @@ async def scrap_bids_and_tenders_site(config: dict):
             'file_prefix': file_prefix,
             'tender_authority': tender_authority,
         })
+    finally:
+        await blocker.stop()
+
+async def scrape_tenant_with_retry(tab: Tab, municipality: dict, discord_webhook_url=None):
+    """Scrapes one tenant, retrying it once on the same tab if it fails."""
+    print(f"--- Starting scrape for {municipality['tender_authority']} ---")
+    for attempt in range(2):
+        try:
+            await scrap_bids_and_tenders_site(tab, municipality)
+            print(f"--- Successfully finished scrape for {municipality['region_name']} ---")
+            return
+        except Exception as e:
+            print(f"!!! An error occurred while scraping {municipality['region_name']}: {e} !!!")
+            # Optionally, send an error notification
+            send_discord_message(f"Scraper failed for {municipality['region_name']} with error: {e}", discord_webhook_url)
+            if attempt == 0:
+                await asyncio.sleep(BIDS_TENDERS_RETRY_DELAY)
+
+async def scrape_tenants_in_tabs(browser, first_tab: Tab, municipalities: list, max_tabs: int = BIDS_TENDERS_TABS):
+    """
+    Scrapes every bidsandtenders.ca tenant in one browser, on a pool of tabs.
+
+    The browser is started once for the whole run instead of once per
+    tenant. Each tab takes the next tenant off a shared queue when it
+    finishes its current one, so with max_tabs=1 the tenants run one after
+    the other in the order given.
+    """
+    queue = asyncio.Queue()
+    for municipality in municipalities:
+        queue.put_nowait(municipality)
+
+    tab_count = max(1, min(max_tabs, len(municipalities)))
+    tabs = [first_tab]
+    for _ in range(tab_count - 1):
+        tabs.append(await browser.new_tab())
+    print(f"--- Scraping {len(municipalities)} tenants with {tab_count} tab(s) ---")
+    discord_webhook_url = os.getenv('DISCORD_WEBHOOK_URL')
+
+    async def worker(worker_tab: Tab, worker_index: int):
+        # stagger the first navigation so the tabs do not hit Cloudflare together
+        await asyncio.sleep(worker_index * random.uniform(2, 4))
+        while True:
+            try:
+                municipality = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            await scrape_tenant_with_retry(worker_tab, municipality, discord_webhook_url)
+            print(f"[tab {worker_index}] {municipality['tender_authority']} finished in {time.perf_counter() - start:.0f}s")
+            print("-" * 50)
+
+    run_start = time.perf_counter()
+    try:
+        await asyncio.gather(*(worker(worker_tab, index) for index, worker_tab in enumerate(tabs)))
+    finally:
+        for extra_tab in tabs[1:]:
+            try:
+                await extra_tab.close()
+            except Exception as e:
+                print(f"Could not close tab: {e}")
+    print(f"--- All tenants scraped in {time.perf_counter() - run_start:.0f}s ---")
+    get_artifact_writer().report()
 
 async def main():
     """
@@ -323,7 +419,7 @@ async def main():
         {
             "region_name": "Campbell River",
             "tender_authority": "School District 72 (Campbell River) - Bids and Tenders",
-            "file_prefix": "campbell_river_bid_tenders",
+            "file_prefix": "sd72_bid_tenders",
             "url": 'https://sd72.bidsandtenders.ca/Module/Tenders/en'
         },
         {
@@ -333,26 +429,15 @@ async def main():
             "url": "https://islandhealthfdc.bidsandtenders.ca/Module/Tenders/en"
         }
     ]
-    discord_webhook_url = os.getenv('DISCORD_WEBHOOK_URL')
-    for municipality in municipalities_to_scrape:
-        print(f"--- Starting scrape for {municipality['tender_authority']} ---")
+    print("--- Initializing Pydoll Browser ---")
+    async with Chrome(options=build_browser_options()) as browser:
         try:
-            await scrap_bids_and_tenders_site(municipality)
-            print(f"--- Successfully finished scrape for {municipality['region_name']} ---")
+            tab = await browser.start()
         except Exception as e:
-            print(f"!!! An error occurred while scraping {municipality['region_name']}: {e} !!!")
-            # Optionally, send an error notification
-            send_discord_message(f"Scraper failed for {municipality['region_name']} with error: {e}", discord_webhook_url)
-            try:
-                time.sleep(10)
-                await scrap_bids_and_tenders_site(municipality)
-                print(f"--- Successfully finished scrape for {municipality['region_name']} ---")
-            except Exception as e:
-                print(f"!!! An error occurred while scraping {municipality['region_name']}: {e} !!!")
-                send_discord_message(f"Scraper failed for {municipality['region_name']} with error: {e}", discord_webhook_url)
-
-        print("-" * 50)
-
+            print(f"Error starting browser: {e}")
+            await asyncio.sleep(5)
+            tab = await browser.start()
+        await scrape_tenants_in_tabs(browser, tab, municipalities_to_scrape)
 
 if __name__ == "__main__":
     asyncio.run(main())
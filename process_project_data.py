@@ -3,7 +3,7 @@ import requests
 import time
 import json
 import re
-import dateparser
+from lib.dates import parse_date
 from enum import Enum
 from datetime import datetime, date, timedelta
 from dateutil.relativedelta import relativedelta # Import this
@@ -584,7 +584,7 @@ def map_data(params):
 
         if current_ys_component_id == DataTypes.TENDERS.value:
             entry['ys_date'] = unmapped_entry['open_date']
-            parsed_date_close = dateparser.parse(unmapped_entry['close_date'])
+            parsed_date_close = parse_date(unmapped_entry['close_date'])
             if parsed_date_close:
                 try:
                     ys_body['ys_closing'] = parsed_date_close.strftime("%#m/%#d/%Y - %-I %p")
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the scrapers import each other from the repository root, e.g. `from lib.utils import ...`
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
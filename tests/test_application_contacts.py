@@ -0,0 +1,72 @@
+"""fetch_application_contacts against a fake session, no network."""
+import threading
+
+import pytest
+
+import web_requests
+
+CONTACT_PAGE = """<html><body>
+<div class="row"><div>Application Contact:</div><div><span>Westshore Planning Ltd.</span></div></div>
+</body></html>"""
+NO_CONTACT_PAGE = """<html><body>
+<div class="row"><div>Folder Number:</div><div><span>DP000412</span></div></div>
+</body></html>"""
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+    def raise_for_status(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, pages):
+        self.pages = pages
+
+    def get(self, url, timeout=None):
+        return FakeResponse(self.pages[url])
+
+
+@pytest.fixture(autouse=True)
+def contact_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(web_requests, 'CONTACT_CACHE_DIR', str(tmp_path))
+
+
+def make_entries(count):
+    return [{'folder_no': f'DP{index:04d}', 'details_link': f'https://prospero.example/Details.aspx?folderNumber=DP{index:04d}'}
+            for index in range(count)]
+
+
+def test_page_without_contact_keeps_the_rest():
+    entries = make_entries(21)
+    pages = {entry['details_link']: CONTACT_PAGE for entry in entries}
+    pages[entries[3]['details_link']] = NO_CONTACT_PAGE
+
+    web_requests.fetch_application_contacts(FakeSession(pages), entries, siteType='test', max_workers=4)
+
+    assert entries[3]['application_contact'] is None
+    others = [entry['application_contact'] for index, entry in enumerate(entries) if index != 3]
+    assert others == ['Westshore Planning Ltd.'] * 20
+
+
+def test_page_without_contact_with_cancel_event_unset():
+    entries = make_entries(5)
+    pages = {entry['details_link']: NO_CONTACT_PAGE for entry in entries}
+
+    web_requests.fetch_application_contacts(FakeSession(pages), entries, siteType='test',
+                                            cancel_event=threading.Event())
+
+    assert [entry['application_contact'] for entry in entries] == [None] * 5
+
+
+def test_cancelled_attempt_raises():
+    entries = make_entries(5)
+    pages = {entry['details_link']: CONTACT_PAGE for entry in entries}
+    cancel_event = threading.Event()
+    cancel_event.set()
+
+    with pytest.raises(Exception, match='cancelled'):
+        web_requests.fetch_application_contacts(FakeSession(pages), entries, siteType='test',
+                                                cancel_event=cancel_event)
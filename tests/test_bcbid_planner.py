@@ -0,0 +1,38 @@
+"""ScanPlanner fingerprints across runs, with the state in a temporary file."""
+from lib.bcbid_planner import ScanPlanner, confirm_upload
+
+SCAN = {'name': 'Region Scan', 'values': ['Vancouver Island']}
+RECORDS = [{'Opportunity Url': 'https://bcbid.example/opportunity/1',
+            'Issue Date and Time (Pacific Time)': '2026-10-16 9:00:00 AM'}]
+
+
+def scrape(state_path):
+    """One run that reads the scan's first page, True if the planner stopped paging."""
+    planner = ScanPlanner('2026-10-01', state_path=str(state_path), enabled=True)
+    scan = planner.plan([SCAN])[0]
+    stopped = planner.should_stop(scan, 1, RECORDS, has_next=True)
+    planner.finish(completed=True)
+    return stopped
+
+
+def test_unchanged_first_page_stops_after_a_confirmed_upload(tmp_path):
+    state_path = tmp_path / 'bcbid_scan_state.json'
+    assert not scrape(state_path)
+    confirm_upload(str(state_path))
+
+    assert scrape(state_path)
+
+
+def test_unconfirmed_upload_keeps_the_full_page_range(tmp_path):
+    state_path = tmp_path / 'bcbid_scan_state.json'
+    assert not scrape(state_path)
+
+    # the processor never confirmed the upload
+    assert not scrape(state_path)
+    confirm_upload(str(state_path))
+    assert scrape(state_path)
+
+
+def test_confirm_upload_without_state(tmp_path):
+    confirm_upload(str(tmp_path / 'missing.json'))
+    assert not (tmp_path / 'missing.json').exists()
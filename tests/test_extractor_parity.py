@@ -0,0 +1,71 @@
+"""
+Parity of every registered lxml extractor with its BeautifulSoup/regex
+reference, and of the city matcher with the per-city regex loop, over the
+saved pages in tests/fixtures. Same checks as the CLIs:
+
+    python -m lib.html_parser <module> <extractor> tests/fixtures/<extractor>/*
+    python -m lib.utils tests/fixtures/cities/*.csv
+
+Add a page under tests/fixtures/<extractor>/ whenever a site changes layout
+or a parity run on live pages finds a mismatch.
+"""
+import glob
+import importlib
+import os
+
+import pytest
+
+from lib import html_parser
+from lib.utils import check_city_parity
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# extractor name -> module that registers it
+EXTRACTOR_MODULES = {
+    'pip_permits': 'web_requests',
+    'prospero_detail_field': 'web_requests',
+    'prospero_search_results': 'lib.prospero',
+    'bcbid_grid': 'lib.bcbid_scraper',
+    'rdn_tender': 'lib.rdn.dataprocessor',
+    'crd_bid_details': 'bid_tenders',
+    'bids_tenders_details': 'process_bids_tenders',
+    'bonfire_detail_page': 'fetch_tenders_all',
+    'contact_text': 'lib.contacts',
+    'primary_contact': 'lib.contacts',
+}
+
+
+def fixture_paths(name):
+    return sorted(glob.glob(os.path.join(FIXTURES_DIR, name, '*')))
+
+
+@pytest.mark.parametrize('name', sorted(EXTRACTOR_MODULES))
+def test_extractor_parity(name, monkeypatch):
+    # fetch_tenders_all creates its download folder on import
+    monkeypatch.chdir(ROOT_DIR)
+    importlib.import_module(EXTRACTOR_MODULES[name])
+    paths = fixture_paths(name)
+    assert paths, f"no fixtures for {name}"
+
+    assert html_parser.check_parity(name, paths, repeat=1)
+
+    # a fixture the extractor finds nothing in only proves that both find nothing
+    fast, _ = html_parser._EXTRACTORS[name]
+    results = []
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            results.append(fast(f.read()))
+    assert any(results), f"{name} extracted nothing from its fixtures"
+
+
+def test_every_extractor_has_fixtures():
+    for module in set(EXTRACTOR_MODULES.values()):
+        importlib.import_module(module)
+    assert set(html_parser._EXTRACTORS) <= set(EXTRACTOR_MODULES)
+
+
+def test_city_matcher_parity():
+    paths = fixture_paths('cities')
+    assert paths
+    assert check_city_parity(paths, os.path.join(ROOT_DIR, 'data', 'city.csv'))
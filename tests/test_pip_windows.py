@@ -0,0 +1,44 @@
+"""web_portal_issues window dispatch with the per-window report faked, no network."""
+from datetime import datetime
+
+import web_requests
+
+
+def test_long_range_is_fetched_as_windows(monkeypatch):
+    calls = []
+
+    def fake_windowed(params):
+        calls.append(params)
+        return {"permits": []}
+
+    monkeypatch.setattr(web_requests, 'PIP_WINDOWED', True)
+    monkeypatch.setattr(web_requests, 'web_portal_issues_windowed', fake_windowed)
+
+    web_requests.web_portal_issues({'siteType': 'sidney', 'start_date': '05/01/2024', 'end_date': '05/31/2024'})
+
+    assert len(calls) == 1
+    assert calls[0]['windowDays'] == web_requests.PIP_WINDOW_DAYS
+
+
+def test_windows_are_merged_in_date_order(monkeypatch):
+    requested = []
+
+    def fake_report(params):
+        assert params['windowDays'] is None
+        requested.append((params['start_date'], params['end_date']))
+        if params['start_date'] == datetime(2024, 5, 8):
+            raise ValueError('report timed out')
+        return {"permits": [{'Issued Date': params['end_date'].strftime('%m/%d/%Y'), 'Permit': 'BP'},
+                            {'Issued Date': '05/01/2024', 'Permit': 'BP'}]}
+
+    monkeypatch.setattr(web_requests, 'web_portal_issues', fake_report)
+
+    data = web_requests.web_portal_issues_windowed({
+        'siteType': 'sidney', 'start_date': '05/01/2024', 'end_date': '05/20/2024', 'windowDays': 7,
+    })
+
+    assert sorted(requested) == [(datetime(2024, 5, 1), datetime(2024, 5, 7)),
+                                 (datetime(2024, 5, 8), datetime(2024, 5, 14)),
+                                 (datetime(2024, 5, 15), datetime(2024, 5, 20))]
+    assert [permit['Issued Date'] for permit in data['permits']] == ['05/01/2024', '05/07/2024', '05/20/2024']
+    assert [window['start_date'] for window in data['failed_windows']] == ['05/08/2024']
@@ -2,7 +2,7 @@ import pandas as pd
 from web_requests import  NewProjectSiteTypes, get_site_params
 from process_project_data import map_data
 from datetime import datetime, timedelta, timezone
-import dateparser
+from lib.dates import parse_date_series
 import traceback
 import os 
 import pytz
@@ -42,8 +42,8 @@ def load_and_filter_tenders(base_dir, csv_file):
     print(df['open_date'])
 
     start_time_utc = pd.to_datetime(start_time).tz_convert('UTC')
-    df['open_date_parsed'] = df['open_date'].apply(
-        lambda x: dateparser.parse(re.sub(r'(\d+)(st|nd|rd|th)', r'\1', x)) if isinstance(x, str) else None
+    df['open_date_parsed'] = parse_date_series(
+        df['open_date'].map(lambda x: re.sub(r'(\d+)(st|nd|rd|th)', r'\1', x) if isinstance(x, str) else None)
     )
 
     df['open_date_parsed'] = pd.to_datetime(df['open_date_parsed'], utc=True)
@@ -1,6 +1,6 @@
 import pandas as pd
 from datetime import datetime, timedelta
-import dateparser
+from lib.dates import parse_date_series
 import os
 import pytz
 import re
@@ -40,8 +40,8 @@ def validate_tenders(base_dir, csv_file, city_name, pacific_tz):
     
     # Try 'open_date' first
     if 'open_date' in df.columns:
-        df['parsed_date'] = df['open_date'].apply(
-            lambda x: dateparser.parse(re.sub(r'(\d+)(st|nd|rd|th)', r'\1', x)) if isinstance(x, str) else None
+        df['parsed_date'] = parse_date_series(
+            df['open_date'].map(lambda x: re.sub(r'(\d+)(st|nd|rd|th)', r'\1', x) if isinstance(x, str) else None)
         )
         date_column_found = True
         print(f"Using 'open_date' for date parsing.")
@@ -50,8 +50,8 @@ def validate_tenders(base_dir, csv_file, city_name, pacific_tz):
         # Find the actual column name for 'publisheddate' case-insensitively
         published_date_col = next((col for col in df.columns if col.lower() == 'publisheddate'), None)
         if published_date_col:
-            df['parsed_date'] = df[published_date_col].apply(
-                lambda x: dateparser.parse(str(x)) if pd.notna(x) else None
+            df['parsed_date'] = parse_date_series(
+                df[published_date_col].map(lambda x: str(x) if pd.notna(x) else None)
             )
             date_column_found = True
             print(f"Using '{published_date_col}' for date parsing.")
@@ -6,9 +6,19 @@ import os
 from datetime import datetime, timedelta
 import base64
 import json
-import dateparser
+import time
+import threading
+from urllib.parse import urlparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from lib.dates import parse_date
 from random_user_agent.user_agent import UserAgent
 from bs4 import BeautifulSoup
+from lib.aspnet import PostbackClient
+# registers the prospero_search_results extractor
+import lib.prospero
+from lib.proxy_pool import get_proxy_pool
+from lib.html_parser import parse_html, element_text, only_string, class_xpath, register_extractor, run_extractor
+from lxml import etree
 
 class NewProjectSiteTypes(Enum):
     SAANICH = "saanich"
@@ -273,17 +283,39 @@ def _parse_rows(params):
         else:
             value = ''
 
-        if is_header:
-            label_parts = label.split(':', 1)
-            value_parts = value.split(':', 1)
-            if len(label_parts) == 2:
-                data[label_parts[0].strip()] = label_parts[1].strip()
-            if len(value_parts) == 2:
-                data[value_parts[0].strip()] = value_parts[1].strip()
-        else:
-            label_parts = label.split(':', 1)
-            key = label_parts[0].strip()
-            data[key] = value.strip()
+        _add_row_fields(data, label, value, is_header)
+    return data
+
+def _add_row_fields(data, label, value, is_header):
+    if is_header:
+        label_parts = label.split(':', 1)
+        value_parts = value.split(':', 1)
+        if len(label_parts) == 2:
+            data[label_parts[0].strip()] = label_parts[1].strip()
+        if len(value_parts) == 2:
+            data[value_parts[0].strip()] = value_parts[1].strip()
+    else:
+        label_parts = label.split(':', 1)
+        key = label_parts[0].strip()
+        data[key] = value.strip()
+
+_PIP_ROW_XPATH = class_xpath('row', tag='div')
+_PIP_LABEL_XPATH = class_xpath('report-label', tag='div')
+_PIP_VALUE_XPATH = class_xpath('report-value', tag='div')
+_PIP_PERMITS_SECTION_XPATH = etree.XPath("//*[@id='PermitsIssuedSection' or @id='PermitsAppliedSection']")
+_PIP_PERMITS_SECTION_IDS = ('PermitsIssuedSection', 'PermitsAppliedSection')
+# Bytes read at a time when a report is parsed while it downloads
+PIP_STREAM_CHUNK_SIZE = 64 * 1024
+
+def _parse_rows_lxml(ele, is_header):
+    """lxml version of _parse_rows"""
+    data = {}
+    for rowEle in _PIP_ROW_XPATH(ele):
+        labels = _PIP_LABEL_XPATH(rowEle)
+        values = _PIP_VALUE_XPATH(rowEle)
+        label = re.sub(r'\s+', ' ', element_text(labels[0], ' ', strip=True)) if labels else ''
+        value = re.sub(r'\s+', ' ', element_text(values[0], ' ', strip=True)) if values else ''
+        _add_row_fields(data, label, value, is_header)
     return data
 
 
@@ -312,13 +344,34 @@ def _parse_table_details(params):
     return data
 
 def _parse_permits(params):
-    text = params.get('text')
+    return run_extractor('pip_permits', params.get('text'))
+
+def _parse_permits_lxml(text):
+    """lxml version of _parse_permits_soup"""
+    root = parse_html(text)
+    sections = _PIP_PERMITS_SECTION_XPATH(root) if root is not None else []
+    if not sections:
+        # a report with no permits in its date range has no Permits section
+        return []
+    permitsSection = sections[0]
+    permit_details = [child for child in permitsSection if child.tag == 'div']
+    parsed_permits = []
+    for i in range(0, len(permit_details) - 1, 2):
+        header = _parse_rows_lxml(permit_details[i], True)
+        data_elements = _parse_rows_lxml(permit_details[i+1], False)
+        parsed_permits.append({**header, **data_elements})
+    return parsed_permits
+
+def _parse_permits_soup(text):
     # print(text)
     # assume its just for now
     soup = BeautifulSoup(text, 'html.parser')
     # get PermitsIssuedSection
 
     permitsSection = soup.select_one('#PermitsIssuedSection, #PermitsAppliedSection')
+    if permitsSection is None:
+        # a report with no permits in its date range has no Permits section
+        return []
     # print(permitsSection)
     # split items into groups of 2
     permit_details = permitsSection.find_all('div', recursive=False)
@@ -342,8 +395,232 @@ def _parse_permits(params):
 
     return parsed_permits
 
+register_extractor('pip_permits', _parse_permits_lxml, _parse_permits_soup)
+
+def _parse_permits_incremental(chunks, encoding=None):
+    """
+    Pull-parser version of _parse_permits_lxml for a report that is still
+    downloading. Each permit is parsed as soon as its header and data divs
+    are complete and then removed from the tree, and everything outside the
+    Permits section is cleared as it ends, so neither the raw report nor its
+    whole tree is held in memory.
+
+    Args:
+        chunks (iterable): The report's bytes, e.g. response.iter_content().
+        encoding (str, optional): The report's encoding.
+
+    Returns:
+        list: The same permits _parse_permits_lxml gives for the whole report.
+    """
+    parser = etree.HTMLPullParser(events=('start', 'end'), encoding=encoding)
+    permits = []
+    pending = []
+    section = None
+    section_done = False
+
+    def drain():
+        nonlocal section, section_done
+        for event, element in parser.read_events():
+            if event == 'start':
+                if section is None and not section_done and element.get('id') in _PIP_PERMITS_SECTION_IDS:
+                    section = element
+                continue
+            if section is None:
+                # ended outside the section (before it, or after it was read)
+                element.clear()
+            elif element is section:
+                section = None
+                section_done = True
+            elif element.getparent() is section and element.tag == 'div':
+                pending.append(element)
+                if len(pending) == 2:
+                    header = _parse_rows_lxml(pending[0], True)
+                    data_elements = _parse_rows_lxml(pending[1], False)
+                    permits.append({**header, **data_elements})
+                    for done in pending:
+                        section.remove(done)
+                    pending.clear()
+
+    for chunk in chunks:
+        if chunk:
+            parser.feed(chunk)
+            drain()
+    parser.close()
+    drain()
+    return permits
+
+def _parse_permits_stream(response):
+    """Parses the permits of a report response opened with stream=True, as it downloads."""
+    return _parse_permits_incremental(response.iter_content(chunk_size=PIP_STREAM_CHUNK_SIZE),
+                                      encoding=response.encoding or 'utf-8')
+
+
+# Report postback fields per PIP site, the view state is added by PostbackClient
+PIP_REPORT_TEMPLATES = {
+    "sidney": {
+        "ctl00$FeaturedContent$btn_ViewReport": "View Report"
+    },
+    "alberni": {
+        "l00$FeaturedContent$ScriptManager": "ctl00$FeaturedContent$updpnl_search|ctl00$FeaturedContent$btn_ViewReport",
+        "_ASYNCPOST": True,
+        "ctl00$FeaturedContent$btn_ViewReport": "Search"
+    },
+}
+
+# Ranges longer than PIP_WINDOW_DAYS are split into windows, see web_portal_issues_windowed
+PIP_WINDOWED = os.getenv('PIP_WINDOWED', 'True') == 'True'
+PIP_WINDOW_DAYS = int(os.getenv('PIP_WINDOW_DAYS', 7))
+PIP_MAX_WORKERS = int(os.getenv('PIP_MAX_WORKERS', 4))
+
+def _pip_date_windows(start_date, end_date, window_days):
+    """
+    Splits the inclusive range start_date..end_date into consecutive,
+    non-overlapping (start, end) windows of at most window_days days.
+    """
+    windows = []
+    window_start = start_date
+    while window_start <= end_date:
+        window_end = min(window_start + timedelta(days=window_days - 1), end_date)
+        windows.append((window_start, window_end))
+        window_start = window_end + timedelta(days=1)
+    return windows
+
+def _pip_permit_date(permit, permitType=None):
+    """
+    The date a report lists a permit under, for ordering: the first parsable
+    '... Date' field, preferring the one named after permitType (Issued/Applied).
+
+    Returns:
+        datetime: The date, or None if the permit has no parsable date field.
+    """
+    date_keys = [key for key in permit if 'date' in key.lower()]
+    if permitType:
+        date_keys.sort(key=lambda key: permitType.lower() not in key.lower())
+    for key in date_keys:
+        parsed = parse_date(permit[key] or '')
+        if parsed:
+            return parsed
+    return None
+
+def web_portal_issues_windowed(params):
+    """
+    Fetches a PIP report range as weekly (windowDays) reports in parallel.
+
+    Every window is a separate web_portal_issues call with its own session,
+    its report is parsed while it downloads (see _parse_permits_incremental)
+    and the raw HTML is never kept unless keepRaw is set.
+
+    A window that fails is reported and left out, the other windows still
+    count. A window with no permits gives an empty list.
+
+    Args:
+        params (dict): web_portal_issues params, plus
+            windowDays (int): Days per report, defaults to PIP_WINDOW_DAYS.
+            maxWorkers (int): Concurrent reports, defaults to PIP_MAX_WORKERS.
+            keepRaw (bool): Keep each window's raw HTML, defaults to False.
+
+    Returns:
+        dict: "permits" merged without duplicates and sorted by date (permits
+              without a date last), "windows" with the per-window counts,
+              "failed_windows" with the windows that raised, and the raw HTML
+              lists of the windows that worked if keepRaw.
+    """
+    start_date = params.get('start_date')
+    end_date = params.get('end_date')
+    if type(start_date) == str:
+        start_date = parse_date(start_date)
+    if type(end_date) == str:
+        end_date = parse_date(end_date)
+    window_days = params.get('windowDays') or PIP_WINDOW_DAYS
+    max_workers = params.get('maxWorkers') or PIP_MAX_WORKERS
+    keep_raw = params.get('keepRaw', False)
+    siteType = params.get('siteType', 'sidney')
+
+    windows = _pip_date_windows(start_date, end_date, window_days)
+    print(f"Fetching {siteType} PIP report as {len(windows)} windows of {window_days} days")
+
+    run_start = time.perf_counter()
+    results = [None] * len(windows)
+    failed_windows = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for index, (window_start, window_end) in enumerate(windows):
+            window_params = {
+                **params,
+                'start_date': window_start,
+                'end_date': window_end,
+                'windowDays': None,
+                'keepRaw': keep_raw,
+            }
+            futures[executor.submit(web_portal_issues, window_params)] = index
+        for future in as_completed(futures):
+            index = futures[future]
+            window_start, window_end = windows[index]
+            try:
+                results[index] = future.result()
+            except Exception as e:
+                print(f"[{siteType}] PIP window {window_start:%m/%d/%Y}-{window_end:%m/%d/%Y} failed: {e}")
+                failed_windows.append({
+                    'start_date': window_start.strftime("%m/%d/%Y"),
+                    'end_date': window_end.strftime("%m/%d/%Y"),
+                    'error': str(e),
+                })
+
+    merged = []
+    seen = set()
+    window_counts = []
+    for (window_start, window_end), result in zip(windows, results):
+        if result is None:
+            continue
+        permits = result.get('permits') or []
+        window_counts.append({
+            'start_date': window_start.strftime("%m/%d/%Y"),
+            'end_date': window_end.strftime("%m/%d/%Y"),
+            'permits': len(permits),
+        })
+        for permit in permits:
+            key = tuple(sorted(permit.items()))
+            if key in seen:
+                continue
+            seen.add(key)
+            merged.append(permit)
+
+    permitType = params.get('permitType', 'issued')
+    dates = [_pip_permit_date(permit, permitType) for permit in merged]
+    order = sorted(range(len(merged)), key=lambda i: (dates[i] is None, dates[i] or datetime.min))
+    merged = [merged[i] for i in order]
+
+    failed_windows.sort(key=lambda window: parse_date(window['start_date']))
+    print(f"Fetched {len(merged)} permits from {len(windows) - len(failed_windows)}/{len(windows)} windows "
+          f"in {time.perf_counter() - run_start:.1f}s")
+    if failed_windows:
+        print(f"[{siteType}] {len(failed_windows)} PIP windows failed: "
+              f"{[(w['start_date'], w['end_date']) for w in failed_windows]}")
+
+    data = {
+        "permits": merged,
+        "windows": window_counts,
+        "failed_windows": failed_windows,
+    }
+    if keep_raw:
+        succeeded = [result for result in results if result is not None]
+        data["permits_raw"] = [result["permits_raw"] for result in succeeded]
+        data["page_load_raw"] = [result["page_load_raw"] for result in succeeded]
+        data["selection_raw"] = [result["selection_raw"] for result in succeeded]
+    return data
 
 def web_portal_issues(params):
+    # long ranges are fetched as parallel windows, a window itself has windowDays None
+    window_days = params.get('windowDays', PIP_WINDOW_DAYS if PIP_WINDOWED else None)
+    if window_days:
+        start_date = params.get('start_date')
+        end_date = params.get('end_date')
+        if type(start_date) == str:
+            start_date = parse_date(start_date)
+        if type(end_date) == str:
+            end_date = parse_date(end_date)
+        if (end_date - start_date).days >= window_days:
+            return web_portal_issues_windowed({**params, 'windowDays': window_days})
     # destructure, make sure we have base_url, starting path (relative url)
     base_url = params.get('base_url', 'https://mysidney.sidney.ca')
     starting_url = params.get('starting_url', 'TempestApps/PIP/Pages/Search.aspx?templateName=LIVE_DATE')
@@ -352,6 +629,8 @@ def web_portal_issues(params):
     permitType = permitType.lower()
     siteType = params.get('siteType', 'sidney')
     saveFiles = params.get('saveFiles', False)
+    # the windowed mode turns this off so reports are not held in memory
+    keepRaw = params.get('keepRaw', True)
 
     # get start_date and end_date variables from the params
     # assume this will not be called if this is not set
@@ -360,12 +639,12 @@ def web_portal_issues(params):
 
     # format these dates into "05/01/2024",
     if type(start_date) == str:
-        start_date = dateparser.parse(start_date)
+        start_date = parse_date(start_date)
         start_date_fmt = start_date.strftime("%m/%d/%Y")
     else:
         start_date_fmt = start_date.strftime("%m/%d/%Y")
     if type(end_date) == str:
-        end_date = dateparser.parse(end_date)
+        end_date = parse_date(end_date)
         end_date_fmt = end_date.strftime("%m/%d/%Y")
     else:
         end_date_fmt = end_date.strftime("%m/%d/%Y")
@@ -375,14 +654,10 @@ def web_portal_issues(params):
     session = requests.Session()
 
     # sidney doesnt seem to care about https
-    proxy_list = get_proxy_list()
-
-    if len(proxy_list) > 0:
-        # proxies_list = get_proxies_cz()
-        proxy = random.choice(proxy_list)
-        # proxy="23.227.38.198:80"
-        https_proxy = proxy.replace('http://', 'https://')
-        # do we just buy a proxy server for this scrapping
+    # do we just buy a proxy server for this scrapping
+    proxy = None if siteType == 'sidney' else acquire_proxy(url)
+
+    if proxy or siteType == 'sidney':
         if siteType == 'sidney':
             proxy = 'geo.iproyal.com:12321'
             proxy_username = os.getenv('IPROYAL_USERNAME')
@@ -409,11 +684,14 @@ def web_portal_issues(params):
     # Make an initial GET request
     try:
         print(f"Attempting to get {url} with proxies: {proxies}")
+        request_start = time.perf_counter()
         page_load_resp = session.get(url, proxies=proxies, timeout=10) # Added a timeout
         page_load_resp.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
+        report_proxy_success(proxy, url, time.perf_counter() - request_start)
         print("Successfully fetched with proxies.")
     except (requests.exceptions.ProxyError, requests.exceptions.ConnectTimeout, requests.exceptions.ConnectionError, requests.exceptions.HTTPError) as e:
         print(f"Request with proxies failed: {e}")
+        report_proxy_failure(proxy, url)
         print(f"Retrying {url} without proxies...")
         try:
             page_load_resp = session.get(url, timeout=10) # Retry without proxies
@@ -428,56 +706,17 @@ def web_portal_issues(params):
     # with open('selection_alberni.html', 'w', errors='ignore') as file:
     #     file.write(page_load_resp.text)
 
-    soup = BeautifulSoup(page_load_resp.text, 'html.parser')
-    v1_site = False
-    if siteType == "sidney":
-        # Extract dynamic fields from the HTML
-        viewstate = soup.find(id="__VIEWSTATE")['value']
-        eventvalidation = soup.find(id="__EVENTVALIDATION")['value']
-
-        # Prepare the payload for the POST request
-
-        # set FromDate and ToDate
-        payload = {
-            "__EVENTTARGET": "",
-            "__EVENTARGUMENT": "",
-            "__VIEWSTATE": viewstate,
-            "__VIEWSTATEGENERATOR": soup.find(id="__VIEWSTATEGENERATOR")['value'],
-            "__VIEWSTATEENCRYPTED": "",
-            "__EVENTVALIDATION": eventvalidation,
-            "ctl00$FeaturedContent$txt_FromDate": start_date_fmt,
-            "ctl00$FeaturedContent$txt_ToDate": end_date_fmt,
-            "ctl00$FeaturedContent$btn_ViewReport": "View Report"
-        }
-        v1_site = True
-    elif siteType == "alberni":
-        # Extract dynamic fields from the HTML
-        viewstate = soup.find(id="__VIEWSTATE")['value']
-        eventvalidation = soup.find(id="__EVENTVALIDATION")['value']
-
-        # Prepare the payload for the POST request
-
-        # set FromDate and ToDate
-        payload = {
-            "l00$FeaturedContent$ScriptManager": "ctl00$FeaturedContent$updpnl_search|ctl00$FeaturedContent$btn_ViewReport",
-            "__EVENTTARGET": "",
-            "__EVENTARGUMENT": "",
-            "__VIEWSTATE": viewstate,
-            "__VIEWSTATEGENERATOR": soup.find(id="__VIEWSTATEGENERATOR")['value'],
-            "__VIEWSTATEENCRYPTED": "",
-            "__EVENTVALIDATION": eventvalidation,
-            "ctl00$FeaturedContent$txt_FromDate": start_date_fmt,
-            "ctl00$FeaturedContent$txt_ToDate": end_date_fmt,
-            "_ASYNCPOST": True,
-            "ctl00$FeaturedContent$btn_ViewReport": "Search"
-        }
-        v1_site = True
+    client = PostbackClient(session, url, proxies=proxies)
+    client.update_state(page_load_resp.text)
+    v1_site = siteType in PIP_REPORT_TEMPLATES
+    if v1_site:
+        # set FromDate and ToDate on top of the site's report template
+        payload = dict(PIP_REPORT_TEMPLATES[siteType])
+        payload["ctl00$FeaturedContent$txt_FromDate"] = start_date_fmt
+        payload["ctl00$FeaturedContent$txt_ToDate"] = end_date_fmt
     elif siteType == "northcowichan":
-        # Extract dynamic fields from the HTML
-        viewstate = soup.find(id="__VIEWSTATE")['value']
-        eventvalidation = soup.find(id="__EVENTVALIDATION")['value']
-
-        # Prepare the payload for the POST request
+        # North Cowichan posts every input on the page, so it needs the full DOM
+        soup = BeautifulSoup(page_load_resp.text, 'html.parser')
 
         form_data = {}
         for input_tag in soup.find_all("input"):
@@ -507,10 +746,9 @@ def web_portal_issues(params):
         full_action_url = base_url + action_url
 
         # Submit the form with a POST request
-        result_response = session.post(full_action_url, data=form_data, proxies=proxies)
-
-        # Parse the HTML content
-        soup = BeautifulSoup(result_response.text, 'html.parser')
+        result_response = session.post(full_action_url, data=form_data, proxies=proxies, stream=not keepRaw)
+        result_response.raise_for_status()
+        # the report is parsed below, streamed unless keepRaw
         # how to submit a form
         # print(soup.prettify())
 
@@ -519,7 +757,7 @@ def web_portal_issues(params):
     if v1_site:
 
         # Send a POST request to submit the form
-        selection_resp = session.post(url, data=payload, proxies=proxies)
+        selection_resp = client.post(payload)
         # this displays the property information portal - date range search
         # lets user select from two reports, just click on the forms
 
@@ -576,17 +814,21 @@ def web_portal_issues(params):
         permit_response = f"{base_url}{action}"
 
         # Send a POST request with the extracted form data
-        result_response = session.post(permit_response, data=data, proxies=proxies)
+        result_response = session.post(permit_response, data=data, proxies=proxies, stream=not keepRaw)
         result_response.raise_for_status()  # Optional: Raise an exception for HTTP errors
         # parse the response
 
         # with open('permits_alberni.html', 'w', errors='ignore') as file:
         #    file.write(result_response.text)
 
+    if not keepRaw:
+        # parsed while it downloads, the report text is never held in memory
+        with result_response:
+            return {"permits": _parse_permits_stream(result_response)}
+
     permits = _parse_permits({
         'text': result_response.text
     })
-
     data = {
         "permits_raw": result_response.text,
         "page_load_raw": page_load_resp.text,
@@ -633,6 +875,25 @@ def get_proxy_list():
             # Continue to the next fetcher function if an error occurs
     return []
 
+def acquire_proxy(url):
+    """
+    Returns the best validated proxy for the host of url from the shared
+    pool in lib/proxy_pool.py, or None if none of the candidates from
+    get_proxy_list can reach it. The candidate list is only scraped again
+    once the pool on disk is past its TTL.
+    """
+    try:
+        return get_proxy_pool(get_proxy_list).acquire(url)
+    except Exception as e:
+        print(f"Error acquiring a proxy for {url}: {e}")
+        return None
+
+def report_proxy_success(proxy, url, elapsed):
+    get_proxy_pool(get_proxy_list).report_success(proxy, url, elapsed)
+
+def report_proxy_failure(proxy, url):
+    get_proxy_pool(get_proxy_list).report_failure(proxy, url)
+
 def to_initial_caps_advanced(field):
     if type(field) != str:
         return field
@@ -724,11 +985,31 @@ def extract_application_detail_field(html, field="Application Contact:"):
     Returns:
         str: The cleaned extracted contact information, or None if not found.
     """
+    return run_extractor('prospero_detail_field', html, field=field)
+
+def _extract_application_detail_field_lxml(html, field="Application Contact:"):
+    """lxml version of _extract_application_detail_field_soup"""
+    root = parse_html(html)
+    if root is None:
+        return None
+    contact_label_div = next((div for div in root.iter('div') if only_string(div) == field), None)
+    if contact_label_div is None:
+        return None
+    contact_details_div = next(contact_label_div.itersiblings('div'), None)
+    if contact_details_div is None:
+        return None
+    span_tag = next(contact_details_div.iterdescendants('span'), None)
+    if span_tag is None:
+        return None
+    text_content = element_text(span_tag, ' ', strip=True)
+    script_texts = [script.text.strip() for script in span_tag.iterdescendants('script') if script.text]
+    return _combine_detail_field_text(text_content, script_texts)
+
+def _extract_application_detail_field_soup(html, field="Application Contact:"):
     soup = BeautifulSoup(html, 'html.parser')
 
     # Find the div containing the "Application Contact:" label
     contact_label_div = soup.find('div', string=field)
-    text = None
     if contact_label_div:
         # Get the next sibling div, which should contain the contact details
         contact_details_div = contact_label_div.find_next_sibling('div')
@@ -750,36 +1031,171 @@ def extract_application_detail_field(html, field="Application Contact:"):
                     if script_text:
                         script_texts.append(script_text.strip())
 
+                return _combine_detail_field_text(text_content, script_texts)
+    return None
 
-                clean_script_output = []
-                # 3. Evaluate any JavaScript code within the script tags
-                for script_text in script_texts:
-                    try:
-                        result = decode_js_email(script_text)
-                        if isinstance(result, str):
-                            clean_script_output.append(result.strip())
-                        elif isinstance(result, list):
-                            clean_script_output.extend(result)
-                    except Exception as e:
-                        print(f"Error evaluating JavaScript: {e}")
-                    
-                    print("clean_script_text", clean_script_output)
-                # Combine the text content. You might want to format this based on your needs.
-                # For example, adding a newline or a specific separator if script content is important.
-                if script_texts:
-                    combined_content = f"{text_content} {' '.join(clean_script_output)}"
-                    text =combined_content.strip()
-                
-                elif text_content:
-                    text = text_content
+def _combine_detail_field_text(text_content, script_texts):
+    clean_script_output = []
+    # 3. Evaluate any JavaScript code within the script tags
+    for script_text in script_texts:
+        try:
+            result = decode_js_email(script_text)
+            if isinstance(result, str):
+                clean_script_output.append(result.strip())
+            elif isinstance(result, list):
+                clean_script_output.extend(result)
+        except Exception as e:
+            print(f"Error evaluating JavaScript: {e}")
+        
+        print("clean_script_text", clean_script_output)
+    # Combine the text content. You might want to format this based on your needs.
+    # For example, adding a newline or a specific separator if script content is important.
+    text = None
+    if script_texts:
+        combined_content = f"{text_content} {' '.join(clean_script_output)}"
+        text =combined_content.strip()
+    
+    elif text_content:
+        text = text_content
 
     if text:
         # we want to format the text, if LTD exists
         return text
     return None
 
+register_extractor('prospero_detail_field', _extract_application_detail_field_lxml, _extract_application_detail_field_soup)
+
 
-def permit_development_tracker(params):
+def check_cancelled(cancel_event, siteType=None):
+    """
+    Raises once the caller has given up on this attempt, e.g. driver.py after
+    a site timed out, so the worker thread stops between requests instead of
+    running on beside the retry.
+    """
+    if cancel_event is not None and cancel_event.is_set():
+        raise Exception(f"{siteType} attempt cancelled")
+
+# Incremental paging for Prospero searches, see _is_page_past_watermark
+PROSPERO_INCREMENTAL = os.getenv('PROSPERO_INCREMENTAL', 'True') == 'True'
+WATERMARK_DIR = "data"
+# Number of folder numbers remembered per site between runs
+WATERMARK_SEEN_LIMIT = 500
+
+def _watermark_path(siteType):
+    return os.path.join(WATERMARK_DIR, f"{siteType.replace(' ', '_')}_watermark.json")
+
+def load_site_watermark(siteType):
+    """
+    Loads the high-water mark saved by the previous run for a site.
+
+    Returns:
+        dict: {'application_date', 'folder_no', 'seen_folders'} or an empty dict.
+    """
+    try:
+        with open(_watermark_path(siteType), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def build_site_watermark(entries, previous=None):
+    """
+    Builds the newest application date and folder number seen for a site along
+    with the most recent folder numbers, so the next run can stop paging early.
+
+    Returns:
+        dict: The new watermark, or None when no entry had a parsable date.
+    """
+    newest_date = None
+    newest_folder = None
+    for entry in entries:
+        parsed = parse_date(entry.get('application_date') or '')
+        if parsed and (newest_date is None or parsed.date() > newest_date):
+            newest_date = parsed.date()
+            newest_folder = entry.get('folder_no')
+
+    if newest_date is None:
+        # nothing parsable this run, keep the previous mark
+        return None
+
+    seen_folders = [entry['folder_no'] for entry in entries if entry.get('folder_no')]
+    for folder_no in (previous or {}).get('seen_folders', []):
+        if folder_no not in seen_folders:
+            seen_folders.append(folder_no)
+
+    return {
+        'application_date': newest_date.isoformat(),
+        'folder_no': newest_folder,
+        'seen_folders': seen_folders[:WATERMARK_SEEN_LIMIT]
+    }
+
+def save_site_watermark(siteType, watermark):
+    """
+    Saves a watermark from build_site_watermark. Only call this once the
+    entries it covers have been uploaded: a saved watermark makes the next
+    run skip them.
+    """
+    if not watermark:
+        return
+    os.makedirs(WATERMARK_DIR, exist_ok=True)
+    with open(_watermark_path(siteType), 'w') as f:
+        json.dump(watermark, f, indent=4)
+
+def _is_page_past_watermark(page_entries, stop_before_date=None, watermark=None):
+    """
+    Returns True when no later page can hold anything new: every entry on the
+    page is older than stop_before_date, or every entry is a folder the
+    previous run already saw and no newer than its high-water date.
+    Search results are listed newest first, so later pages only get older.
+    """
+    if not page_entries:
+        return False
+
+    dates = []
+    for entry in page_entries:
+        parsed = parse_date(entry.get('application_date') or '')
+        if parsed is None:
+            # can't tell, keep paging to be safe
+            return False
+        dates.append(parsed.date())
+
+    if stop_before_date and all(d < stop_before_date for d in dates):
+        return True
+
+    watermark = watermark or {}
+    seen_folders = set(watermark.get('seen_folders', []))
+    watermark_date = watermark.get('application_date')
+    if seen_folders and watermark_date:
+        watermark_date = datetime.fromisoformat(watermark_date).date()
+        if all(entry.get('folder_no') in seen_folders for entry in page_entries) \
+                and all(d <= watermark_date for d in dates):
+            return True
+    return False
+
+# Search postback fields per site, the view state is added by PostbackClient.
+# Saanich's search form has no dropdown_list field.
+_PROSPERO_ACTIVE_SEARCH = {
+    "ctl00$FeaturedContent$folderStatusRepeater$ctl00$folderStatusCheckBox": "ACTIVE",
+    "ctl00$FeaturedContent$folderStatusMobileRepeater$ctl00$folderStatusMobileCheckBox": "ACTIVE",
+    "ctl00$FeaturedContent$hdn_filterFolderStatusSelected": "ACTIVE",
+    "ctl00$FeaturedContent$SearchButton": "Search",
+    "__ASYNCPOST": True
+}
+PROSPERO_SEARCH_TEMPLATES = {
+    "saanich": _PROSPERO_ACTIVE_SEARCH,
+    "default": {
+        **_PROSPERO_ACTIVE_SEARCH,
+        "ctl00$FeaturedContent$dropdown_list": "Filter Search",
+    },
+}
+
+def permit_development_tracker(params, return_watermark=False):
+    """
+    Pages through a Prospero site's active search results.
+
+    Returns:
+        list: The result entries, or (entries, watermark) with return_watermark,
+            where watermark is the one to save once the entries are uploaded.
+    """
     # destructure, make sure we have base_url, starting path (relative url)
     # https://tender.victoria.ca/
     base_url = params.get('base_url', 'https://online.saanich.ca/')
@@ -788,230 +1204,68 @@ def permit_development_tracker(params):
     # values should be issued or applied
 
     siteType = params.get('siteType', 'saanich')
+    # set by driver.py when this attempt timed out
+    cancel_event = params.get('cancel_event')
 
 
     url = f"{base_url}/{starting_url}"
     session = params.get('session', requests.Session())
     proxies = params.get('proxies', {})
+    # None keeps the requests default of waiting indefinitely
+    request_timeout = params.get('request_timeout')
     print("url in use is", url)
     print("proxies is", proxies)
-    page_load_resp = session.get(url,proxies=proxies)
+    client = PostbackClient(session, url, proxies=proxies, timeout=request_timeout)
+    page_load_resp = client.get()
+    check_cancelled(cancel_event, siteType)
 
     # with open('testing.html', 'w', errors='ignore') as file:
     #     file.write(page_load_resp.text)
 
-
-    # print("trying to get data for ", url)
-    soup = BeautifulSoup(page_load_resp.text, 'html.parser')
-
-    # Extract dynamic fields from the HTML
-    viewstate = soup.find(id="__VIEWSTATE")['value']
-    eventvalidation = soup.find(id="__EVENTVALIDATION")['value']
-
-    # Prepare the payload for the POST request
-
-    # set FromDate and ToDate
-    base_playload = {
-        "__EVENTTARGET": "",
-        "__EVENTARGUMENT": "",
-        "__VIEWSTATE": viewstate,
-        "__VIEWSTATEGENERATOR": soup.find(id="__VIEWSTATEGENERATOR")['value'],
-        "__VIEWSTATEENCRYPTED": "",
-        "__EVENTVALIDATION": eventvalidation,
-        "ctl00$FeaturedContent$btn_ViewReport": "View Report"
-    }
-       
-
-    initial_page_load = session.post(url, data=base_playload, proxies=proxies)
     # this displays the property information portal - date range search
     # lets user select from two reports, just click on the forms
     # click on the filters and then get the new content
+    initial_page_load = client.post({
+        "ctl00$FeaturedContent$btn_ViewReport": "View Report"
+    })
 
-    viewstate = soup.find(id="__VIEWSTATE")['value']
-    eventvalidation = soup.find(id="__EVENTVALIDATION")['value']
-    # Parse the HTML content
-    soup = BeautifulSoup(initial_page_load.text, 'html.parser')
-
+    search_fields = PROSPERO_SEARCH_TEMPLATES.get(siteType, PROSPERO_SEARCH_TEMPLATES['default'])
 
     no_new_pages = False
     iteration_limit = params.get('iteration_limit', 10)
     current_iteration = 0
     current_page = None
     entries = []
+
+    # incremental mode stops paging once a page is entirely older than the
+    # target date or entirely made of folders the last run already saw
+    incremental = params.get('incremental', PROSPERO_INCREMENTAL)
+    stop_before_date = params.get('stop_before_date')
+    watermark = load_site_watermark(siteType) if incremental else {}
     
     while no_new_pages == False and current_iteration < iteration_limit:
         current_iteration += 1
-        viewstate = soup.find(id="__VIEWSTATE")['value']
-        eventvalidation = soup.find(id="__EVENTVALIDATION")['value']
-        if siteType == 'saanich':
-            new_payload = {
-                "__EVENTTARGET": "",
-                "__EVENTARGUMENT": "",
-                "__VIEWSTATE": viewstate,
-                "__VIEWSTATEGENERATOR": soup.find(id="__VIEWSTATEGENERATOR")['value'],
-                "__VIEWSTATEENCRYPTED": "",
-                "__EVENTVALIDATION": eventvalidation,
-                "ctl00$FeaturedContent$folderStatusRepeater$ctl00$folderStatusCheckBox": "ACTIVE",
-                "ctl00$FeaturedContent$folderStatusMobileRepeater$ctl00$folderStatusMobileCheckBox": "ACTIVE",
-                "ctl00$FeaturedContent$hdn_filterFolderStatusSelected": "ACTIVE",
-                "ctl00$FeaturedContent$SearchButton": "Search",
-                "__ASYNCPOST": True
-            }
-        elif siteType == 'victoria':
-              new_payload = {
-                "__EVENTTARGET": "",
-                "__EVENTARGUMENT": "",
-                "__VIEWSTATE": viewstate,
-                "__VIEWSTATEGENERATOR": soup.find(id="__VIEWSTATEGENERATOR")['value'],
-                "__VIEWSTATEENCRYPTED": "",
-                "__EVENTVALIDATION": eventvalidation,
-                "ctl00$FeaturedContent$folderStatusRepeater$ctl00$folderStatusCheckBox": "ACTIVE",
-                "ctl00$FeaturedContent$folderStatusMobileRepeater$ctl00$folderStatusMobileCheckBox": "ACTIVE",
-                "ctl00$FeaturedContent$hdn_filterFolderStatusSelected": "ACTIVE",
-                "ctl00$FeaturedContent$SearchButton": "Search",
-                "ctl00$FeaturedContent$dropdown_list": "Filter Search",
-                "__ASYNCPOST": True
-            }
-        else:
-            new_payload = {
-                "__EVENTTARGET": "",
-                "__EVENTARGUMENT": "",
-                "__VIEWSTATE": viewstate,
-                "__VIEWSTATEGENERATOR": soup.find(id="__VIEWSTATEGENERATOR")['value'],
-                "__VIEWSTATEENCRYPTED": "",
-                "__EVENTVALIDATION": eventvalidation,
-                "ctl00$FeaturedContent$folderStatusRepeater$ctl00$folderStatusCheckBox": "ACTIVE",
-                "ctl00$FeaturedContent$folderStatusMobileRepeater$ctl00$folderStatusMobileCheckBox": "ACTIVE",
-                "ctl00$FeaturedContent$hdn_filterFolderStatusSelected": "ACTIVE",
-                "ctl00$FeaturedContent$SearchButton": "Search",
-                "ctl00$FeaturedContent$dropdown_list": "Filter Search",
-                "__ASYNCPOST": True
-            }
+        page_entries = []
+        new_payload = dict(search_fields)
         if current_page:
             new_payload["ctl00$FeaturedContent$PageNumberHidden"] = current_page
             new_payload["ctl00$FeaturedContent$PageNumber"] = "ctl00$FeaturedContent$PageNumber"
         else:
             current_page = 1
                 
-        page_data = session.post(url, data=new_payload, proxies=proxies)
+        check_cancelled(cancel_event, siteType)
+        page_data = client.post(new_payload)
 
-        soup = BeautifulSoup(page_data.text, 'html.parser')
         # with open(f"basic_{current_iteration}.html", 'w', errors='ignore') as file:
         #     file.write(page_data.text)
 
-        # for soup we want to grab searchResultsDiv
-        searchResultsDiv = soup.find(id="searchResultsDiv")
-        if not searchResultsDiv:
-            no_new_pages = True
-            continue
-        # for the search divs we want to grab all the elements of content-container from searchResultsDiv
-        content_containers = searchResultsDiv.find_all(class_="content-container")
-        if not content_containers:
+        # one pass over the result cards, see lib/prospero.py
+        cards = run_extractor('prospero_search_results', page_data.text)
+        if not cards:
             no_new_pages = True
             continue
-        # for each content-container we want to grab the content
-        for content_container in content_containers:
-            data = {}
-            address_div = content_container.find(class_="search_address")
-            if address_div:
-                data['address'] = address_div.get_text(strip=True)
-
-            # Extract Folder Number
-            folder_no_div = content_container.find(class_="search_folderNo")
-            if folder_no_div:
-                data['folder_no'] = folder_no_div.get_text(strip=True)
-
-            # Extract Type
-            type_div = content_container.find(class_="search_type")
-            if type_div:
-                data['type'] = type_div.get_text(strip=True)
-
-            # Extract Application Date
-            # Find the div that contains "Application Date:"
-            content_body = content_container.find(class_="content-container-body")
-            app_date_div = content_body.find(lambda tag: tag.name == 'div' and "Application Date:" in tag.get_text())
-            if app_date_div:
-                data['application_date'] = app_date_div.get_text(strip=True).replace("Application Date:", "").strip()
-
-            # Extract Status
-            status_span = content_container.find("span", class_="heavy-font")
-            if status_span:
-                # The actual status text is the first child text node of the span,
-                # or the text of the span if it has no further children tags.
-                # We also want to handle the empty <span></span> inside it.
-                status_text = ''.join(node for node in status_span if isinstance(node, str)).strip()
-                if not status_text and status_span.contents: # If direct text is empty, check children
-                        status_text = status_span.contents[0].strip() if status_span.contents and isinstance(status_span.contents[0], str) else ""
-                data['status'] = status_text if status_text else status_span.get_text(strip=True)
-
-
-            # Extract Purpose
-            purpose_div = content_container.find(class_="search_purpose")
-            if purpose_div:
-                data['purpose'] = purpose_div.get_text(strip=True)
-
-            for button_wrapper_div in content_container.find_all("div", onclick=True): # More direct: find divs with onclick
-                details_button = button_wrapper_div.find("button", class_="details-btn")
-                
-                if not details_button: # Ensure the div actually contains our specific button
-                    print("no details button found")
-                    continue
-                
-                # The relevant onclick is on button_wrapper_div (the parent div)
-                onclick_attr = button_wrapper_div.get('onclick') # Use .get() for safety
-
-                if onclick_attr:
-                    # Your original logic to extract the URL from the onclick string:
-                    # "window.location = '../Prospero/Details.aspx?folderNumber=REZ00796'"
-                    # This part looks for content between the first and last single quote.
-                    
-                    # We can make the check for "window.location = " more explicit if needed,
-                    # or keep your more general "../Prospero/Details.aspx?folderNumber=" check.
-                    # For extracting "content after =''", it means content within the single quotes.
-                    
-                    # Let's refine the extraction to be robust for "window.location = 'URL'"
-                    if "window.location = '" in onclick_attr and onclick_attr.strip().endswith("'"):
-                        try:
-                            # Extract the content between "window.location = '" and the trailing "'"
-                            start_pattern = "window.location = '"
-                            url_start_index = onclick_attr.find(start_pattern)
-                            
-                            if url_start_index != -1:
-                                actual_url_start = url_start_index + len(start_pattern)
-                                # Ensure we find the last single quote of this specific assignment
-                                # For simplicity, if the structure is consistently "window.location = '...'",
-                                # rfind("'") works.
-                                url_end_index = onclick_attr.rfind("'")
-                                
-                                if url_end_index > actual_url_start:
-                                    data['details_link'] = onclick_attr[actual_url_start:url_end_index]
-                                else:
-                                    data['details_link'] = None # Extraction failed
-                            else:
-                                data['details_link'] = None # Pattern not found
-                        except Exception:
-                            data['details_link'] = None # Error during parsing
-                    elif "../Prospero/Details.aspx?folderNumber=" in onclick_attr:
-                        # Fallback to your original specific string check and extraction logic
-                        # if the "window.location = " pattern isn't matched but the Prospero path is there.
-                        # This part assumes the URL is still wrapped in single quotes.
-                        link_start_index = onclick_attr.find("'") 
-                        if link_start_index != -1:
-                            link_start_index += 1 # Move past the first quote
-                            link_end_index = onclick_attr.rfind("'")
-                            if link_end_index > link_start_index:
-                                data['details_link'] = onclick_attr[link_start_index:link_end_index]
-                            else:
-                                data['details_link'] = None # Quotes not found as expected for URL
-                        else:
-                            data['details_link'] = None # Starting quote not found
-                    else:
-                        data['details_link'] = None # Onclick attribute present but not in a recognized URL format
-                else:
-                    data['details_link'] = None # Parent div does not have an onclick attribute
-            # adjust details_link if not None 
-
-            if data['details_link']:
+        for data in cards:
+            if data.get('details_link'):
                 # adjust to replace search.aspx no matter what the case is
                 ref_url = url.replace('/Search.aspx', '')
                 # remove the last
@@ -1030,8 +1284,15 @@ def permit_development_tracker(params):
 
 
             entries.append(processed_data)
+            page_entries.append(processed_data)
             
         current_page += 1
+        if incremental and _is_page_past_watermark(page_entries, stop_before_date, watermark):
+            print(f"[{siteType}] page {current_page - 1} is older than the watermark, stopping pagination")
+            no_new_pages = True
+    print(f"[{siteType}] fetched {current_iteration} result pages")
+    # saved by the caller once the entries are uploaded
+    new_watermark = build_site_watermark(entries, watermark) if incremental else None
     # remove duplicate entries
 
     # attempt to grab details link and extract
@@ -1039,6 +1300,8 @@ def permit_development_tracker(params):
     # output to data folder with sitename
     with open(f'data/{siteType}_all_entries.json', 'w') as f:
         json.dump(entries, f, indent=4)
+    if return_watermark:
+        return entries, new_watermark
     return entries
     # data = {
     #     "permits_raw": result_response.text,
@@ -1117,7 +1380,158 @@ def calculate_target_date(ref_datetime=datetime.now()):
     return target_date_val
 
 
-def get_filtered_permits_with_contacts(params, target_date=None):
+# Detail pages are fetched concurrently, capped per host so a single Prospero
+# server never sees more than DETAILS_PER_HOST_LIMIT requests in flight.
+DETAILS_MAX_WORKERS = int(os.getenv('DETAILS_MAX_WORKERS', 8))
+DETAILS_PER_HOST_LIMIT = int(os.getenv('DETAILS_PER_HOST_LIMIT', 4))
+
+# Returned by _fetch_application_contact in place of a contact when the attempt
+# was cancelled, a page without an application contact gives None
+_CONTACT_CANCELLED = object()
+
+def _fetch_application_contact(session, details_link, host_semaphore, request_timeout=None, cancel_event=None):
+    """
+    Fetches a single Prospero details page and extracts the application contact.
+
+    Returns:
+        tuple: (application_contact, seconds spent on the request), or
+            (_CONTACT_CANCELLED, 0) when the attempt was cancelled before the request.
+    """
+    with host_semaphore:
+        if cancel_event is not None and cancel_event.is_set():
+            return _CONTACT_CANCELLED, 0.0
+        start = time.perf_counter()
+        try:
+            details_resp = session.get(details_link, timeout=request_timeout)
+            details_resp.raise_for_status()  # Raise an exception for HTTP errors
+            contact_info = extract_application_detail_field(details_resp.text)
+            contact = to_initial_caps_advanced(contact_info)
+        except requests.exceptions.RequestException as e:
+            print(f"Error fetching details link {details_link}: {e}")
+            contact = "Error retrieving contact info"
+        return contact, time.perf_counter() - start
+
+# On-disk cache of extracted application contacts, one file per site keyed by
+# folder number. Error results are never cached.
+CONTACT_CACHE_DIR = "data"
+CONTACT_CACHE_TTL_DAYS = float(os.getenv('CONTACT_CACHE_TTL_DAYS', 7))
+CONTACT_CACHE_MAX_ENTRIES = int(os.getenv('CONTACT_CACHE_MAX_ENTRIES', 2000))
+CONTACT_CACHE_REFRESH = os.getenv('CONTACT_CACHE_REFRESH', 'False') == 'True'
+
+def _contact_cache_path(siteType):
+    return os.path.join(CONTACT_CACHE_DIR, f"{str(siteType).replace(' ', '_')}_contact_cache.json")
+
+def load_contact_cache(siteType):
+    """
+    Loads the contact cache for a site and drops entries older than the TTL.
+
+    Returns:
+        dict: folder_no -> {'contact': str or None, 'fetched_at': epoch seconds}
+    """
+    try:
+        with open(_contact_cache_path(siteType), 'r') as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    cutoff = time.time() - CONTACT_CACHE_TTL_DAYS * 24 * 60 * 60
+    return {folder_no: item for folder_no, item in cache.items() if item.get('fetched_at', 0) >= cutoff}
+
+def save_contact_cache(siteType, cache):
+    """
+    Saves the contact cache for a site, keeping only the CONTACT_CACHE_MAX_ENTRIES
+    most recently fetched folders.
+    """
+    if len(cache) > CONTACT_CACHE_MAX_ENTRIES:
+        newest = sorted(cache.items(), key=lambda item: item[1].get('fetched_at', 0), reverse=True)
+        cache = dict(newest[:CONTACT_CACHE_MAX_ENTRIES])
+    os.makedirs(CONTACT_CACHE_DIR, exist_ok=True)
+    with open(_contact_cache_path(siteType), 'w') as f:
+        json.dump(cache, f, indent=4)
+
+def fetch_application_contacts(session, entries, siteType=None, max_workers=None, per_host_limit=None, request_timeout=None, refresh=None,
+                               cancel_event=None):
+    """
+    Visits the details_link of every entry with a bounded thread pool and sets
+    'application_contact' on each entry in place, preserving the entry order.
+
+    Args:
+        session (requests.Session): Session shared with the search postbacks.
+        entries (list): Permit entries as returned by filter_permits_by_date.
+        siteType (str, optional): Used to label the timing report.
+        max_workers (int, optional): Pool size, defaults to DETAILS_MAX_WORKERS.
+        per_host_limit (int, optional): Concurrent requests allowed per host,
+                                        defaults to DETAILS_PER_HOST_LIMIT.
+        request_timeout (float, optional): Timeout in seconds for each details request.
+        refresh (bool, optional): Ignore cached contacts and fetch every page,
+                                  defaults to CONTACT_CACHE_REFRESH.
+        cancel_event (threading.Event, optional): Once set, the remaining pages
+                                  are skipped and this raises, nothing is cached.
+
+    Returns:
+        list: The same entries list.
+    """
+    max_workers = max_workers or DETAILS_MAX_WORKERS
+    per_host_limit = per_host_limit or DETAILS_PER_HOST_LIMIT
+    if refresh is None:
+        refresh = CONTACT_CACHE_REFRESH
+
+    contact_cache = load_contact_cache(siteType)
+    cache_hits = 0
+    cache_lookups = 0
+
+    host_semaphores = {}
+    pending = []
+    for index, entry in enumerate(entries):
+        details_link = entry.get('details_link')
+        if not details_link:
+            entry['application_contact'] = "No details link available"
+            continue
+        folder_no = entry.get('folder_no')
+        if folder_no:
+            cache_lookups += 1
+            if not refresh and folder_no in contact_cache:
+                entry['application_contact'] = contact_cache[folder_no]['contact']
+                cache_hits += 1
+                continue
+        host = urlparse(details_link).netloc
+        if host not in host_semaphores:
+            host_semaphores[host] = threading.BoundedSemaphore(per_host_limit)
+        pending.append((index, details_link, host_semaphores[host]))
+
+    if cache_lookups:
+        print(f"[{siteType}] Contact cache hit rate {cache_hits}/{cache_lookups} ({cache_hits / cache_lookups:.0%})")
+
+    if not pending:
+        return entries
+
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(pending))) as executor:
+        futures = [
+            (index, executor.submit(_fetch_application_contact, session, details_link, semaphore, request_timeout,
+                                    cancel_event))
+            for index, details_link, semaphore in pending
+        ]
+        serial_seconds = 0.0
+        # merge back by position so the output order matches the search results
+        for index, future in futures:
+            contact, elapsed = future.result()
+            if contact is _CONTACT_CANCELLED:
+                for _, queued in futures:
+                    queued.cancel()
+                check_cancelled(cancel_event, siteType)
+            entries[index]['application_contact'] = contact
+            serial_seconds += elapsed
+            folder_no = entries[index].get('folder_no')
+            if folder_no and contact != "Error retrieving contact info":
+                contact_cache[folder_no] = {'contact': contact, 'fetched_at': time.time()}
+    wall_seconds = time.perf_counter() - wall_start
+    save_contact_cache(siteType, contact_cache)
+
+    print(f"[{siteType}] Fetched {len(pending)} details pages in {wall_seconds:.2f}s "
+          f"(serial estimate {serial_seconds:.2f}s, saved {max(serial_seconds - wall_seconds, 0):.2f}s)")
+    return entries
+
+def get_filtered_permits_with_contacts(params, target_date=None, return_watermark=False):
     """
     Fetches development permits, filters them, and then extracts application contact
     information for each filtered entry by visiting their details link.
@@ -1130,19 +1544,14 @@ def get_filtered_permits_with_contacts(params, target_date=None):
     Returns:
         list: A list of dictionaries, where each dictionary represents a filtered
               permit entry with an added 'application_contact' field.
+              With return_watermark, (entries, watermark): save the watermark
+              with save_site_watermark only after the entries are uploaded.
     """
 
     session = requests.Session()
-    proxies_list = []
     proxies = None
     # sidney doesnt seem to care about https
-    proxies_list = get_proxy_list()
-    # proxies_list = get_proxies_cz()
-    if len(proxies_list) > 0:
-        proxy = random.choice(proxies_list)
-    else:
-        proxy = None
-    # proxy="23.227.38.198:80"
+    proxy = acquire_proxy(f"{params.get('base_url')}/{params.get('starting_url')}")
     if proxy:
 
         proxies={
@@ -1158,8 +1567,17 @@ def get_filtered_permits_with_contacts(params, target_date=None):
     })
     params['session'] = session
     params['proxies'] = proxies
+    # lets the tracker stop paging once results fall behind the filter date
+    if target_date is None:
+        params['stop_before_date'] = calculate_target_date()
+    else:
+        params['stop_before_date'] = calculate_target_date(ref_datetime=target_date)
     # Step 1: Get all permit entries
-    all_entries = permit_development_tracker(params)
+    try:
+        all_entries, watermark = permit_development_tracker(params, return_watermark=True)
+    except requests.exceptions.ProxyError:
+        report_proxy_failure(proxy, f"{params.get('base_url')}/{params.get('starting_url')}")
+        raise
 
     clean_entries = []
     siteType = params.get('siteType')
@@ -1185,29 +1603,16 @@ def get_filtered_permits_with_contacts(params, target_date=None):
 
 
     filtered_entries = filter_permits_by_date(clean_entries, target_date=target_date)
+    check_cancelled(params.get('cancel_event'), siteType)
 
-    proxies = None
-    # proxies_list = get_proxy_list()
-    # if len(proxies_list) > 0:
-    #     proxy = random.choice(proxies_list)
-    #     if proxy:
-    #         proxies = {'http': proxy, 'https': proxy}
     # Step 3: For each filtered entry, visit the details_link and extract application contact
-    for entry in filtered_entries:
-        details_link = entry.get('details_link')
-        if details_link:
-            try:
-                details_resp = session.get(details_link)
-                details_resp.raise_for_status()  # Raise an exception for HTTP errors
-                contact_info = extract_application_detail_field(details_resp.text)
-                entry['application_contact'] = to_initial_caps_advanced(contact_info)
-
-            except requests.exceptions.RequestException as e:
-                print(f"Error fetching details link {details_link}: {e}")
-                entry['application_contact'] = "Error retrieving contact info"
-        else:
-            entry['application_contact'] = "No details link available"
-    
+    fetch_application_contacts(session, filtered_entries, siteType=siteType,
+                               request_timeout=params.get('request_timeout'),
+                               refresh=params.get('refresh_contacts'),
+                               cancel_event=params.get('cancel_event'))
+
+    if return_watermark:
+        return filtered_entries, watermark
     return filtered_entries
 
 def filter_permits_by_date(entries, target_date=None):
@@ -1220,7 +1625,7 @@ def filter_permits_by_date(entries, target_date=None):
     print("looking for entries with target date", target_filter_date)
     # filter out entries before today
     for entry in entries:
-        application_date = dateparser.parse(entry['application_date'])
+        application_date = parse_date(entry['application_date'])
         if application_date is None:
 
             print(f"Could not parse application_date '{application_date}' for entry ID {entry.get('id', 'N/A')}. Skipping.")